@@ -24,5 +24,7 @@ def exibir_data_hora_execucao():
     dia_semana = dias_semana[agora.weekday()]  # Obter o nome do dia da semana
     print(f"Última atualização: {agora.strftime('%d/%m/%Y %H:%M:%S')} ({dia_semana})")
 
-# Exibir a data, hora e dia da semana no output
-exibir_data_hora_execucao()
+# Exibir a data, hora e dia da semana no output (só quando executado como script;
+# importar o módulo não faz I/O)
+if __name__ == "__main__":
+    exibir_data_hora_execucao()
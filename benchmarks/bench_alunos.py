@@ -0,0 +1,74 @@
+"""
+Microbenchmark: índice de matrículas, choques de horário e grades de todos os alunos.
+
+Gera uma planilha sintética com dezenas de ofertas e milhares de alunos (cada um
+inscrito em algumas ofertas) e mede cada etapa. Rode a partir da raiz do repositório:
+
+    python -m benchmarks.bench_alunos
+"""
+import random
+import time
+
+import pandas as pd
+
+from matriculas import celulas_das_ofertas, dados_do_aluno, detectar_conflitos_alunos, mascaras_das_ofertas
+from modelo import ModeloHorarios, construir_modelo
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+
+OFERTAS = 60
+ALUNOS = (1000, 5000, 20000)
+INSCRICOES_POR_ALUNO = 6
+AULAS_POR_OFERTA = 4
+
+
+def gerar_planilha(num_alunos, semente=0):
+    """DataFrame com as colunas da planilha e a coluna 'alunos' preenchida."""
+    aleatorio = random.Random(semente)
+    inscritos = [[] for _ in range(OFERTAS)]
+    for aluno in range(num_alunos):
+        for oferta in aleatorio.sample(range(OFERTAS), INSCRICOES_POR_ALUNO):
+            inscritos[oferta].append(str(20260000 + aluno))
+
+    linhas = []
+    for k in range(OFERTAS):
+        codigos = []
+        for _ in range(AULAS_POR_OFERTA):
+            turno = aleatorio.choice(list(HORARIOS_TURNO))
+            aula = aleatorio.randint(1, len(HORARIOS_TURNO[turno]))
+            codigos.append(f"{aleatorio.choice(list(DIAS_DA_SEMANA))}{turno}{aula}")
+        linha = {
+            'codigo': f"MAT{k:03d}", 'disciplina': f"Disciplina {k}", 'turma': 'T1',
+            'professor': f"Professor {k % 15}", 'semestre': str(k % 9 + 1), 'creditos': '4',
+            'alunos': ','.join(inscritos[k]), 'campus': 'Anglo',
+        }
+        for i, codigo in enumerate(codigos, start=1):
+            linha[f'horario {i}'] = codigo
+            linha[f'sala {i}'] = f"Sala {k % 10}"
+        linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    print(f"{'alunos':>7} {'modelo (s)':>11} {'índice (s)':>11} {'choques (s)':>12} "
+          f"{'grades (s)':>11} {'choques':>8}")
+    for num_alunos in ALUNOS:
+        df = gerar_planilha(num_alunos)
+        modelo, t_modelo = cronometrar(lambda: construir_modelo(df))
+        # Reconstrói só os índices para isolar o custo do índice invertido
+        _, t_indice = cronometrar(lambda: ModeloHorarios(modelo.ofertas, modelo.sessoes, modelo.validacao))
+        mascaras = mascaras_das_ofertas(modelo)
+        conflitos, t_conflitos = cronometrar(lambda: detectar_conflitos_alunos(modelo, mascaras))
+        celulas = celulas_das_ofertas(modelo)
+        _, t_grades = cronometrar(lambda: [dados_do_aluno(modelo, a, mascaras, celulas) for a in modelo.alunos()])
+        print(f"{num_alunos:>7} {t_modelo:>11.3f} {t_indice:>11.3f} {t_conflitos:>12.3f} "
+              f"{t_grades:>11.3f} {len(conflitos):>8}")
+
+
+if __name__ == "__main__":
+    main()
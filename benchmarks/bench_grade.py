@@ -0,0 +1,86 @@
+"""
+Microbenchmark: grade montada com pivot_table + merge (versão antiga) x montar_grade.
+
+Simula uma grade por professor, com o número de professores escalado em
+10x, 100x e 1000x o tamanho atual da planilha. Rode a partir da raiz do repositório:
+
+    python -m benchmarks.bench_grade
+"""
+import random
+import time
+
+import pandas as pd
+
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+from renderizacao import iter_grade, montar_grade
+
+# Tamanho aproximado da planilha atual: professores e aulas por professor
+PROFESSORES_ATUAIS = 20
+AULAS_POR_PROFESSOR = 12
+ESCALAS = (10, 100, 1000)
+
+
+def grade_pivot(lista_horarios, turnos_usados):
+    """Implementação antiga (pivot_table + merge), mantida só para comparação."""
+    horarios_completos = []
+    for turno in sorted(turnos_usados):
+        horarios_completos.extend(HORARIOS_TURNO[turno])
+        horarios_completos.append("---")
+    horarios_completos.pop()
+
+    df_grade = pd.DataFrame(lista_horarios, columns=['horário', 'dia', 'conteudo'])
+    pivot = df_grade.pivot_table(
+        index='horário', columns='dia', values='conteudo', aggfunc=lambda x: '<br>'.join(x)
+    ).fillna('')
+    dias_ordenados = list(DIAS_DA_SEMANA.values())
+    for dia in dias_ordenados:
+        if dia not in pivot.columns:
+            pivot[dia] = ''
+    pivot = pivot[dias_ordenados]
+    tabela = pd.merge(pd.DataFrame({'horário': horarios_completos}), pivot, on='horário', how='left').fillna('')
+    return ''.join(
+        '<tr>' + ''.join(f'<td>{item}</td>' for item in linha) + '</tr>'
+        for linha in tabela.itertuples(index=False)
+    )
+
+
+def grade_direta(lista_horarios, turnos_usados):
+    return ''.join(iter_grade(montar_grade(lista_horarios, turnos_usados), 'grade', '<br>'))
+
+
+def gerar_professores(n, semente=0):
+    """Lista de (itens, turnos) sintéticos, um por professor."""
+    aleatorio = random.Random(semente)
+    dias = list(DIAS_DA_SEMANA.values())
+    professores = []
+    for p in range(n):
+        itens, turnos = [], set()
+        for a in range(AULAS_POR_PROFESSOR):
+            turno = aleatorio.choice(list(HORARIOS_TURNO))
+            hora = aleatorio.choice(HORARIOS_TURNO[turno])
+            itens.append([hora, aleatorio.choice(dias), f"<b>COD{p}</b><br>Disciplina {a}"])
+            turnos.add(turno)
+        professores.append((itens, turnos))
+    return professores
+
+
+def medir(funcao, professores):
+    inicio = time.perf_counter()
+    for itens, turnos in professores:
+        funcao(itens, turnos)
+    return time.perf_counter() - inicio
+
+
+def main():
+    print(f"{'escala':>7} {'grades':>7} {'pivot (s)':>10} {'direta (s)':>11} {'ganho':>7}")
+    for escala in ESCALAS:
+        professores = gerar_professores(PROFESSORES_ATUAIS * escala)
+        # A versão antiga é lenta demais na maior escala: mede uma amostra e extrapola
+        amostra = professores[:PROFESSORES_ATUAIS * 10]
+        t_pivot = medir(grade_pivot, amostra) * len(professores) / len(amostra)
+        t_direta = medir(grade_direta, professores)
+        print(f"{escala:>6}x {len(professores):>7} {t_pivot:>10.3f} {t_direta:>11.3f} {t_pivot / t_direta:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
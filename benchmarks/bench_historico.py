@@ -0,0 +1,73 @@
+"""
+Benchmark do histórico SQLite (historico.py) com vários termos sintéticos.
+
+Importa 'termos' planilhas sintéticas (benchmarks/sintetico.py), uma por semestre letivo,
+num banco temporário e mede o tempo de importação de cada termo e o das consultas
+entre termos (carga de um professor, uso das salas, salas ocupadas num slot, ofertas de
+uma disciplina). Rode a partir da raiz do repositório:
+
+    python -m benchmarks.bench_historico
+    python -m benchmarks.bench_historico --termos 12 --ofertas 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.sintetico import gerar_snapshot
+from historico import abrir, carga_professor, importar_termo, ofertas_da_disciplina, salas_ocupadas, uso_salas
+from modelo import construir_modelo
+from planilha import snapshot_para_dataframe
+
+CURSO = 'Curso Sintético'
+
+
+def _termo(indice):
+    """0 -> '2020/1', 1 -> '2020/2', 2 -> '2021/1', ..."""
+    return f"{2020 + indice // 2}/{indice % 2 + 1}"
+
+
+def _medir(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede importação e consultas do histórico SQLite.")
+    parser.add_argument('--termos', type=int, default=12)
+    parser.add_argument('--ofertas', type=int, default=600)
+    parser.add_argument('--repeticoes', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        conexao = abrir(os.path.join(pasta, 'historico.sqlite3'))
+
+        importacao = []
+        for indice in range(args.termos):
+            modelo = construir_modelo(snapshot_para_dataframe(gerar_snapshot(args.ofertas, semente=indice)))
+            inicio = time.perf_counter()
+            importar_termo(conexao, modelo, CURSO, _termo(indice))
+            importacao.append(time.perf_counter() - inicio)
+
+        ofertas, sessoes = conexao.execute('SELECT (SELECT count(*) FROM ofertas), (SELECT count(*) FROM sessoes)').fetchone()
+        print(f"{args.termos} termos, {ofertas} ofertas, {sessoes} sessões")
+        print(f"importação por termo: média {1000 * sum(importacao) / len(importacao):.1f} ms, "
+              f"máx. {1000 * max(importacao):.1f} ms")
+
+        ultimo = _termo(args.termos - 1)
+        consultas = {
+            'carga_professor (6 termos)': lambda: carga_professor(conexao, 'Professor 001'),
+            'uso_salas (6 termos)': lambda: uso_salas(conexao),
+            'salas_ocupadas (1 slot)': lambda: salas_ocupadas(conexao, CURSO, ultimo, '3', '2', 1),
+            'ofertas_da_disciplina': lambda: ofertas_da_disciplina(conexao, 'MAT00010'),
+        }
+        print(f"{'consulta':<30} {'ms':>8}")
+        for nome, consulta in consultas.items():
+            print(f"{nome:<30} {1000 * _medir(consulta, args.repeticoes):>8.3f}")
+        conexao.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Custo de importação (partida a frio) de cada módulo, medido com `python -X importtime`.
+
+Cada módulo é importado num interpretador novo; o valor reportado é o tempo cumulativo
+do próprio módulo (inclui tudo o que ele importa). Rode a partir da raiz do repositório:
+
+    python -m benchmarks.bench_importacao
+    python -m benchmarks.bench_importacao --json importacao.json   # salva para comparar
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+MODULOS = [
+    'atualizacao',
+    'planilha',
+    'cliente_sheets',
+    'renderizacao',
+    'modelo',
+    'conflitos',
+    'processar_horarios',
+    'horarios_professores',
+    'pagina',
+    'gerar_pagina',
+    'lote',
+    'saida_dividida',
+    'matriculas',
+]
+
+# Dependências cuja presença após o import indica carregamento antecipado
+PESADOS = ('pandas', 'numpy', 'requests', 'google.oauth2')
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir_modulo(modulo, repeticoes=3):
+    """Menor tempo cumulativo (µs) entre as repetições e os módulos pesados carregados."""
+    codigo = f"import sys, {modulo}; print(','.join(m for m in {PESADOS!r} if m in sys.modules))"
+    melhor = None
+    pesados = ''
+    for _ in range(repeticoes):
+        resultado = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', codigo],
+            capture_output=True, text=True, cwd=RAIZ, check=True,
+        )
+        pesados = resultado.stdout.strip()
+        # Linhas: "import time: self [us] | cumulative | imported package"
+        for linha in resultado.stderr.splitlines():
+            partes = [p.strip() for p in linha.split('|')]
+            if len(partes) == 3 and partes[2] == modulo:
+                cumulativo = int(partes[1])
+                melhor = cumulativo if melhor is None else min(melhor, cumulativo)
+    return melhor, pesados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o custo de importação de cada módulo.")
+    parser.add_argument('--json', help="arquivo para salvar os resultados")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    print(f"{'módulo':<22} {'import (ms)':>11}  carregou")
+    for modulo in MODULOS:
+        micros, pesados = medir_modulo(modulo, args.repeticoes)
+        resultados[modulo] = {'us': micros, 'pesados': pesados.split(',') if pesados else []}
+        print(f"{modulo:<22} {micros / 1000:>11.1f}  {pesados or '-'}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark do pipeline completo sobre planilhas sintéticas (veja benchmarks/sintetico.py).
+
+Mede, para cada tamanho, cada etapa isolada (carregar, ingerir, decodificar, agrupar,
+conflitos, grades, renderizar) e as duas gerações ponta a ponta (gerar_html_todas_tabelas
+e processar_dados_e_gerar_html a partir do DataFrame). Para cada etapa: o menor tempo
+entre as repetições e o pico de memória alocada (tracemalloc, numa execução à parte).
+O cache de seções fica desligado para que toda renderização seja medida por inteiro.
+
+Os resultados são gravados em .cache/benchmarks/<commit>.json; passe outro arquivo em
+--comparar para ver a razão entre as duas execuções. Rode a partir da raiz do repositório:
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --ofertas 60 600 6000 --comparar .cache/benchmarks/abc1234.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import cache_secoes
+import horarios_professores
+import processar_horarios
+from benchmarks.sintetico import gerar_snapshot
+from conflitos import detectar_conflitos
+from decodificador import decodificar_horarios
+from ingestao import ingerir
+from modelo import ModeloHorarios, construir_modelo
+from planilha import snapshot_para_dataframe
+from renderizacao import montar_grade
+
+OFERTAS = (60, 600, 6000)
+PASTA_RESULTADOS = os.path.join('.cache', 'benchmarks')
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _grades(modelo):
+    """Monta (sem renderizar) as grades de todos os grupos e professores."""
+    em_conflito = frozenset()
+    for _, _, dados in processar_horarios.secoes_dos_grupos(modelo, em_conflito):
+        montar_grade(dados['horarios'], dados['turnos'])
+    for professor in modelo.professores():
+        _, horarios, turnos = horarios_professores.dados_do_professor(modelo, professor, em_conflito)
+        montar_grade(horarios, turnos)
+
+
+# Etapa -> função que recebe o contexto preparado (snapshot, df, df_tipado, modelo)
+ETAPAS = {
+    'carregar': lambda ctx: snapshot_para_dataframe(ctx['snapshot']),
+    'ingerir': lambda ctx: ingerir(ctx['df']),
+    'decodificar': lambda ctx: decodificar_horarios(ctx['df_tipado']),
+    'agrupar': lambda ctx: ModeloHorarios(ctx['modelo'].ofertas, ctx['modelo'].sessoes, ctx['modelo'].validacao),
+    'modelo': lambda ctx: construir_modelo(ctx['df']),
+    'conflitos': lambda ctx: detectar_conflitos(ctx['modelo']),
+    'grades': lambda ctx: _grades(ctx['modelo']),
+    'renderizar_turmas': lambda ctx: processar_horarios.gerar_html_todas_tabelas(modelo=ctx['modelo']),
+    'renderizar_professores': lambda ctx: horarios_professores.processar_dados_e_gerar_html(modelo=ctx['modelo']),
+    'ponta_a_ponta_turmas': lambda ctx: processar_horarios.gerar_html_todas_tabelas(ctx['df']),
+    'ponta_a_ponta_professores': lambda ctx: horarios_professores.processar_dados_e_gerar_html(ctx['df']),
+}
+
+
+def preparar(ofertas):
+    snapshot = gerar_snapshot(ofertas)
+    df = snapshot_para_dataframe(snapshot)
+    return {
+        'snapshot': snapshot,
+        'df': df,
+        'df_tipado': ingerir(df)[0],
+        'modelo': construir_modelo(df),
+    }
+
+
+def medir_tempo(funcao, ctx, repeticoes):
+    melhor = None
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao(ctx)
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor
+
+
+def medir_pico(funcao, ctx):
+    """Pico de memória alocada (bytes) durante uma execução da etapa."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao(ctx)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=RAIZ, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'sem-git'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o pipeline em planilhas sintéticas.")
+    parser.add_argument('--ofertas', type=int, nargs='+', default=list(OFERTAS), help="tamanhos (linhas da planilha)")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--etapas', nargs='+', choices=list(ETAPAS), default=list(ETAPAS))
+    parser.add_argument('--salvar', help="arquivo JSON de saída (padrão: .cache/benchmarks/<commit>.json)")
+    parser.add_argument('--comparar', help="resultados anteriores (JSON) para comparar")
+    args = parser.parse_args(argv)
+
+    # Sem cache de seções: cada renderização é medida por inteiro
+    cache_secoes.HABILITADO = False
+
+    anteriores = {}
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anteriores = json.load(f)['resultados']
+
+    resultados = {}
+    cabecalho = f"{'ofertas':>7} {'etapa':<26} {'tempo (ms)':>11} {'pico (MB)':>10}"
+    print(cabecalho + ("  {:>8}".format('vs. ant.') if anteriores else ''))
+    for ofertas in args.ofertas:
+        ctx = preparar(ofertas)
+        resultados[str(ofertas)] = por_etapa = {}
+        for etapa in args.etapas:
+            funcao = ETAPAS[etapa]
+            segundos = medir_tempo(funcao, ctx, args.repeticoes)
+            pico = medir_pico(funcao, ctx)
+            por_etapa[etapa] = {'s': segundos, 'pico_bytes': pico}
+
+            linha = f"{ofertas:>7} {etapa:<26} {segundos * 1000:>11.2f} {pico / 2**20:>10.2f}"
+            anterior = anteriores.get(str(ofertas), {}).get(etapa)
+            if anterior:
+                linha += f"  {segundos / anterior['s']:>7.2f}x"
+            print(linha)
+
+    caminho = args.salvar or os.path.join(PASTA_RESULTADOS, f"{commit_atual()}.json")
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': commit_atual(),
+            'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'repeticoes': args.repeticoes,
+            'resultados': resultados,
+        }, f, indent=2)
+    print(f"Resultados gravados em '{caminho}'.")
+
+
+if __name__ == "__main__":
+    main()
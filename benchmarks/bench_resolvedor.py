@@ -0,0 +1,77 @@
+"""
+Microbenchmark: resolvedor de horários num departamento sintético.
+
+Gera uma planilha com as ofertas de um departamento inteiro (semestres ímpares,
+reofertas e optativas), preenche os horários de parte delas, deixa as demais em branco
+e injeta alguns conflitos. Mede quanto o resolvedor leva para propor os slots.
+Rode a partir da raiz do repositório:
+
+    python -m benchmarks.bench_resolvedor
+"""
+import random
+import time
+
+import pandas as pd
+
+from conflitos import detectar_conflitos
+from modelo import construir_modelo
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+from resolvedor import Resolvedor
+
+# (ofertas, professores, salas) de cada cenário
+CENARIOS = ((60, 15, 8), (120, 30, 15), (240, 60, 30))
+FRACAO_SEM_HORARIO = 0.25
+FRACAO_CONFLITOS = 0.05
+# Obrigatórias por semestre ímpar; as demais ofertas viram reofertas ou optativas
+OBRIGATORIAS_POR_SEMESTRE = 7
+
+
+def gerar_planilha(ofertas, professores, salas, semente=0):
+    """DataFrame com as colunas da planilha: horários aleatórios, alguns vazios."""
+    aleatorio = random.Random(semente)
+    slots = [f"{d}{t}{a}" for d in DIAS_DA_SEMANA for t, lista in HORARIOS_TURNO.items()
+             for a in range(1, len(lista) + 1)]
+    ocupados = set()
+    por_semestre = {}
+    linhas = []
+    for k in range(ofertas):
+        professor = f"Professor {k % professores}"
+        sala = f"Sala {aleatorio.randrange(salas)}"
+        semestre = aleatorio.choice([1, 3, 5, 7, 9])
+        if por_semestre.get(semestre, 0) >= OBRIGATORIAS_POR_SEMESTRE:
+            semestre = aleatorio.choice([2, 88])
+        por_semestre[semestre] = por_semestre.get(semestre, 0) + 1
+        linha = {
+            'codigo': f"MAT{k:03d}", 'disciplina': f"Disciplina {k}", 'turma': 'T1',
+            'professor': professor, 'semestre': str(semestre),
+            'creditos': '4', 'alunos': '', 'campus': 'Anglo', 'sala 1': sala,
+        }
+        if aleatorio.random() >= FRACAO_SEM_HORARIO:
+            livres = [s for s in slots if (professor, s) not in ocupados and (sala, s) not in ocupados]
+            escolhidos = aleatorio.sample(livres, 4)
+            if aleatorio.random() < FRACAO_CONFLITOS:
+                escolhidos[0] = aleatorio.choice(slots)
+            for i, codigo in enumerate(escolhidos, start=1):
+                linha[f'horario {i}'] = codigo
+                linha[f'sala {i}'] = sala
+                ocupados.update({(professor, codigo), (sala, codigo)})
+        linhas.append(linha)
+    return pd.DataFrame(linhas).fillna('')
+
+
+def main():
+    print(f"{'ofertas':>8} {'conflitos':>10} {'pendentes':>10} {'sem solução':>12} {'nós':>8} {'tempo (s)':>10}")
+    for ofertas, professores, salas in CENARIOS:
+        modelo = construir_modelo(gerar_planilha(ofertas, professores, salas))
+        conflitos = detectar_conflitos(modelo)
+        inicio = time.perf_counter()
+        resolvedor = Resolvedor(modelo)
+        propostas = resolvedor.resolver()
+        tempo = time.perf_counter() - inicio
+        sem_solucao = sum(1 for p in propostas if p.slot is None)
+        print(f"{ofertas:>8} {len(conflitos):>10} {len(propostas):>10} {sem_solucao:>12} "
+              f"{resolvedor.nos:>8} {tempo:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark do servidor (servidor.py) contra uma planilha sintética.
+
+Sobe o servidor num processo separado, com a fonte trocada por uma planilha falsa
+(benchmarks/sintetico.py) e, neste processo, abre conexões keep-alive concorrentes que
+pedem as páginas. Mede requisições por segundo em três casos: corpo comprimido (200),
+revalidação com If-None-Match (304) e uma página pequena da saída dividida.
+Rode a partir da raiz do repositório:
+
+    python -m benchmarks.bench_servidor
+    python -m benchmarks.bench_servidor --ofertas 600 --conexoes 32 --segundos 5
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+CASOS = ('pagina_gzip', 'pagina_304', 'dividida_gzip')
+
+
+def _servir(ofertas, porta, pronto):
+    """Processo do servidor: fonte sintética, sem consulta periódica durante a medição."""
+    import cache_secoes
+    from benchmarks.sintetico import gerar_snapshot
+    from servidor import Servidor
+
+    cache_secoes.HABILITADO = False
+    snapshot = gerar_snapshot(ofertas)
+
+    async def rodar():
+        servidor = Servidor(fonte=lambda: snapshot, intervalo=3600)
+        await servidor.iniciar('127.0.0.1', porta)
+        pronto.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(rodar())
+
+
+async def _pedir(leitor, escritor, requisicao):
+    """Envia uma requisição e lê a resposta inteira; retorna (status, cabeçalhos)."""
+    escritor.write(requisicao)
+    bloco = await leitor.readuntil(b'\r\n\r\n')
+    linhas = bloco.decode('latin-1').split('\r\n')
+    cabecalhos = dict((n.strip().lower(), v.strip()) for n, _, v in (l.partition(':') for l in linhas[1:] if l))
+    tamanho = int(cabecalhos.get('content-length', 0))
+    if tamanho:
+        await leitor.readexactly(tamanho)
+    return int(linhas[0].split(' ')[1]), cabecalhos
+
+
+async def _cliente(porta, requisicao, fim, contagem):
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    try:
+        while time.perf_counter() < fim:
+            await _pedir(leitor, escritor, requisicao)
+            contagem[0] += 1
+    finally:
+        escritor.close()
+
+
+def _requisicao(caminho, *cabecalhos):
+    linhas = [f"GET {caminho} HTTP/1.1", "Host: localhost", *cabecalhos]
+    return ('\r\n'.join(linhas) + '\r\n\r\n').encode('latin-1')
+
+
+async def medir(porta, conexoes, segundos):
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    _, cabecalhos = await _pedir(leitor, escritor, _requisicao('/', 'Accept-Encoding: gzip'))
+    _, dividida = await _pedir(leitor, escritor, _requisicao('/paginas/index.html', 'Accept-Encoding: gzip'))
+    escritor.close()
+
+    requisicoes = {
+        'pagina_gzip': _requisicao('/', 'Accept-Encoding: gzip'),
+        'pagina_304': _requisicao('/', 'Accept-Encoding: gzip', f"If-None-Match: {cabecalhos['etag']}"),
+        'dividida_gzip': _requisicao('/paginas/index.html', 'Accept-Encoding: gzip'),
+    }
+    tamanhos = {'pagina_gzip': cabecalhos['content-length'], 'pagina_304': 0,
+                'dividida_gzip': dividida['content-length']}
+
+    resultados = {}
+    for caso in CASOS:
+        contagem = [0]
+        inicio = time.perf_counter()
+        fim = inicio + segundos
+        await asyncio.gather(*(_cliente(porta, requisicoes[caso], fim, contagem) for _ in range(conexoes)))
+        resultados[caso] = (contagem[0] / (time.perf_counter() - inicio), tamanhos[caso])
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o servidor com uma planilha sintética.")
+    parser.add_argument('--ofertas', type=int, default=60)
+    parser.add_argument('--conexoes', type=int, default=16)
+    parser.add_argument('--segundos', type=float, default=3.0)
+    parser.add_argument('--porta', type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    pronto = multiprocessing.Event()
+    processo = multiprocessing.Process(target=_servir, args=(args.ofertas, args.porta, pronto), daemon=True)
+    processo.start()
+    try:
+        if not pronto.wait(120):
+            raise SystemExit("O servidor não ficou pronto.")
+        resultados = asyncio.run(medir(args.porta, args.conexoes, args.segundos))
+    finally:
+        processo.terminate()
+
+    print(f"{'caso':<16} {'req/s':>10} {'bytes':>10}")
+    for caso, (por_segundo, tamanho) in resultados.items():
+        print(f"{caso:<16} {por_segundo:>10.0f} {tamanho:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Gerador de planilhas sintéticas no formato da Planilha1, para medir escala sem o Google Sheets.
+
+As colunas são as mesmas da planilha real (codigo, disciplina, turma, professor, semestre,
+creditos, alunos, campus, horario i / sala i) e os valores seguem o mesmo formato, inclusive
+com uma fração de células problemáticas (códigos inválidos, nulos literais, semestres em
+branco) para exercitar a validação. O resultado é determinístico para uma mesma semente.
+
+    from benchmarks.sintetico import gerar_snapshot
+    snapshot = gerar_snapshot(ofertas=600)
+"""
+import random
+
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO, _limpar_linha
+
+NUM_HORARIOS = 6
+COLUNAS = (
+    ['codigo', 'disciplina', 'turma', 'professor', 'semestre', 'creditos', 'alunos', 'campus']
+    + [f'horario {i}' for i in range(1, NUM_HORARIOS + 1)]
+    + [f'sala {i}' for i in range(1, NUM_HORARIOS + 1)]
+)
+
+CAMPI = ('Anglo', 'Capão do Leão')
+SEMESTRES = ('1', '3', '5', '7', '9', '2', '4', '6', '88')
+CODIGOS_INVALIDOS = ('99', 'abc', '2311', '731', '241.5', 'nan', 'None')
+
+SLOTS = [f"{d}{t}{a}" for d in DIAS_DA_SEMANA for t, lista in HORARIOS_TURNO.items()
+         for a in range(1, len(lista) + 1)]
+
+
+def gerar_linhas(ofertas=60, semente=0, professores=None, salas=None, alunos=None,
+                 fracao_invalidos=0.02, fracao_sem_horario=0.1):
+    """
+    Linhas (cabeçalho + ofertas) como listas de strings, no formato de get_all_values().
+    professores / salas / alunos: tamanho dos conjuntos (padrão: proporcional às ofertas).
+    """
+    aleatorio = random.Random(semente)
+    professores = professores or max(5, ofertas // 4)
+    salas = salas or max(4, ofertas // 8)
+    alunos = alunos or max(50, ofertas * 5)
+
+    nomes = [f"Professor {p:03d}" for p in range(professores)]
+    linhas = [list(COLUNAS)]
+    for k in range(ofertas):
+        disciplina = k // 2 if aleatorio.random() < 0.3 else k
+        campus = aleatorio.choice(CAMPI)
+        sala_base = f"Sala {aleatorio.randrange(salas):03d}"
+
+        professor = aleatorio.choice(nomes)
+        sorteio = aleatorio.random()
+        if sorteio < 0.05:
+            professor = f"{professor} / {aleatorio.choice(nomes)}"
+        elif sorteio < 0.07:
+            professor = ''
+
+        semestre = aleatorio.choice(SEMESTRES) if aleatorio.random() > 0.03 else ''
+        creditos = aleatorio.choice((2, 4, 4, 6))
+
+        horarios, salas_linha = [''] * NUM_HORARIOS, [''] * NUM_HORARIOS
+        if aleatorio.random() >= fracao_sem_horario:
+            for i, slot in enumerate(aleatorio.sample(SLOTS, min(creditos, NUM_HORARIOS))):
+                invalido = aleatorio.random() < fracao_invalidos
+                horarios[i] = aleatorio.choice(CODIGOS_INVALIDOS) if invalido else slot
+                salas_linha[i] = sala_base if aleatorio.random() < 0.8 else f"Sala {aleatorio.randrange(salas):03d}"
+
+        matriculas = aleatorio.sample(range(alunos), aleatorio.randint(0, min(60, alunos)))
+        linhas.append([
+            f"MAT{disciplina:05d}", f"Disciplina {disciplina}", aleatorio.choice(('T1', 'T2', '')),
+            professor, semestre, str(creditos), ','.join(str(20260000 + m) for m in matriculas), campus,
+            *horarios, *salas_linha,
+        ])
+    return linhas
+
+
+def gerar_snapshot(ofertas=60, semente=0, **opcoes):
+    """Snapshot (cabecalho, linhas) igual ao de planilha.baixar_snapshot."""
+    linhas = gerar_linhas(ofertas, semente, **opcoes)
+    return tuple(linhas[0]), tuple(_limpar_linha(linha) for linha in linhas[1:])
@@ -0,0 +1,120 @@
+"""
+Cache em disco dos fragmentos de HTML de cada seção (semestre, reofertas, optativas, professor).
+
+Cada fragmento é guardado sob o hash do conteúdo que o alimenta (linhas da seção,
+horários e destaques de conflito) e da versão do código que o renderiza. Numa nova
+renderização, só as seções cujo conteúdo mudou são geradas de novo; as demais são lidas
+do disco e emendadas na página.
+
+Cada planilha/aba pode ter a sua própria pasta (veja definir_escopo): na renderização em
+lote (lote.py), vários alvos rodam ao mesmo tempo, e cada um só poda a própria pasta.
+
+Defina HORARIOS_CACHE_SECOES=0 para desligar o cache.
+"""
+import hashlib
+import os
+import sys
+
+CACHE_DIR = os.path.join('.cache', 'secoes')
+HABILITADO = os.environ.get('HORARIOS_CACHE_SECOES', '1') != '0'
+
+# Módulos cujo código altera o HTML gerado: mudar qualquer um invalida o cache
+MODULOS_RENDERIZACAO = ('renderizacao', 'conflitos', 'processar_horarios', 'horarios_professores', 'cache_secoes')
+
+# Subpasta do alvo atual dentro de CACHE_DIR (None: pasta compartilhada)
+ESCOPO = None
+
+_versao = None
+
+
+def definir_escopo(*partes):
+    """
+    Separa o cache das próximas renderizações deste processo numa pasta própria,
+    identificada por 'partes' (ex.: planilha e aba). Sem partes, volta à pasta compartilhada.
+    """
+    global ESCOPO
+    ESCOPO = hashlib.blake2b(repr(partes).encode('utf-8'), digest_size=6).hexdigest() if partes else None
+
+
+def versao_codigo():
+    """Hash do código-fonte dos módulos de renderização (calculado uma vez por processo)."""
+    global _versao
+    if _versao is None:
+        h = hashlib.blake2b(digest_size=8)
+        for nome in MODULOS_RENDERIZACAO:
+            modulo = sys.modules.get(nome)
+            caminho = getattr(modulo, '__file__', None)
+            if caminho:
+                with open(caminho, 'rb') as f:
+                    h.update(f.read())
+        _versao = h.hexdigest()
+    return _versao
+
+
+def chave_conteudo(*partes):
+    """Hash estável (repr) das estruturas que alimentam uma seção."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(versao_codigo().encode())
+    h.update(repr(partes).encode('utf-8'))
+    return h.hexdigest()
+
+
+class CacheFragmentos:
+    """
+    Fragmentos de uma família de seções (ex.: 'turmas', 'professores') numa subpasta
+    (dentro da pasta do escopo atual, se houver).
+    Guarda as chaves usadas na renderização para que podar() apague as obsoletas.
+    """
+    __slots__ = ('pasta', 'usadas', 'gerados', 'reaproveitados')
+
+    def __init__(self, subpasta):
+        self.pasta = os.path.join(CACHE_DIR, ESCOPO, subpasta) if ESCOPO else os.path.join(CACHE_DIR, subpasta)
+        self.usadas = set()
+        self.gerados = 0
+        self.reaproveitados = 0
+
+    def obter(self, chave, gerar):
+        """
+        Retorna o HTML da seção com esta chave: do disco, se existir, ou gerando-o
+        com gerar() (um iterável de pedaços) e gravando para a próxima vez.
+        """
+        self.usadas.add(chave)
+        if not HABILITADO:
+            self.gerados += 1
+            return ''.join(gerar())
+
+        caminho = os.path.join(self.pasta, f"{chave}.html")
+        try:
+            with open(caminho, encoding='utf-8') as f:
+                html = f.read()
+            self.reaproveitados += 1
+            return html
+        except OSError:
+            pass
+
+        html = ''.join(gerar())
+        self.gerados += 1
+        try:
+            os.makedirs(self.pasta, exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(temporario, caminho)
+        except OSError as e:
+            print(f"AVISO: não foi possível gravar o cache da seção: {e}", file=sys.stderr)
+        return html
+
+    def podar(self):
+        """
+        Remove do disco os fragmentos não usados nesta renderização. Só é seguro quando
+        a pasta é exclusiva deste alvo (um escopo por alvo no lote).
+        """
+        if not HABILITADO or not os.path.isdir(self.pasta):
+            return
+        for nome in os.listdir(self.pasta):
+            chave, extensao = os.path.splitext(nome)
+            if extensao == '.html' and chave not in self.usadas:
+                try:
+                    os.remove(os.path.join(self.pasta, nome))
+                except OSError:
+                    pass
@@ -0,0 +1,291 @@
+"""
+Exportação dos horários como calendários iCalendar (.ics), gerados em lote.
+
+Cada aula da semana vira um evento semanal recorrente (RRULE) entre o início e o fim
+das aulas, com os horários reais de HORARIOS_TURNO no fuso America/Sao_Paulo. Aulas
+seguidas da mesma oferta, no mesmo dia e na mesma sala, sem intervalo entre elas,
+viram um único evento (ex.: 19:00-20:40).
+
+Estrutura gerada em 'pasta':
+    professores/<nome>.ics   um por professor (aulas compartilhadas entram no de cada um)
+    turmas/<grupo>.ics       um por semestre ímpar, reofertas e optativas
+    salas/<sala>.ics         um por sala (sala + campus)
+
+Os calendários são escritos um por vez, linha a linha: o texto de cada evento é
+montado uma única vez e reaproveitado nos calendários em que ele aparece. Uso:
+
+    python calendario.py --saida _site/calendarios --inicio 2026-03-09 --fim 2026-07-11
+"""
+import argparse
+import hashlib
+import os
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from planilha import HORARIOS_TURNO
+from modelo import GRUPO_OPTATIVAS, GRUPO_REOFERTAS, obter_modelo
+from conflitos import chave_sala
+from processar_horarios import titulo_do_grupo
+from renderizacao import slugificar
+
+FUSO = 'America/Sao_Paulo'
+
+# Período letivo padrão (AAAA-MM-DD); a cada termo, ajuste em HORARIOS_INICIO_AULAS /
+# HORARIOS_FIM_AULAS ou passe --inicio / --fim (--inicio-aulas / --fim-aulas no gerar_pagina)
+INICIO_AULAS = date.fromisoformat(os.environ.get('HORARIOS_INICIO_AULAS') or '2026-03-09')
+FIM_AULAS = date.fromisoformat(os.environ.get('HORARIOS_FIM_AULAS') or '2026-07-11')
+
+DOMINIO_UID = 'previa-horarios'
+PRODID = '-//previa-horarios//calendario.py//PT-BR'
+
+# Dia da planilha ('2' = segunda) -> dia da semana do Python (0 = segunda)
+_DIA_DA_SEMANA = {'2': 0, '3': 1, '4': 2, '5': 3, '6': 4}
+_DIA_ICAL = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+# (turno, aula) -> (início, fim) como datetime.time
+_HORAS = {}
+for _turno, _lista in HORARIOS_TURNO.items():
+    for _aula, _rotulo in enumerate(_lista):
+        _inicio, _fim = _rotulo.split('-')
+        _HORAS[(_turno, _aula)] = (time.fromisoformat(_inicio), time.fromisoformat(_fim))
+
+LIMITE_LINHA = 75 # octetos por linha (RFC 5545, seção 3.1)
+
+
+class Evento:
+    """Aulas seguidas de uma oferta num dia da semana, na mesma sala."""
+    __slots__ = ('oferta', 'dia_cod', 'turno', 'aulas', 'inicio', 'fim', 'sala')
+
+    def __init__(self, oferta, sessao):
+        self.oferta = oferta
+        self.dia_cod = sessao.dia_cod
+        self.turno = sessao.turno
+        self.aulas = [sessao.aula]
+        self.inicio, self.fim = _HORAS[(sessao.turno, sessao.aula)]
+        self.sala = chave_sala(sessao)
+
+    def estender(self, sessao):
+        """Inclui a sessão se ela começa quando o evento termina (mesmo dia, turno e sala)."""
+        inicio, fim = _HORAS[(sessao.turno, sessao.aula)]
+        if (sessao.dia_cod, sessao.turno) != (self.dia_cod, self.turno) or inicio != self.fim \
+                or chave_sala(sessao) != self.sala:
+            return False
+        self.aulas.append(sessao.aula)
+        self.fim = fim
+        return True
+
+
+def eventos_da_oferta(oferta):
+    """Eventos de uma oferta: sessões ordenadas por dia e horário, com as seguidas unidas."""
+    eventos = []
+    for sessao in sorted(oferta.sessoes, key=lambda s: (s.dia_cod, s.turno, s.aula)):
+        if sessao.dia_cod not in _DIA_DA_SEMANA or (sessao.turno, sessao.aula) not in _HORAS:
+            continue
+        if not eventos or not eventos[-1].estender(sessao):
+            eventos.append(Evento(oferta, sessao))
+    return eventos
+
+
+def escapar(texto):
+    """Escapa um valor TEXT (RFC 5545, seção 3.3.11)."""
+    return (str(texto).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def dobrar(linha):
+    """Quebra a linha em pedaços de até 75 octetos (continuação começa com espaço), terminando em CRLF."""
+    if len(linha.encode('utf-8')) <= LIMITE_LINHA:
+        return linha + '\r\n'
+    partes = []
+    atual, tamanho, limite = [], 0, LIMITE_LINHA
+    for caractere in linha:
+        octetos = len(caractere.encode('utf-8'))
+        if tamanho + octetos > limite:
+            partes.append(''.join(atual))
+            atual, tamanho, limite = [], 0, LIMITE_LINHA - 1
+        atual.append(caractere)
+        tamanho += octetos
+    partes.append(''.join(atual))
+    return '\r\n '.join(partes) + '\r\n'
+
+
+def primeira_data(inicio_aulas, dia_cod):
+    """Primeira data a partir de inicio_aulas que cai no dia da semana da planilha."""
+    return inicio_aulas + timedelta(days=(_DIA_DA_SEMANA[dia_cod] - inicio_aulas.weekday()) % 7)
+
+
+def _formatar_deslocamento(delta):
+    minutos = int(delta.total_seconds()) // 60
+    sinal = '-' if minutos < 0 else '+'
+    return f"{sinal}{abs(minutos) // 60:02d}{abs(minutos) % 60:02d}"
+
+
+def bloco_fuso(referencia, fuso=FUSO):
+    """VTIMEZONE do fuso, com o deslocamento em vigor na data de referência."""
+    zona = ZoneInfo(fuso)
+    momento = datetime.combine(referencia, time(12), zona)
+    deslocamento = _formatar_deslocamento(momento.utcoffset())
+    return ''.join(map(dobrar, [
+        'BEGIN:VTIMEZONE',
+        f'TZID:{fuso}',
+        'BEGIN:STANDARD',
+        f'DTSTART:{referencia:%Y%m%d}T000000',
+        f'TZOFFSETFROM:{deslocamento}',
+        f'TZOFFSETTO:{deslocamento}',
+        f'TZNAME:{momento.tzname()}',
+        'END:STANDARD',
+        'END:VTIMEZONE',
+    ]))
+
+
+class ExportadorCalendario:
+    """
+    Gera os calendários de um modelo num período letivo. O texto de cada evento é
+    montado na primeira vez que aparece e reaproveitado nos demais calendários.
+    """
+    __slots__ = ('modelo', 'inicio_aulas', 'fim_aulas', 'carimbo', 'ate', 'fuso', '_eventos', '_textos')
+
+    def __init__(self, modelo, inicio_aulas=INICIO_AULAS, fim_aulas=FIM_AULAS, agora=None):
+        if fim_aulas < inicio_aulas:
+            raise ValueError(f"Fim das aulas ({fim_aulas}) antes do início ({inicio_aulas}).")
+        self.modelo = modelo
+        self.inicio_aulas = inicio_aulas
+        self.fim_aulas = fim_aulas
+        agora = agora or datetime.now(timezone.utc)
+        self.carimbo = agora.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        # UNTIL em UTC (obrigatório quando DTSTART tem TZID): fim do último dia letivo
+        fim_local = datetime.combine(fim_aulas, time(23, 59, 59), ZoneInfo(FUSO))
+        self.ate = fim_local.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        self.fuso = bloco_fuso(inicio_aulas)
+        self._eventos = {}
+        self._textos = {}
+
+    def eventos(self, oferta):
+        if oferta.id not in self._eventos:
+            self._eventos[oferta.id] = eventos_da_oferta(oferta)
+        return self._eventos[oferta.id]
+
+    def uid(self, evento):
+        """Identificador estável: o mesmo evento tem o mesmo UID em todos os calendários."""
+        oferta = evento.oferta
+        h = hashlib.blake2b(digest_size=10)
+        h.update(repr((oferta.codigo, oferta.turma, oferta.professor, evento.dia_cod, evento.turno,
+                       evento.aulas, evento.sala)).encode('utf-8'))
+        return f"{h.hexdigest()}@{DOMINIO_UID}"
+
+    def texto_evento(self, evento):
+        """VEVENT do evento (em cache: cada evento é formatado uma vez)."""
+        chave = id(evento)
+        texto = self._textos.get(chave)
+        if texto is None:
+            oferta = evento.oferta
+            dia = primeira_data(self.inicio_aulas, evento.dia_cod)
+            linhas = [
+                'BEGIN:VEVENT',
+                f'UID:{self.uid(evento)}',
+                f'DTSTAMP:{self.carimbo}',
+                f'DTSTART;TZID={FUSO}:{dia:%Y%m%d}T{evento.inicio:%H%M%S}',
+                f'DTEND;TZID={FUSO}:{dia:%Y%m%d}T{evento.fim:%H%M%S}',
+                f'RRULE:FREQ=WEEKLY;BYDAY={_DIA_ICAL[_DIA_DA_SEMANA[evento.dia_cod]]};UNTIL={self.ate}',
+                f'SUMMARY:{escapar(f"{oferta.codigo} - {oferta.nome_exibicao}")}',
+            ]
+            if evento.sala:
+                nome, campus = evento.sala
+                linhas.append(f'LOCATION:{escapar(f"{nome} ({campus})" if campus else nome)}')
+            if oferta.professores:
+                rotulo = 'Professores' if len(oferta.professores) > 1 else 'Professor'
+                nomes = ', '.join(oferta.professores)
+                linhas.append(f'DESCRIPTION:{escapar(f"{rotulo}: {nomes}")}')
+            linhas.append('END:VEVENT')
+            texto = self._textos[chave] = ''.join(map(dobrar, linhas))
+        return texto
+
+    def iter_calendario(self, nome, eventos):
+        """Gera, linha a linha, o calendário com estes eventos."""
+        yield dobrar('BEGIN:VCALENDAR')
+        yield dobrar('VERSION:2.0')
+        yield dobrar(f'PRODID:{PRODID}')
+        yield dobrar('CALSCALE:GREGORIAN')
+        yield dobrar(f'X-WR-CALNAME:{escapar(nome)}')
+        yield dobrar(f'X-WR-TIMEZONE:{FUSO}')
+        yield self.fuso
+        for evento in eventos:
+            yield self.texto_evento(evento)
+        yield dobrar('END:VCALENDAR')
+
+    def calendarios(self):
+        """
+        Calendários do modelo, um por vez: (pasta, nome, eventos) por professor,
+        por grupo de semestre e por sala. Os eventos de cada um são montados sob demanda.
+        """
+        modelo = self.modelo
+        # por_professor usa os nomes separados: uma aula de 'A / B' está no calendário de A e no de B
+        for professor in modelo.professores():
+            yield 'professores', professor, [e for o in modelo.por_professor[professor] for e in self.eventos(o)]
+
+        for chave in modelo.semestres_impares() + [GRUPO_REOFERTAS, GRUPO_OPTATIVAS]:
+            eventos = [e for o in modelo.por_grupo.get(chave, []) for e in self.eventos(o)]
+            if eventos:
+                yield 'turmas', titulo_do_grupo(chave), eventos
+
+        por_sala = {}
+        for oferta in modelo.ofertas:
+            for evento in self.eventos(oferta):
+                if evento.sala is not None:
+                    por_sala.setdefault(evento.sala, []).append(evento)
+        for sala in sorted(por_sala, key=lambda s: (str(s[1]), s[0])):
+            nome, campus = sala
+            yield 'salas', f"{nome} ({campus})" if campus else nome, por_sala[sala]
+
+
+def escrever_ics(partes, destino):
+    """Escreve o calendário em 'destino' à medida que é gerado (CRLF preservado)."""
+    pasta = os.path.dirname(destino)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(destino, 'w', encoding='utf-8', newline='') as f:
+        for parte in partes:
+            f.write(parte)
+
+
+def gerar_calendarios(modelo, pasta, inicio_aulas=INICIO_AULAS, fim_aulas=FIM_AULAS):
+    """
+    Escreve todos os calendários do modelo em 'pasta' (veja a estrutura no topo do módulo).
+    Retorna a lista de (caminho relativo, nome) dos arquivos gerados.
+    """
+    exportador = ExportadorCalendario(modelo, inicio_aulas, fim_aulas)
+    gerados = []
+    usados = set()
+    for subpasta, nome, eventos in exportador.calendarios():
+        base = slugificar(nome) or 'calendario'
+        slug, n = base, 2
+        while (subpasta, slug) in usados:
+            slug, n = f"{base}-{n}", n + 1
+        usados.add((subpasta, slug))
+
+        relativo = f"{subpasta}/{slug}.ics"
+        escrever_ics(exportador.iter_calendario(nome, eventos), os.path.join(pasta, relativo))
+        gerados.append((relativo, nome))
+    return gerados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta os horários como calendários .ics.")
+    parser.add_argument('--saida', default='calendarios', help="pasta de saída (padrão: calendarios)")
+    parser.add_argument('--inicio', type=date.fromisoformat, default=INICIO_AULAS,
+                        help=f"primeiro dia de aula, AAAA-MM-DD (padrão: {INICIO_AULAS})")
+    parser.add_argument('--fim', type=date.fromisoformat, default=FIM_AULAS,
+                        help=f"último dia de aula, AAAA-MM-DD (padrão: {FIM_AULAS})")
+    args = parser.parse_args(argv)
+
+    try:
+        gerados = gerar_calendarios(obter_modelo(), args.saida, args.inicio, args.fim)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{len(gerados)} calendário(s) gravado(s) em '{args.saida}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Carga docente: créditos, horas de aula, alunos e espalhamento por professor.
+
+As ofertas e as sessões do modelo viram dois DataFrames longos, e todas as métricas
+saem de uma única agregação agrupada por professor (sem laço por professor):
+
+- ofertas compartilhadas ('Fulano / Beltrano') entram uma vez para cada nome
+  (Oferta.professores), e cada professor fica com uma cota igual dos créditos;
+  aulas, horas e alunos contam inteiros para todos;
+- horas por semana vêm da duração real de cada slot decodificado (HORARIOS_TURNO);
+- turnos e dias contam em quantos turnos e dias da semana o professor dá aula.
+
+Professores com créditos fora dos limites (CREDITOS_MINIMOS / CREDITOS_MAXIMOS, ou as
+variáveis HORARIOS_CARGA_MINIMA / HORARIOS_CARGA_MAXIMA) são sinalizados no resumo do
+departamento, uma tabela que se ordena clicando no cabeçalho. Uso:
+
+    python carga_docente.py                        # grava relatorio_carga.html
+    python carga_docente.py --minimo 8 --maximo 16 # outros limites; lista os sinalizados
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+from instrumentacao import medido
+from modelo import construir_modelo, obter_modelo
+from planilha import HORARIOS_TURNO
+from renderizacao import CSS_TABELAS, escrever_html, formatar_numero, iter_tabela
+
+# Limites de créditos por professor no semestre (inclusive)
+CREDITOS_MINIMOS = float(os.environ.get('HORARIOS_CARGA_MINIMA', '8'))
+CREDITOS_MAXIMOS = float(os.environ.get('HORARIOS_CARGA_MAXIMA', '20'))
+
+ACIMA = 'acima'
+ABAIXO = 'abaixo'
+ROTULOS_SITUACAO = {ACIMA: 'Acima do limite', ABAIXO: 'Abaixo do mínimo'}
+
+COLUNAS_CARGA = ['Professor', 'Ofertas', 'Créditos', 'Aulas/semana', 'Horas/semana',
+                 'Alunos (est.)', 'Turnos', 'Dias', 'Situação']
+
+
+def _minutos(rotulo):
+    """'19:00-19:50' -> 50."""
+    inicio, fim = (int(h) * 60 + int(m) for h, m in (t.split(':') for t in rotulo.split('-')))
+    return fim - inicio
+
+
+# Duração em minutos de cada slot (turno, aula)
+DURACAO_SLOT = {(turno, aula): _minutos(rotulo)
+                for turno, lista in HORARIOS_TURNO.items() for aula, rotulo in enumerate(lista)}
+
+CSS_CARGA = """
+    table.ordenavel th { cursor: pointer; }
+    table.ordenavel th:hover { background-color: #e0e0e0; }
+    span.carga-acima { color: #c0392b; font-weight: bold; }
+    span.carga-abaixo { color: #b7950b; font-weight: bold; }
+"""
+
+# Ordenação no navegador: clicar num cabeçalho ordena pela coluna (números com vírgula decimal)
+SCRIPT_ORDENAR = """
+<script>
+document.querySelectorAll('table.ordenavel').forEach(function (tabela) {
+  tabela.querySelectorAll('th').forEach(function (th, coluna) {
+    th.addEventListener('click', function () {
+      var corpo = tabela.tBodies[0], linhas = Array.prototype.slice.call(corpo.rows);
+      var sentido = th.dataset.sentido === 'asc' ? -1 : 1;
+      th.dataset.sentido = sentido === 1 ? 'asc' : 'desc';
+      function valor(linha) {
+        var texto = linha.cells[coluna].textContent.trim(), numero = parseFloat(texto.replace(',', '.'));
+        return isNaN(numero) ? texto : numero;
+      }
+      linhas.sort(function (a, b) {
+        var x = valor(a), y = valor(b);
+        if (typeof x === 'number' && typeof y === 'number') return sentido * (x - y);
+        return sentido * String(x).localeCompare(String(y), 'pt-BR');
+      });
+      linhas.forEach(function (linha) { corpo.appendChild(linha); });
+    });
+  });
+});
+</script>
+"""
+
+
+def quadro_ofertas(modelo):
+    """Uma linha por (oferta, professor), com a cota de créditos de cada professor."""
+    ofertas = pd.DataFrame({
+        'oferta': [o.id for o in modelo.ofertas],
+        'professor': [list(o.professores) for o in modelo.ofertas],
+        'creditos': [o.creditos for o in modelo.ofertas],
+        'alunos': [o.num_alunos for o in modelo.ofertas],
+    })
+    # Ofertas sem professor viram NaN no explode e ficam de fora
+    ofertas = ofertas.explode('professor').dropna(subset=['professor'])
+    ofertas['cota'] = ofertas['creditos'] / ofertas.groupby('oferta')['professor'].transform('size')
+    return ofertas
+
+
+def quadro_sessoes(modelo):
+    """Uma linha por sessão decodificada: oferta, dia, turno e duração em minutos."""
+    return pd.DataFrame({
+        'oferta': [s.oferta.id for s in modelo.sessoes],
+        'dia': [s.dia_cod for s in modelo.sessoes],
+        'turno': [s.turno for s in modelo.sessoes],
+        'minutos': [DURACAO_SLOT.get((s.turno, s.aula), 0) for s in modelo.sessoes],
+    })
+
+
+@medido('carga.calcular')
+def calcular_carga(modelo, minimo=None, maximo=None):
+    """
+    Carga de todos os professores do modelo, um professor por linha (ordem alfabética).
+    Colunas: ofertas, creditos (cotas somadas), aulas, horas, alunos, turnos, dias e
+    situacao (ACIMA, ABAIXO ou '' em relação aos limites de créditos).
+    """
+    minimo = CREDITOS_MINIMOS if minimo is None else minimo
+    maximo = CREDITOS_MAXIMOS if maximo is None else maximo
+
+    # Ofertas sem horário entram com uma linha sem sessão (só créditos e alunos)
+    longo = quadro_ofertas(modelo).merge(quadro_sessoes(modelo), on='oferta', how='left')
+    # Valores da oferta contam só na primeira sessão de cada (oferta, professor)
+    primeira = ~longo.duplicated(['oferta', 'professor'])
+    longo['ofertas'] = primeira.astype(int)
+    longo['cota'] = longo['cota'].where(primeira, 0)
+    longo['alunos'] = longo['alunos'].where(primeira, 0)
+
+    carga = longo.groupby('professor', sort=True).agg(
+        ofertas=('ofertas', 'sum'),
+        creditos=('cota', 'sum'),
+        aulas=('dia', 'count'),
+        minutos=('minutos', 'sum'),
+        alunos=('alunos', 'sum'),
+        turnos=('turno', 'nunique'),
+        dias=('dia', 'nunique'),
+    )
+    carga['horas'] = carga.pop('minutos') / 60
+    carga['situacao'] = ''
+    carga.loc[carga['creditos'] > maximo, 'situacao'] = ACIMA
+    carga.loc[carga['creditos'] < minimo, 'situacao'] = ABAIXO
+    return carga
+
+
+def linhas_tabela_carga(carga):
+    """Linhas da tabela de carga (veja COLUNAS_CARGA), com a situação destacada."""
+    for professor, linha in zip(carga.index, carga.itertuples(index=False)):
+        situacao = linha.situacao and f"<span class='carga-{linha.situacao}'>{ROTULOS_SITUACAO[linha.situacao]}</span>"
+        yield (professor, linha.ofertas, formatar_numero(linha.creditos), linha.aulas, formatar_numero(linha.horas),
+               linha.alunos, linha.turnos, linha.dias, situacao)
+
+
+def texto_resumo_carga(carga, minimo=None, maximo=None):
+    """Frase de resumo do departamento: professores, créditos, média e sinalizados."""
+    minimo = CREDITOS_MINIMOS if minimo is None else minimo
+    maximo = CREDITOS_MAXIMOS if maximo is None else maximo
+    if carga.empty:
+        return "Nenhum professor com ofertas."
+    situacao = carga['situacao'].value_counts()
+    return (f"{len(carga)} professores, {formatar_numero(carga['creditos'].sum())} créditos "
+            f"(média {formatar_numero(carga['creditos'].mean())} por professor). "
+            f"Limites: de {formatar_numero(minimo)} a {formatar_numero(maximo)} créditos; "
+            f"{situacao.get(ACIMA, 0)} acima e {situacao.get(ABAIXO, 0)} abaixo.")
+
+
+def iter_secao_carga(modelo, minimo=None, maximo=None):
+    """Gera o resumo do departamento: frase de resumo e tabela ordenável de carga."""
+    carga = calcular_carga(modelo, minimo, maximo)
+    yield f"<style>{CSS_CARGA}</style>"
+    yield f"<p>{texto_resumo_carga(carga, minimo, maximo)}</p>"
+    yield from iter_tabela(COLUNAS_CARGA, linhas_tabela_carga(carga), 'carga ordenavel')
+    yield SCRIPT_ORDENAR
+
+
+def iter_html_carga(df_planilha=None, modelo=None, minimo=None, maximo=None):
+    """Gera, pedaço a pedaço, o relatório de carga docente como documento completo."""
+    if modelo is None:
+        modelo = construir_modelo(df_planilha) if df_planilha is not None else obter_modelo()
+
+    yield f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="UTF-8">
+<title>Carga Docente</title>
+<style>
+    body {{ font-family: Arial, sans-serif; margin: 40px; }}{CSS_TABELAS}</style>
+</head>
+<body>
+"""
+    yield "<h1>Carga Docente</h1>"
+    yield from iter_secao_carga(modelo, minimo, maximo)
+    yield "</body></html>"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relatório de carga docente por professor.")
+    parser.add_argument('--saida', default='relatorio_carga.html', help="arquivo HTML do relatório")
+    parser.add_argument('--minimo', type=float, default=CREDITOS_MINIMOS,
+                        help=f"créditos mínimos por professor (padrão: {formatar_numero(CREDITOS_MINIMOS)})")
+    parser.add_argument('--maximo', type=float, default=CREDITOS_MAXIMOS,
+                        help=f"créditos máximos por professor (padrão: {formatar_numero(CREDITOS_MAXIMOS)})")
+    args = parser.parse_args(argv)
+
+    modelo = obter_modelo()
+    escrever_html(iter_html_carga(modelo=modelo, minimo=args.minimo, maximo=args.maximo), args.saida)
+
+    carga = calcular_carga(modelo, args.minimo, args.maximo)
+    for professor, linha in carga[carga['situacao'] != ''].iterrows():
+        print(f"{ROTULOS_SITUACAO[linha['situacao']]}: {professor} ({formatar_numero(linha['creditos'])} créditos)")
+    print(texto_resumo_carga(carga, args.minimo, args.maximo))
+    print(f"Sucesso! Arquivo '{args.saida}' gerado.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Cliente mínimo da API do Google Sheets usado no download da planilha.
+
+- Abre a planilha pela chave (ID), sem a busca por nome no Drive a cada execução;
+- reaproveita uma única sessão HTTP autorizada em todas as requisições;
+- lê várias abas ou intervalos numa só chamada values:batchGet;
+- repete requisições que falham por limite de taxa (429), erro do servidor (5xx) ou
+  falha de rede, com espera exponencial e jitter (respeitando Retry-After).
+
+As URLs base, a sessão e a função de espera são parâmetros, então o cliente pode ser
+apontado para um servidor HTTP local que simula a API (e devolve 429/503 de propósito).
+"""
+import random
+import time
+
+from instrumentacao import etapa
+
+URL_SHEETS = 'https://sheets.googleapis.com/v4/spreadsheets'
+URL_DRIVE = 'https://www.googleapis.com/drive/v3/files'
+
+ESCOPOS = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+TIPO_PLANILHA = 'application/vnd.google-apps.spreadsheet'
+
+# Respostas que valem nova tentativa: limite de taxa e falhas temporárias do servidor
+STATUS_REPETIR = frozenset({408, 429, 500, 502, 503, 504})
+TENTATIVAS = 6
+ESPERA_BASE = 1.0    # segundos
+ESPERA_MAXIMA = 32.0 # segundos
+
+
+class ErroSheets(Exception):
+    """Falha definitiva ao acessar a API (erro não temporário ou tentativas esgotadas)."""
+
+    def __init__(self, mensagem, status=None):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def intervalo_da_aba(aba):
+    """Intervalo A1 que cobre a aba inteira: Planilha1 -> 'Planilha1'."""
+    return "'" + aba.replace("'", "''") + "'"
+
+
+def _retangular(linhas):
+    """A API omite células vazias no fim das linhas; completa todas até a mesma largura."""
+    largura = max((len(linha) for linha in linhas), default=0)
+    return [linha + [''] * (largura - len(linha)) for linha in linhas]
+
+
+class ClienteSheets:
+    """
+    Cliente da API sobre uma sessão HTTP já autorizada (ex.: AuthorizedSession do
+    google-auth, ou uma requests.Session comum para um servidor local de testes).
+    """
+    __slots__ = ('sessao', 'timeout', 'tentativas', 'espera_base', 'espera_maxima',
+                 'url_sheets', 'url_drive', 'dormir', 'aleatorio', 'requisicoes')
+
+    def __init__(self, sessao, timeout=30, tentativas=TENTATIVAS, espera_base=ESPERA_BASE,
+                 espera_maxima=ESPERA_MAXIMA, url_sheets=URL_SHEETS, url_drive=URL_DRIVE,
+                 dormir=time.sleep, aleatorio=random.random):
+        self.sessao = sessao
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.url_sheets = url_sheets.rstrip('/')
+        self.url_drive = url_drive.rstrip('/')
+        self.dormir = dormir
+        self.aleatorio = aleatorio
+        self.requisicoes = 0
+
+    def espera(self, tentativa, resposta=None):
+        """
+        Segundos até a próxima tentativa: o Retry-After do servidor, se houver, ou
+        "full jitter" (valor aleatório entre 0 e base * 2^tentativa, limitado ao máximo).
+        """
+        if resposta is not None:
+            try:
+                return min(float(resposta.headers['Retry-After']), self.espera_maxima)
+            except (KeyError, TypeError, ValueError):
+                pass
+        return self.aleatorio() * min(self.espera_maxima, self.espera_base * 2 ** tentativa)
+
+    def _get(self, url, params=None):
+        """GET com novas tentativas; retorna o JSON da resposta."""
+        import requests
+
+        for tentativa in range(self.tentativas):
+            ultima = tentativa == self.tentativas - 1
+            self.requisicoes += 1
+            try:
+                with etapa('sheets.requisicao', url=url, tentativa=tentativa) as medicao:
+                    resposta = self.sessao.get(url, params=params, timeout=self.timeout)
+                    medicao.bytes = len(resposta.content)
+                    medicao.atributos['status'] = resposta.status_code
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if ultima:
+                    raise ErroSheets(f"falha de rede após {self.tentativas} tentativas: {e}") from e
+                self.dormir(self.espera(tentativa))
+                continue
+
+            if resposta.status_code in STATUS_REPETIR and not ultima:
+                self.dormir(self.espera(tentativa, resposta))
+                continue
+            if resposta.status_code >= 400:
+                raise ErroSheets(f"HTTP {resposta.status_code} em {url}: {resposta.text[:200]}",
+                                 resposta.status_code)
+            return resposta.json()
+
+    def procurar_chave(self, nome):
+        """Chave da planilha com este nome (uma busca no Drive; guarde o resultado)."""
+        nome_escapado = nome.replace('\\', '\\\\').replace("'", "\\'")
+        dados = self._get(self.url_drive, {
+            'q': f"name = '{nome_escapado}' and mimeType = '{TIPO_PLANILHA}' and trashed = false",
+            'fields': 'files(id)',
+            'supportsAllDrives': 'true',
+            'includeItemsFromAllDrives': 'true',
+        })
+        arquivos = dados.get('files') or []
+        if not arquivos:
+            raise ErroSheets(f"planilha '{nome}' não encontrada", 404)
+        return arquivos[0]['id']
+
+    def revisao(self, chave):
+        """Data de modificação da planilha no Drive (muda a cada edição)."""
+        dados = self._get(f"{self.url_drive}/{chave}", {'fields': 'modifiedTime', 'supportsAllDrives': 'true'})
+        return dados.get('modifiedTime')
+
+    def obter_intervalos(self, chave, intervalos):
+        """Valores (como texto) de vários intervalos A1 numa única chamada batchGet."""
+        dados = self._get(f"{self.url_sheets}/{chave}/values:batchGet", {
+            'ranges': list(intervalos),
+            'majorDimension': 'ROWS',
+            'valueRenderOption': 'FORMATTED_VALUE',
+        })
+        return [_retangular(faixa.get('values', [])) for faixa in dados.get('valueRanges', [])]
+
+    def obter_abas(self, chave, abas):
+        """Conteúdo de várias abas inteiras, {aba: linhas}, numa única chamada."""
+        return dict(zip(abas, self.obter_intervalos(chave, [intervalo_da_aba(aba) for aba in abas])))
@@ -0,0 +1,144 @@
+from instrumentacao import medido
+from renderizacao import iter_tabela
+
+# Tipos de conflito detectados
+CONFLITO_SALA = 'sala'
+CONFLITO_PROFESSOR = 'professor'
+CONFLITO_SEMESTRE = 'semestre'
+
+ROTULOS_CONFLITO = {
+    CONFLITO_SALA: 'Sala ocupada por mais de uma turma',
+    CONFLITO_PROFESSOR: 'Professor em duas turmas ao mesmo tempo',
+    CONFLITO_SEMESTRE: 'Obrigatórias do mesmo semestre no mesmo horário',
+}
+
+COLUNAS_TABELA_CONFLITOS = ['Tipo', 'Dia', 'Horário', 'Recurso', 'Disciplinas']
+
+
+class Conflito:
+    """Um recurso (sala, professor ou semestre) usado por mais de uma oferta no mesmo slot."""
+    __slots__ = ('tipo', 'recurso', 'slot', 'sessoes')
+
+    def __init__(self, tipo, recurso, slot, sessoes):
+        self.tipo = tipo
+        self.recurso = recurso
+        self.slot = slot
+        self.sessoes = sessoes
+
+    @property
+    def dia(self):
+        return self.sessoes[0].dia
+
+    @property
+    def horario(self):
+        return self.sessoes[0].horario
+
+    def __repr__(self):
+        return f"Conflito({self.tipo!r}, {self.recurso!r}, {self.dia} {self.horario})"
+
+
+def _agrupar(sessoes, chave):
+    """Agrupa as sessões de um slot pela chave, ignorando chaves vazias."""
+    grupos = {}
+    for sessao in sessoes:
+        valor = chave(sessao)
+        if valor:
+            grupos.setdefault(valor, []).append(sessao)
+    return grupos
+
+
+def _agrupar_varios(sessoes, chaves):
+    """Como _agrupar, mas cada sessão pode entrar em mais de um grupo."""
+    grupos = {}
+    for sessao in sessoes:
+        for valor in chaves(sessao):
+            grupos.setdefault(valor, []).append(sessao)
+    return grupos
+
+
+def chave_sala(sessao):
+    """Sala de uma sessão como (sala, campus), ou None se não informada."""
+    if not sessao.sala or not sessao.sala.strip():
+        return None
+    return (sessao.sala.strip(), sessao.oferta.campus)
+
+
+def _chaves_professor(sessao):
+    # Oferta compartilhada ocupa cada um dos professores
+    return sessao.oferta.professores
+
+
+def _chave_semestre(sessao):
+    grupo = sessao.oferta.grupo
+    # Só os semestres ímpares têm obrigatórias que não podem colidir
+    return grupo if isinstance(grupo, int) else None
+
+
+@medido('conflitos.detectar', linhas=lambda modelo: len(modelo.sessoes))
+def detectar_conflitos(modelo):
+    """
+    Percorre o índice por (dia, turno, aula) do modelo uma única vez.
+    Em cada slot, agrupa as sessões por sala, professor e semestre com dicionários,
+    então o custo é linear no número de sessões (sem comparar pares).
+    Retorna a lista de Conflito ordenada por dia e horário.
+    """
+    conflitos = []
+
+    for slot, sessoes in modelo.por_dia_horario.items():
+        if len(sessoes) < 2:
+            continue
+
+        for sala, grupo in _agrupar(sessoes, chave_sala).items():
+            if len({id(s.oferta) for s in grupo}) > 1:
+                conflitos.append(Conflito(CONFLITO_SALA, sala, slot, grupo))
+
+        for professor, grupo in _agrupar_varios(sessoes, _chaves_professor).items():
+            if len({id(s.oferta) for s in grupo}) > 1:
+                conflitos.append(Conflito(CONFLITO_PROFESSOR, professor, slot, grupo))
+
+        for semestre, grupo in _agrupar(sessoes, _chave_semestre).items():
+            # Turmas diferentes da mesma disciplina são alternativas, não colisão
+            if len({s.oferta.codigo for s in grupo}) > 1:
+                conflitos.append(Conflito(CONFLITO_SEMESTRE, semestre, slot, grupo))
+
+    ordem_tipo = list(ROTULOS_CONFLITO)
+    conflitos.sort(key=lambda c: (c.slot, ordem_tipo.index(c.tipo)))
+    return conflitos
+
+
+def sessoes_em_conflito(conflitos):
+    """Conjunto das sessões envolvidas em algum conflito (para destacar nas grades)."""
+    return {sessao for conflito in conflitos for sessao in conflito.sessoes}
+
+
+def descrever_recurso(conflito):
+    if conflito.tipo == CONFLITO_SALA:
+        sala, campus = conflito.recurso
+        return f"{sala} ({campus})" if campus else sala
+    if conflito.tipo == CONFLITO_SEMESTRE:
+        return f"{conflito.recurso}º Semestre"
+    return conflito.recurso
+
+
+def linhas_tabela_conflitos(conflitos):
+    """Linhas (Tipo, Dia, Horário, Recurso, Disciplinas) para a tabela de conflitos."""
+    for conflito in conflitos:
+        disciplinas = []
+        for sessao in conflito.sessoes:
+            oferta = sessao.oferta
+            rotulo = f"{oferta.codigo} {oferta.turma}".strip()
+            if rotulo not in disciplinas:
+                disciplinas.append(rotulo)
+        yield (
+            ROTULOS_CONFLITO[conflito.tipo],
+            conflito.dia,
+            conflito.horario,
+            descrever_recurso(conflito),
+            '<br>'.join(disciplinas),
+        )
+
+
+
+def iter_tabela_conflitos(conflitos):
+    """Gera, pedaço a pedaço, a tabela de conflitos."""
+    yield from iter_tabela(COLUNAS_TABELA_CONFLITOS, linhas_tabela_conflitos(conflitos), 'detalhes')
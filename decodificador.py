@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from instrumentacao import medido
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+
+# Colunas de horário/sala da planilha (pares 'horario i' / 'sala i')
+NUM_HORARIOS = 6
+
+DIAS_ORDENADOS = list(DIAS_DA_SEMANA.values())
+TURNOS = list(HORARIOS_TURNO.keys())
+
+# --- TABELAS DE CONSULTA POR DÍGITO ---
+# O código '231' é lido como dia=2, turno=3, aula=1 (1-based).
+# Cada dígito indexa diretamente um array, sem dicionários por linha.
+_DIA_VALIDO = np.zeros(10, dtype=bool)
+_DIA_VALIDO[[int(d) for d in DIAS_DA_SEMANA]] = True
+
+_AULAS_POR_TURNO = np.zeros(10, dtype=np.int8)
+_HORA_POR_TURNO_AULA = np.full((10, 10), '', dtype=object)
+for _turno, _lista in HORARIOS_TURNO.items():
+    _AULAS_POR_TURNO[int(_turno)] = len(_lista)
+    _HORA_POR_TURNO_AULA[int(_turno), 1:len(_lista) + 1] = _lista
+
+COLUNAS_SESSOES = ['linha', 'indice', 'codigo_horario', 'dia_cod', 'turno', 'aula', 'dia', 'horario', 'sala']
+COLUNAS_REJEITADOS = ['linha', 'indice', 'valor', 'motivo']
+
+
+def _derreter(df):
+    """
+    Empilha as colunas 'horario i' e 'sala i' em formato longo.
+    Retorna (posicao, linha, indice, valor, sala) como arrays já em ordem de linha.
+    """
+    indices = [i for i in range(1, NUM_HORARIOS + 1) if f'horario {i}' in df.columns]
+    n = len(df)
+    if not indices or n == 0:
+        vazio = np.array([], dtype=object)
+        return np.array([], dtype=np.int64), vazio, np.array([], dtype=np.int8), vazio, vazio
+
+    posicao = np.tile(np.arange(n), len(indices))
+    indice = np.repeat(np.array(indices, dtype=np.int8), n)
+    valores = np.concatenate([df[f'horario {i}'].to_numpy(dtype=object) for i in indices])
+
+    # Sem a coluna 'sala i' a sala fica nula (cada gerador decide o texto padrão)
+    salas = np.concatenate([
+        df[f'sala {i}'].to_numpy(dtype=object) if f'sala {i}' in df.columns else np.full(n, None, dtype=object)
+        for i in indices
+    ])
+
+    # Ordena por linha mantendo a ordem das colunas (mesma ordem da leitura linha a linha)
+    ordem = np.argsort(posicao, kind='stable')
+    linha = df.index.to_numpy()[posicao[ordem]]
+    return posicao[ordem], linha, indice[ordem], valores[ordem], salas[ordem]
+
+
+def validar_codigos(texto):
+    """
+    Valida códigos de horário já sem espaços (Series de strings não vazias).
+    Retorna (codigo, valido, motivo) como arrays: o código como int16 (0 se não for
+    um número de ao menos 3 dígitos), se é um slot válido e, para os inválidos, o motivo.
+    Códigos mais longos são lidos pelos 3 primeiros dígitos ('2311' -> 231).
+    """
+    numero = pd.to_numeric(texto, errors='coerce').to_numpy(dtype=float)
+    numerico = ~np.isnan(numero)
+    inteiro = numerico & (np.mod(numero, 1) == 0)
+
+    # Um dígito a menos por passada, só nos códigos que ainda têm mais de 3
+    prefixo = np.where(inteiro & (numero >= 100), numero, 0)
+    while (prefixo >= 1000).any():
+        prefixo = np.where(prefixo >= 1000, prefixo // 10, prefixo)
+    tres_digitos = prefixo >= 100
+
+    codigo = prefixo.astype(np.int16)
+    dia_cod = codigo // 100
+    turno = (codigo // 10) % 10
+    aula = codigo % 10
+
+    dia_ok = tres_digitos & _DIA_VALIDO[dia_cod]
+    turno_ok = dia_ok & (_AULAS_POR_TURNO[turno] > 0)
+    valido = turno_ok & (aula >= 1) & (aula <= _AULAS_POR_TURNO[turno])
+
+    motivo = np.select(
+        [~numerico, ~inteiro, ~tres_digitos, ~dia_ok, ~turno_ok],
+        ['código não numérico', 'código não inteiro', 'código deve ter ao menos 3 dígitos',
+         'dia da semana inválido', 'turno inválido'],
+        default='aula fora do turno',
+    )
+    return codigo, valido, motivo
+
+
+@medido('decodificador.decodificar', linhas=len)
+def decodificar_horarios(df):
+    """
+    Decodifica todas as colunas 'horario 1..6' de uma vez.
+
+    Retorna (sessoes, rejeitados):
+    - sessoes: um registro por aula válida, com 'linha' (índice da linha em df),
+      'indice' (i da coluna), dia/turno/aula decodificados, rótulo do horário e sala.
+    - rejeitados: células preenchidas cujo código não é válido, com o motivo.
+    Células vazias não entram em nenhum dos dois.
+    """
+    _, linha, indice, valores, salas = _derreter(df)
+
+    texto = pd.Series(valores, dtype='string').str.strip()
+    preenchido = (texto.fillna('') != '').to_numpy()
+    linha, indice, salas, texto = linha[preenchido], indice[preenchido], salas[preenchido], texto[preenchido]
+
+    codigo, valido, motivo = validar_codigos(texto)
+    dia_cod = codigo // 100
+    turno = (codigo // 10) % 10
+    aula = codigo % 10
+
+    # --- REJEITADOS ---
+    invalido = ~valido
+    rejeitados = pd.DataFrame({
+        'linha': linha[invalido],
+        'indice': indice[invalido],
+        'valor': texto.to_numpy(dtype=object)[invalido],
+        'motivo': motivo[invalido],
+    }, columns=COLUNAS_REJEITADOS)
+
+    # --- SESSÕES VÁLIDAS ---
+    dia_cod, turno, aula = dia_cod[valido], turno[valido], aula[valido]
+    sessoes = pd.DataFrame({
+        'linha': linha[valido],
+        'indice': indice[valido],
+        'codigo_horario': codigo[valido],
+        'dia_cod': pd.Categorical(dia_cod.astype(str), categories=list(DIAS_DA_SEMANA)),
+        'turno': pd.Categorical(turno.astype(str), categories=TURNOS),
+        'aula': (aula - 1).astype(np.int8),
+        'dia': pd.Categorical.from_codes(
+            np.searchsorted(np.array([int(d) for d in DIAS_DA_SEMANA]), dia_cod),
+            categories=DIAS_ORDENADOS, ordered=True),
+        'horario': _HORA_POR_TURNO_AULA[turno, aula],
+        'sala': salas[valido],
+    }, columns=COLUNAS_SESSOES)
+
+    return sessoes, rejeitados
@@ -0,0 +1,239 @@
+"""
+Diferenças entre duas versões da planilha: o que mudou de uma renderização para outra.
+
+As linhas são casadas pela chave (codigo, turma); chaves repetidas na mesma versão
+são distinguidas pela ordem de aparição. Cada linha tem uma impressão digital (hash do
+conteúdo), então linhas iguais são descartadas sem olhar campo a campo e a comparação
+é linear no número de linhas. Só as linhas com impressão diferente são detalhadas:
+
+- oferta adicionada ou removida;
+- horários movidos (códigos que saíram e que entraram);
+- troca de sala ou de professor;
+- demais campos alterados (disciplina, semestre, créditos, campus);
+- número de inscritos. As matrículas em si não entram: o registro vai para a página
+  publicada e para alteracoes.json (veja matriculas.py).
+
+As mesmas impressões servem para invalidação barata em outras etapas: se a impressão
+do snapshot não mudou, nada a jusante precisa ser refeito. Uso:
+
+    python diferencas.py                       # últimas duas versões guardadas, em JSON
+    python diferencas.py anterior.pkl atual.pkl
+"""
+import hashlib
+import json
+import sys
+
+from modelo import separar_alunos
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+from renderizacao import iter_tabela
+
+ADICIONADA = 'adicionada'
+REMOVIDA = 'removida'
+HORARIO = 'horario'
+SALA = 'sala'
+PROFESSOR = 'professor'
+CAMPO = 'campo'
+
+ROTULOS_ALTERACAO = {
+    ADICIONADA: 'Oferta adicionada',
+    REMOVIDA: 'Oferta removida',
+    HORARIO: 'Horário alterado',
+    SALA: 'Sala alterada',
+    PROFESSOR: 'Professor alterado',
+    CAMPO: 'Dado alterado',
+}
+
+COLUNAS_TABELA_ALTERACOES = ['Alteração', 'Código', 'Turma', 'Disciplina', 'Antes', 'Depois']
+
+# Campos comparados um a um (além de horários e salas, que vêm em pares 'horario i' / 'sala i').
+# 'alunos' fica de fora: só a contagem de inscritos é comparada (CAMPO_INSCRITOS)
+CAMPOS = ('disciplina', 'semestre', 'creditos', 'campus')
+CAMPO_INSCRITOS = 'inscritos'
+
+_SEPARADOR = '\x1f'
+
+
+def impressao_linha(linha):
+    """Impressão digital (8 bytes) do conteúdo de uma linha."""
+    return hashlib.blake2b(_SEPARADOR.join(linha).encode('utf-8'), digest_size=8).digest()
+
+
+def impressao_snapshot(snapshot):
+    """Impressão digital (hex) do snapshot inteiro: cabeçalho e todas as linhas, em ordem."""
+    cabecalho, linhas = snapshot
+    h = hashlib.blake2b(digest_size=10)
+    h.update(_SEPARADOR.join(cabecalho).encode('utf-8'))
+    for linha in linhas:
+        h.update(impressao_linha(linha))
+    return h.hexdigest()
+
+
+def _texto(valor):
+    return str(valor).strip()
+
+
+class VersaoIndexada:
+    """Linhas de um snapshot por chave (codigo, turma, ocorrência), com suas impressões."""
+    __slots__ = ('posicao', 'linhas', 'impressoes', 'pares')
+
+    def __init__(self, snapshot):
+        cabecalho, linhas = snapshot
+        self.posicao = {nome.strip(): i for i, nome in enumerate(cabecalho)}
+        self.pares = [(self.posicao[f'horario {i}'], self.posicao.get(f'sala {i}'))
+                      for i in range(1, len(cabecalho) + 1) if f'horario {i}' in self.posicao]
+        self.linhas = {}
+        self.impressoes = {}
+        ocorrencias = {}
+        for linha in linhas:
+            base = (self.valor(linha, 'codigo'), self.valor(linha, 'turma'))
+            n = ocorrencias[base] = ocorrencias.get(base, -1) + 1
+            chave = (*base, n)
+            self.linhas[chave] = linha
+            self.impressoes[chave] = impressao_linha(linha)
+
+    def valor(self, linha, campo):
+        i = self.posicao.get(campo)
+        return _texto(linha[i]) if i is not None and i < len(linha) else ''
+
+    def horarios(self, linha):
+        """Códigos de horário preenchidos, em ordem, sem repetição."""
+        return list(dict.fromkeys(_texto(linha[h]) for h, _ in self.pares if h < len(linha) and _texto(linha[h])))
+
+    def salas(self, linha):
+        return list(dict.fromkeys(_texto(linha[s]) for _, s in self.pares
+                                  if s is not None and s < len(linha) and _texto(linha[s])))
+
+
+def rotulo_codigo(codigo):
+    """'231' -> 'segunda-feira 19:00-19:50'; códigos fora do padrão ficam como estão."""
+    if len(codigo) == 3 and codigo[0] in DIAS_DA_SEMANA and codigo[1] in HORARIOS_TURNO:
+        aulas = HORARIOS_TURNO[codigo[1]]
+        if codigo[2].isdigit() and 1 <= int(codigo[2]) <= len(aulas):
+            return f"{DIAS_DA_SEMANA[codigo[0]]} {aulas[int(codigo[2]) - 1]}"
+    return codigo
+
+
+class Alteracao:
+    """Uma mudança numa oferta entre duas versões."""
+    __slots__ = ('tipo', 'codigo', 'turma', 'disciplina', 'campo', 'antes', 'depois')
+
+    def __init__(self, tipo, codigo, turma, disciplina, antes=None, depois=None, campo=None):
+        self.tipo = tipo
+        self.codigo = codigo
+        self.turma = turma
+        self.disciplina = disciplina
+        self.campo = campo
+        self.antes = antes
+        self.depois = depois
+
+    def como_dict(self):
+        return {'tipo': self.tipo, 'codigo': self.codigo, 'turma': self.turma, 'disciplina': self.disciplina,
+                'campo': self.campo, 'antes': self.antes, 'depois': self.depois}
+
+    def __repr__(self):
+        return f"Alteracao({self.tipo!r}, {self.codigo!r}, turma={self.turma!r})"
+
+
+def _comparar_linha(codigo, turma, velha, anterior, nova, atual):
+    """Alterações campo a campo de uma oferta presente nas duas versões."""
+    disciplina = atual.valor(nova, 'disciplina') or anterior.valor(velha, 'disciplina')
+    alteracoes = []
+
+    antes, depois = anterior.horarios(velha), atual.horarios(nova)
+    if set(antes) != set(depois):
+        saiu = [rotulo_codigo(c) for c in antes if c not in depois]
+        entrou = [rotulo_codigo(c) for c in depois if c not in antes]
+        alteracoes.append(Alteracao(HORARIO, codigo, turma, disciplina, saiu, entrou))
+
+    antes, depois = anterior.salas(velha), atual.salas(nova)
+    if set(antes) != set(depois):
+        alteracoes.append(Alteracao(SALA, codigo, turma, disciplina, antes, depois))
+
+    antes, depois = anterior.valor(velha, 'professor'), atual.valor(nova, 'professor')
+    if antes != depois:
+        alteracoes.append(Alteracao(PROFESSOR, codigo, turma, disciplina, antes, depois))
+
+    for campo in CAMPOS:
+        antes, depois = anterior.valor(velha, campo), atual.valor(nova, campo)
+        if antes != depois:
+            alteracoes.append(Alteracao(CAMPO, codigo, turma, disciplina, antes, depois, campo))
+
+    antes, depois = (len(separar_alunos(versao.valor(linha, 'alunos')))
+                     for versao, linha in ((anterior, velha), (atual, nova)))
+    if antes != depois:
+        alteracoes.append(Alteracao(CAMPO, codigo, turma, disciplina, str(antes), str(depois), CAMPO_INSCRITOS))
+    return alteracoes
+
+
+def comparar(snapshot_anterior, snapshot_atual):
+    """
+    Lista de Alteracao entre duas versões, na ordem da planilha atual (as removidas no fim).
+    Linhas com a mesma impressão digital nas duas versões não são examinadas.
+    """
+    anterior = VersaoIndexada(snapshot_anterior)
+    atual = VersaoIndexada(snapshot_atual)
+    alteracoes = []
+
+    for chave, nova in atual.linhas.items():
+        codigo, turma, _ = chave
+        velha = anterior.linhas.get(chave)
+        if velha is None:
+            alteracoes.append(Alteracao(ADICIONADA, codigo, turma, atual.valor(nova, 'disciplina'),
+                                        depois=[rotulo_codigo(c) for c in atual.horarios(nova)]))
+        elif anterior.impressoes[chave] != atual.impressoes[chave]:
+            alteracoes.extend(_comparar_linha(codigo, turma, velha, anterior, nova, atual))
+
+    for chave, velha in anterior.linhas.items():
+        if chave not in atual.linhas:
+            codigo, turma, _ = chave
+            alteracoes.append(Alteracao(REMOVIDA, codigo, turma, anterior.valor(velha, 'disciplina'),
+                                        antes=[rotulo_codigo(c) for c in anterior.horarios(velha)]))
+    return alteracoes
+
+
+def _formatar(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, list):
+        return '<br>'.join(valor)
+    return valor
+
+
+def linhas_tabela_alteracoes(alteracoes):
+    """Linhas (Alteração, Código, Turma, Disciplina, Antes, Depois) da tabela de alterações."""
+    for alteracao in alteracoes:
+        rotulo = ROTULOS_ALTERACAO[alteracao.tipo]
+        if alteracao.campo:
+            rotulo = f"{rotulo} ({alteracao.campo})"
+        yield (rotulo, alteracao.codigo, alteracao.turma, alteracao.disciplina,
+               _formatar(alteracao.antes), _formatar(alteracao.depois))
+
+
+def iter_secao_alteracoes(alteracoes):
+    """Gera a seção 'Alterações desde a versão anterior' (nada se não houver alterações)."""
+    if not alteracoes:
+        return
+    yield "<h1 class='secao'>Alterações desde a versão anterior</h1>"
+    yield from iter_tabela(COLUNAS_TABELA_ALTERACOES, linhas_tabela_alteracoes(alteracoes), 'detalhes')
+
+
+def alteracoes_como_json(alteracoes, anterior=None, atual=None):
+    """Registro de alterações em JSON (com as impressões das duas versões, se informadas)."""
+    return json.dumps({
+        'anterior': anterior and impressao_snapshot(anterior),
+        'atual': atual and impressao_snapshot(atual),
+        'alteracoes': [alteracao.como_dict() for alteracao in alteracoes],
+    }, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    from planilha import listar_versoes, ler_versao
+
+    if len(sys.argv) == 3:
+        versoes = sys.argv[1:]
+    else:
+        versoes = listar_versoes()[-2:]
+        if len(versoes) < 2:
+            sys.exit("É preciso ter ao menos duas versões guardadas da planilha.")
+    anterior, atual = (ler_versao(caminho) for caminho in versoes)
+    print(alteracoes_como_json(comparar(anterior, atual), anterior, atual))
@@ -0,0 +1,94 @@
+"""
+Gera a página publicada diretamente, sem Quarto nem kernel Jupyter.
+
+Produz o mesmo conteúdo do previa-2026-1.qmd (cabeçalho, horários por turma e por
+professor) a partir de um único download da planilha. Uso:
+
+    python -m gerar_pagina --saida _site/index.html
+    python -m gerar_pagina --saida _site/index.html --dividir _site/paginas
+
+Com --dividir, também escreve uma página pequena por professor e por semestre e um
+índice de busca em JSON (veja saida_dividida.py). Com --calendarios, também exporta
+um calendário .ics por professor, semestre e sala (veja calendario.py), no período
+letivo de --inicio-aulas / --fim-aulas:
+
+    python -m gerar_pagina --calendarios _site/calendarios --inicio-aulas 2026-08-10 --fim-aulas 2026-12-12
+
+Quando há uma versão anterior da planilha guardada, a página abre com as alterações
+desde essa versão, e o mesmo registro é gravado em alteracoes.json, ao lado da página.
+
+O .qmd continua funcionando como alternativa (quarto render previa-2026-1.qmd).
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+from pagina import CURSO, TERMO, iter_pagina_completa
+from planilha import ABA_NOME, PLANILHA_NOME, obter_snapshot, snapshot_para_dataframe, versao_anterior
+from renderizacao import escrever_html
+
+
+def gerar_pagina(saida, planilha_nome=PLANILHA_NOME, aba_nome=ABA_NOME, curso=CURSO, termo=TERMO,
+                 pasta_dividida=None, pasta_calendarios=None, inicio_aulas=None, fim_aulas=None):
+    """
+    Baixa a planilha (ou usa o cache), monta o modelo e grava a página em 'saida'.
+    pasta_dividida: se informada, grava também a saída dividida nessa pasta.
+    pasta_calendarios: se informada, grava também os calendários .ics nessa pasta, entre
+    inicio_aulas e fim_aulas (padrão: calendario.INICIO_AULAS / FIM_AULAS).
+    """
+    from diferencas import alteracoes_como_json, comparar
+    from modelo import construir_modelo
+
+    snapshot = obter_snapshot(planilha_nome, aba_nome)
+    modelo = construir_modelo(snapshot_para_dataframe(snapshot))
+    if not modelo.validacao.empty:
+        from ingestao import resumo_validacao
+        print(f"AVISO: {resumo_validacao(modelo.validacao)}; detalhes com 'python ingestao.py'.", file=sys.stderr)
+
+    # Registro de alterações em relação à última versão diferente guardada
+    anterior = versao_anterior(snapshot, planilha_nome, aba_nome)
+    alteracoes = comparar(anterior, snapshot) if anterior is not None else []
+    escrever_html([alteracoes_como_json(alteracoes, anterior, snapshot)],
+                  os.path.join(os.path.dirname(saida), 'alteracoes.json'))
+
+    escrever_html(iter_pagina_completa(modelo, curso, termo, alteracoes), saida)
+
+    if pasta_dividida:
+        from saida_dividida import gerar_paginas_divididas
+        gerar_paginas_divididas(modelo, pasta_dividida, curso, termo)
+
+    if pasta_calendarios:
+        from calendario import FIM_AULAS, INICIO_AULAS, gerar_calendarios
+        gerar_calendarios(modelo, pasta_calendarios, inicio_aulas or INICIO_AULAS, fim_aulas or FIM_AULAS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera a página de horários sem passar pelo Quarto.")
+    parser.add_argument('--saida', default='_site/index.html', help="arquivo HTML de saída (padrão: _site/index.html)")
+    parser.add_argument('--planilha', default=PLANILHA_NOME, help=f"nome da planilha (padrão: {PLANILHA_NOME})")
+    parser.add_argument('--aba', default=ABA_NOME, help=f"aba da planilha (padrão: {ABA_NOME})")
+    parser.add_argument('--curso', default=CURSO, help=f"nome do curso no cabeçalho (padrão: {CURSO})")
+    parser.add_argument('--termo', default=TERMO, help=f"semestre letivo no cabeçalho (padrão: {TERMO})")
+    parser.add_argument('--dividir', metavar='PASTA',
+                        help="também grava uma página por professor/semestre e o índice de busca nesta pasta")
+    parser.add_argument('--calendarios', metavar='PASTA',
+                        help="também grava um calendário .ics por professor/semestre/sala nesta pasta")
+    parser.add_argument('--inicio-aulas', type=date.fromisoformat,
+                        help="primeiro dia de aula dos calendários, AAAA-MM-DD (padrão: HORARIOS_INICIO_AULAS)")
+    parser.add_argument('--fim-aulas', type=date.fromisoformat,
+                        help="último dia de aula dos calendários, AAAA-MM-DD (padrão: HORARIOS_FIM_AULAS)")
+    args = parser.parse_args(argv)
+    if args.inicio_aulas and args.fim_aulas and args.fim_aulas < args.inicio_aulas:
+        parser.error(f"--fim-aulas ({args.fim_aulas}) antes de --inicio-aulas ({args.inicio_aulas}).")
+
+    inicio = time.perf_counter()
+    gerar_pagina(args.saida, args.planilha, args.aba, args.curso, args.termo, args.dividir, args.calendarios,
+                 args.inicio_aulas, args.fim_aulas)
+    print(f"Página gerada em '{args.saida}' ({time.perf_counter() - inicio:.2f}s).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Histórico de vários termos num banco SQLite local, com consultas indexadas.
+
+Cada termo (curso + semestre letivo, como nos alvos de lote.py) é importado a partir do
+modelo da sua planilha para um esquema normalizado:
+
+    termos       (curso, termo, planilha, aba, impressão do snapshot, data da importação)
+    professores  nome único
+    salas        (sala, campus) únicos
+    ofertas      uma linha da planilha num termo, com créditos (e a célula 'professor' original)
+    docencias    um professor numa oferta: uma linha por nome numa oferta compartilhada,
+                 com a cota de créditos dele (como em carga_docente.py)
+    sessoes      uma aula semanal de uma oferta: (dia, turno, aula) e sala
+    uso_salas    aulas semanais por (termo, sala), agregadas na importação
+
+Há índices por professor, sala, código da disciplina e (dia, turno, aula), então
+perguntas entre termos (carga de um professor nos últimos seis termos, tendência de uso
+das salas) são respondidas em milissegundos. Importar um termo de novo substitui os
+dados dele; tudo numa única transação, com executemany. Uso:
+
+    python historico.py importar --alvos alvos.yml
+    python historico.py importar --curso "Engenharia de Materiais" --termo 2026/1 --planilha planilha-2026-1
+    python historico.py carga "Nome do Professor" --termos 6
+    python historico.py salas --termos 6 --campus Anglo
+    python historico.py disciplina MAT00001
+
+O banco fica em historico.sqlite3 (ou no caminho de HORARIOS_HISTORICO).
+"""
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+
+from planilha import ABA_NOME, PLANILHA_NOME
+from pagina import CURSO, TERMO
+
+CAMINHO_BANCO = os.environ.get('HORARIOS_HISTORICO', 'historico.sqlite3')
+TERMOS_CONSULTA = 6
+# Versão do esquema (PRAGMA user_version); bancos de outra versão precisam ser reimportados
+VERSAO_ESQUEMA = 1
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS termos (
+    id INTEGER PRIMARY KEY,
+    curso TEXT NOT NULL,
+    termo TEXT NOT NULL,
+    planilha TEXT,
+    aba TEXT,
+    impressao TEXT,
+    importado_em TEXT NOT NULL,
+    UNIQUE (curso, termo)
+);
+CREATE TABLE IF NOT EXISTS professores (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS salas (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    campus TEXT NOT NULL DEFAULT '',
+    UNIQUE (nome, campus)
+);
+CREATE TABLE IF NOT EXISTS ofertas (
+    id INTEGER PRIMARY KEY,
+    termo_id INTEGER NOT NULL REFERENCES termos (id) ON DELETE CASCADE,
+    linha INTEGER,
+    codigo TEXT NOT NULL,
+    disciplina TEXT,
+    turma TEXT,
+    professor TEXT,
+    semestre INTEGER,
+    grupo TEXT,
+    creditos INTEGER NOT NULL DEFAULT 0,
+    alunos INTEGER NOT NULL DEFAULT 0,
+    campus TEXT
+);
+CREATE TABLE IF NOT EXISTS docencias (
+    professor_id INTEGER NOT NULL REFERENCES professores (id),
+    termo_id INTEGER NOT NULL REFERENCES termos (id) ON DELETE CASCADE,
+    oferta_id INTEGER NOT NULL REFERENCES ofertas (id) ON DELETE CASCADE,
+    cota REAL NOT NULL,
+    PRIMARY KEY (professor_id, termo_id, oferta_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sessoes (
+    id INTEGER PRIMARY KEY,
+    oferta_id INTEGER NOT NULL REFERENCES ofertas (id) ON DELETE CASCADE,
+    termo_id INTEGER NOT NULL REFERENCES termos (id) ON DELETE CASCADE,
+    dia TEXT NOT NULL,
+    turno TEXT NOT NULL,
+    aula INTEGER NOT NULL,
+    sala_id INTEGER REFERENCES salas (id)
+);
+CREATE TABLE IF NOT EXISTS uso_salas (
+    termo_id INTEGER NOT NULL REFERENCES termos (id) ON DELETE CASCADE,
+    sala_id INTEGER NOT NULL REFERENCES salas (id),
+    aulas INTEGER NOT NULL,
+    PRIMARY KEY (termo_id, sala_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_docencias_oferta ON docencias (oferta_id);
+CREATE INDEX IF NOT EXISTS idx_ofertas_codigo ON ofertas (codigo, termo_id);
+CREATE INDEX IF NOT EXISTS idx_ofertas_termo ON ofertas (termo_id);
+CREATE INDEX IF NOT EXISTS idx_sessoes_sala ON sessoes (sala_id, termo_id);
+CREATE INDEX IF NOT EXISTS idx_sessoes_slot ON sessoes (termo_id, dia, turno, aula);
+CREATE INDEX IF NOT EXISTS idx_sessoes_oferta ON sessoes (oferta_id);
+"""
+
+
+def abrir(caminho=None):
+    """
+    Abre (criando, se preciso) o banco do histórico. Um banco de outra versão do esquema
+    levanta sqlite3.DatabaseError.
+    """
+    caminho = caminho or CAMINHO_BANCO
+    conexao = sqlite3.connect(caminho)
+    versao = conexao.execute('PRAGMA user_version').fetchone()[0]
+    existente = conexao.execute("SELECT count(*) FROM sqlite_master WHERE name = 'termos'").fetchone()[0]
+    if existente and versao != VERSAO_ESQUEMA:
+        conexao.close()
+        raise sqlite3.DatabaseError(f"O banco '{caminho}' usa outra versão do esquema ({versao}); "
+                                    f"apague-o e importe os termos de novo.")
+    conexao.execute('PRAGMA foreign_keys = ON')
+    conexao.execute('PRAGMA journal_mode = WAL')
+    conexao.executescript(ESQUEMA)
+    conexao.execute(f'PRAGMA user_version = {VERSAO_ESQUEMA}')
+    return conexao
+
+
+def _inteiro(valor):
+    return None if valor is None else int(valor)
+
+
+def importar_termo(conexao, modelo, curso=CURSO, termo=TERMO, planilha=None, aba=None, impressao=None):
+    """
+    Grava o modelo de um termo no banco, substituindo uma importação anterior do mesmo
+    (curso, termo). Tudo numa transação. Retorna o id do termo.
+    """
+    from conflitos import chave_sala
+
+    agora = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    with conexao:
+        linha = conexao.execute('SELECT id FROM termos WHERE curso = ? AND termo = ?', (curso, termo)).fetchone()
+        if linha is None:
+            termo_id = conexao.execute(
+                'INSERT INTO termos (curso, termo, planilha, aba, impressao, importado_em) VALUES (?, ?, ?, ?, ?, ?)',
+                (curso, termo, planilha, aba, impressao, agora)).lastrowid
+        else:
+            termo_id = linha[0]
+            conexao.execute('DELETE FROM uso_salas WHERE termo_id = ?', (termo_id,))
+            conexao.execute('DELETE FROM docencias WHERE termo_id = ?', (termo_id,))
+            conexao.execute('DELETE FROM sessoes WHERE termo_id = ?', (termo_id,))
+            conexao.execute('DELETE FROM ofertas WHERE termo_id = ?', (termo_id,))
+            conexao.execute('UPDATE termos SET planilha = ?, aba = ?, impressao = ?, importado_em = ? WHERE id = ?',
+                            (planilha, aba, impressao, agora, termo_id))
+
+        # Dimensões: professores (nomes já separados, veja modelo.separar_professores) e salas
+        nomes = {professor for oferta in modelo.ofertas for professor in oferta.professores}
+        conexao.executemany('INSERT OR IGNORE INTO professores (nome) VALUES (?)', ((nome,) for nome in nomes))
+        salas = {chave_sala(sessao) for sessao in modelo.sessoes} - {None}
+        conexao.executemany('INSERT OR IGNORE INTO salas (nome, campus) VALUES (?, ?)',
+                            ((nome, campus or '') for nome, campus in salas))
+        id_professor = dict(conexao.execute('SELECT nome, id FROM professores'))
+        id_sala = {(nome, campus): id for id, nome, campus in conexao.execute('SELECT id, nome, campus FROM salas')}
+
+        # Fatos: ofertas com ids explícitos (para ligar as sessões sem consultar de volta)
+        base = conexao.execute('SELECT coalesce(max(id), 0) + 1 FROM ofertas').fetchone()[0]
+        conexao.executemany(
+            'INSERT INTO ofertas (id, termo_id, linha, codigo, disciplina, turma, professor, semestre, grupo,'
+            ' creditos, alunos, campus) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            ((base + oferta.id, termo_id, _inteiro(oferta.linha), oferta.codigo, oferta.disciplina, oferta.turma,
+              (oferta.professor or '').strip(), _inteiro(oferta.semestre),
+              None if oferta.grupo is None else str(oferta.grupo), int(oferta.creditos or 0),
+              oferta.num_alunos, oferta.campus)
+             for oferta in modelo.ofertas))
+        # Uma docência por nome: a oferta compartilhada conta para cada professor
+        conexao.executemany(
+            'INSERT INTO docencias (professor_id, termo_id, oferta_id, cota) VALUES (?, ?, ?, ?)',
+            ((id_professor[professor], termo_id, base + oferta.id, oferta.cota_creditos)
+             for oferta in modelo.ofertas for professor in oferta.professores))
+
+        linhas_sessoes = []
+        aulas_por_sala = {}
+        for sessao in modelo.sessoes:
+            sala = chave_sala(sessao)
+            sala_id = None if sala is None else id_sala[(sala[0], sala[1] or '')]
+            if sala_id is not None:
+                aulas_por_sala[sala_id] = aulas_por_sala.get(sala_id, 0) + 1
+            linhas_sessoes.append((base + sessao.oferta.id, termo_id, sessao.dia_cod, sessao.turno,
+                                   int(sessao.aula), sala_id))
+        conexao.executemany(
+            'INSERT INTO sessoes (oferta_id, termo_id, dia, turno, aula, sala_id) VALUES (?, ?, ?, ?, ?, ?)',
+            linhas_sessoes)
+        # Agregado por sala: a tendência de uso não precisa percorrer as sessões
+        conexao.executemany('INSERT INTO uso_salas (termo_id, sala_id, aulas) VALUES (?, ?, ?)',
+                            ((termo_id, sala_id, aulas) for sala_id, aulas in aulas_por_sala.items()))
+    # Atualiza as estatísticas do planejador de consultas depois de uma carga grande
+    conexao.execute('PRAGMA optimize')
+    return termo_id
+
+
+def termos_recentes(conexao, quantidade=TERMOS_CONSULTA):
+    """Os últimos semestres letivos importados (de qualquer curso), do mais antigo ao mais novo."""
+    termos = [t for (t,) in conexao.execute(
+        'SELECT DISTINCT termo FROM termos ORDER BY termo DESC LIMIT ?', (quantidade,))]
+    return termos[::-1]
+
+
+def carga_professor(conexao, professor, quantidade=TERMOS_CONSULTA):
+    """
+    Carga do professor em cada um dos últimos termos: [(termo, créditos, ofertas)],
+    com zero nos termos em que ele não deu aula. Ofertas compartilhadas contam com a
+    cota de créditos do professor.
+    """
+    termos = termos_recentes(conexao, quantidade)
+    if not termos:
+        return []
+    marcadores = ', '.join('?' * len(termos))
+    totais = {termo: (creditos, ofertas) for termo, creditos, ofertas in conexao.execute(
+        f"""SELECT t.termo, sum(d.cota), count(*)
+            FROM professores p
+            JOIN docencias d ON d.professor_id = p.id
+            JOIN termos t ON t.id = d.termo_id
+            WHERE p.nome = ? AND t.termo IN ({marcadores})
+            GROUP BY t.termo""", (professor.strip(), *termos))}
+    return [(termo, *totais.get(termo, (0, 0))) for termo in termos]
+
+
+def uso_salas(conexao, quantidade=TERMOS_CONSULTA, campus=None):
+    """
+    Tendência de uso: {(sala, campus): {termo: aulas semanais}} nos últimos termos.
+    """
+    termos = termos_recentes(conexao, quantidade)
+    if not termos:
+        return {}
+    marcadores = ', '.join('?' * len(termos))
+    salas = {id: (nome, campus_sala) for id, nome, campus_sala in conexao.execute(
+        'SELECT id, nome, campus FROM salas' + (' WHERE campus = ?' if campus is not None else ''),
+        () if campus is None else (campus,))}
+    uso = {}
+    # Lê o agregado pela chave primária (termo_id, sala_id); os nomes vêm do dicionário acima
+    for sala_id, termo, aulas in conexao.execute(
+            f"""SELECT u.sala_id, t.termo, u.aulas
+                FROM termos t
+                JOIN uso_salas u ON u.termo_id = t.id
+                WHERE t.termo IN ({marcadores})""", termos):
+        sala = salas.get(sala_id)
+        if sala is not None:
+            por_termo = uso.setdefault(sala, {})
+            por_termo[termo] = por_termo.get(termo, 0) + aulas
+    return dict(sorted(uso.items(), key=lambda item: (item[0][1], item[0][0])))
+
+
+def salas_ocupadas(conexao, curso, termo, dia, turno, aula):
+    """Salas ocupadas num slot (dia '3', turno '2', aula 0) de um termo."""
+    return [(nome, campus) for nome, campus in conexao.execute(
+        """SELECT DISTINCT s.nome, s.campus
+           FROM termos t
+           JOIN sessoes x ON x.termo_id = t.id AND x.dia = ? AND x.turno = ? AND x.aula = ?
+           JOIN salas s ON s.id = x.sala_id
+           WHERE t.curso = ? AND t.termo = ?
+           ORDER BY s.campus, s.nome""", (dia, turno, aula, curso, termo))]
+
+
+def ofertas_da_disciplina(conexao, codigo):
+    """Ofertas de uma disciplina em todos os termos: [(curso, termo, turma, professor, créditos, alunos)]."""
+    return conexao.execute(
+        """SELECT t.curso, t.termo, o.turma, coalesce(o.professor, ''), o.creditos, o.alunos
+           FROM ofertas o
+           JOIN termos t ON t.id = o.termo_id
+           WHERE o.codigo = ?
+           ORDER BY t.termo, t.curso, o.turma""", (codigo.strip(),)).fetchall()
+
+
+def importar_alvos(conexao, alvos):
+    """Baixa (ou lê do cache) e importa cada alvo de lote.py. Retorna {alvo: termo_id}."""
+    from diferencas import impressao_snapshot
+    from modelo import construir_modelo
+    from planilha import baixar_snapshots, snapshot_para_dataframe
+
+    por_planilha = {}
+    for alvo in alvos:
+        por_planilha.setdefault((alvo.planilha, alvo.chave), []).append(alvo)
+
+    importados = {}
+    for (planilha, chave), grupo in por_planilha.items():
+        snapshots = baixar_snapshots(planilha, list(dict.fromkeys(a.aba for a in grupo)), None, chave)
+        for alvo in grupo:
+            snapshot = snapshots[alvo.aba]
+            modelo = construir_modelo(snapshot_para_dataframe(snapshot))
+            importados[alvo] = importar_termo(conexao, modelo, alvo.curso, alvo.termo, alvo.planilha, alvo.aba,
+                                              impressao_snapshot(snapshot))
+    return importados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Histórico de horários de vários termos (SQLite).")
+    parser.add_argument('--banco', default=CAMINHO_BANCO, help=f"arquivo do banco (padrão: {CAMINHO_BANCO})")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    importar = comandos.add_parser('importar', help="importa termos a partir das planilhas")
+    importar.add_argument('--alvos', help="arquivo YAML de alvos (veja alvos.yml)")
+    importar.add_argument('--planilha', default=PLANILHA_NOME)
+    importar.add_argument('--aba', default=ABA_NOME)
+    importar.add_argument('--curso', default=CURSO)
+    importar.add_argument('--termo', default=TERMO)
+
+    carga = comandos.add_parser('carga', help="créditos de um professor nos últimos termos")
+    carga.add_argument('professor')
+    carga.add_argument('--termos', type=int, default=TERMOS_CONSULTA)
+
+    salas = comandos.add_parser('salas', help="aulas semanais por sala nos últimos termos")
+    salas.add_argument('--termos', type=int, default=TERMOS_CONSULTA)
+    salas.add_argument('--campus')
+
+    disciplina = comandos.add_parser('disciplina', help="ofertas de uma disciplina em todos os termos")
+    disciplina.add_argument('codigo')
+
+    args = parser.parse_args(argv)
+    try:
+        conexao = abrir(args.banco)
+    except sqlite3.DatabaseError as e:
+        parser.error(str(e))
+
+    if args.comando == 'importar':
+        from lote import Alvo, carregar_alvos
+
+        alvos = carregar_alvos(args.alvos) if args.alvos else [Alvo(args.planilha, args.aba, args.curso, args.termo)]
+        for alvo in importar_alvos(conexao, alvos):
+            print(f"{alvo.curso} {alvo.termo}: importado.")
+
+    elif args.comando == 'carga':
+        print(f"{'termo':<10} {'créditos':>9} {'ofertas':>8}")
+        for termo, creditos, ofertas in carga_professor(conexao, args.professor, args.termos):
+            print(f"{termo:<10} {creditos:>9g} {ofertas:>8}")
+
+    elif args.comando == 'salas':
+        uso = uso_salas(conexao, args.termos, args.campus)
+        termos = termos_recentes(conexao, args.termos)
+        print(f"{'sala':<30} " + ' '.join(f"{termo:>8}" for termo in termos))
+        for (nome, campus), por_termo in uso.items():
+            rotulo = f"{nome} ({campus})" if campus else nome
+            print(f"{rotulo:<30} " + ' '.join(f"{por_termo.get(termo, 0):>8}" for termo in termos))
+
+    else:
+        for curso, termo, turma, professor, creditos, alunos in ofertas_da_disciplina(conexao, args.codigo):
+            print(f"{termo:<8} {curso:<30} {turma:<4} {professor:<30} {creditos:>3} créd. {alunos:>4} alunos")
+
+    conexao.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Ingestão tipada da planilha: aplica o esquema de colunas uma única vez.
+
+O snapshot chega com todos os valores como texto. Aqui cada coluna é convertida de
+uma vez, e o restante do código não precisa mais reinterpretar valores
+linha a linha:
+
+- texto: sem espaços nas pontas e sem os nulos literais ('nan', 'None', ...);
+- categoria: professor, campus, código e salas (poucos valores distintos, muitas repetições);
+- inteiro pequeno (Int8/Int16 anuláveis): semestre, créditos e códigos de horário.
+
+Valores que não passam no esquema viram nulos e entram no relatório de validação,
+uma linha por célula: (linha, coluna, valor, motivo). Uso:
+
+    python ingestao.py   # mostra o relatório de validação da planilha configurada
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from instrumentacao import medido
+from decodificador import NUM_HORARIOS, validar_codigos
+from planilha import VALORES_NULOS, obter_snapshot, snapshot_para_dataframe
+
+TEXTO = 'texto'
+CATEGORIA = 'categoria'
+INTEIRO = 'inteiro'
+HORARIO = 'horario'
+
+# Coluna -> (tipo, dtype); as colunas 'horario i' / 'sala i' seguem os padrões abaixo
+ESQUEMA = {
+    'codigo': (CATEGORIA, 'category'),
+    'disciplina': (TEXTO, object),
+    'turma': (TEXTO, object),
+    'professor': (CATEGORIA, 'category'),
+    'semestre': (INTEIRO, 'Int8'),
+    'creditos': (INTEIRO, 'Int8'),
+    'alunos': (TEXTO, object),
+    'campus': (CATEGORIA, 'category'),
+}
+ESQUEMA_HORARIO = (HORARIO, 'Int16')
+ESQUEMA_SALA = (CATEGORIA, 'category')
+
+COLUNAS_RELATORIO = ['linha', 'coluna', 'valor', 'motivo']
+
+_INTEIRO = re.compile(r'[+-]?\d+')
+
+
+def esquema_da_coluna(nome):
+    """(tipo, dtype) de uma coluna da planilha, ou None se ela não faz parte do esquema."""
+    if nome in ESQUEMA:
+        return ESQUEMA[nome]
+    prefixo, _, indice = nome.rpartition(' ')
+    if indice.isdigit() and 1 <= int(indice) <= NUM_HORARIOS:
+        if prefixo == 'horario':
+            return ESQUEMA_HORARIO
+        if prefixo == 'sala':
+            return ESQUEMA_SALA
+    return None
+
+
+def _texto(coluna):
+    """Coluna como array de strings sem espaços nas pontas; vazios e nulos literais viram ''."""
+    texto = [
+        '' if valor is None or valor != valor else str(valor).strip()
+        for valor in coluna.to_numpy(dtype=object)
+    ]
+    return np.array(['' if valor in VALORES_NULOS else valor for valor in texto], dtype=object)
+
+
+def _converter_inteiro(texto, dtype):
+    """
+    Retorna (valores, invalido, motivo) para uma coluna de inteiros. O formato (_INTEIRO) é
+    conferido e a conversão (pd.to_numeric) é feita de uma vez para a coluna inteira.
+    """
+    limites = np.iinfo(dtype.lower())
+    serie = pd.Series(texto, dtype=object)
+    preenchido = texto != ''
+    aceito = preenchido & serie.str.fullmatch(_INTEIRO).to_numpy(dtype=bool, na_value=False)
+    numeros = pd.to_numeric(serie.where(aceito), errors='coerce').to_numpy(dtype=float)
+    # Células que não viraram número (máscara de NaN) e números fora do intervalo do dtype
+    nao_inteiro = preenchido & np.isnan(numeros)
+    fora = ~nao_inteiro & ((numeros < limites.min) | (numeros > limites.max))
+    invalido = nao_inteiro | fora
+
+    motivo = np.full(len(texto), '', dtype=object)
+    motivo[nao_inteiro] = 'não é um número inteiro'
+    motivo[fora] = 'fora do intervalo'
+    valores = pd.Series(np.where(invalido, np.nan, numeros)).astype(dtype).array
+    return valores, invalido, motivo
+
+
+def _converter_horario(texto, dtype):
+    """Retorna (valores, invalido, motivo) para uma coluna 'horario i' (regras do decodificador)."""
+    preenchido = texto != ''
+    codigo = np.zeros(len(texto), dtype=np.int16)
+    valido = np.zeros(len(texto), dtype=bool)
+    motivo = np.full(len(texto), '', dtype=object)
+    if preenchido.any():
+        codigo[preenchido], valido[preenchido], motivo[preenchido] = validar_codigos(pd.Series(texto[preenchido]))
+
+    valores = pd.array(np.where(valido, codigo, 0), dtype=dtype)
+    valores[~valido] = pd.NA
+    return valores, preenchido & ~valido, motivo
+
+
+@medido('ingestao.ingerir', linhas=len)
+def ingerir(df_bruto):
+    """
+    Aplica o esquema ao DataFrame bruto (só strings) da planilha.
+    Retorna (df, relatorio): o DataFrame tipado, com o mesmo índice, e o relatório de
+    validação (linha, coluna, valor, motivo) das células rejeitadas e colunas ausentes.
+    """
+    colunas = {}
+    problemas = []
+
+    for nome in df_bruto.columns:
+        esquema = esquema_da_coluna(nome)
+        texto = _texto(df_bruto[nome])
+        if esquema is None:
+            colunas[nome] = texto
+            continue
+
+        tipo, dtype = esquema
+        if tipo == TEXTO:
+            colunas[nome] = texto
+        elif tipo == CATEGORIA:
+            colunas[nome] = pd.Categorical(texto)
+        else:
+            converter = _converter_inteiro if tipo == INTEIRO else _converter_horario
+            colunas[nome], invalido, motivo = converter(texto, dtype)
+            if invalido.any():
+                problemas.append(pd.DataFrame({
+                    'linha': df_bruto.index.to_numpy()[invalido],
+                    'coluna': nome,
+                    'valor': texto[invalido],
+                    'motivo': motivo[invalido],
+                }, columns=COLUNAS_RELATORIO))
+
+    # Colunas obrigatórias ausentes entram vazias, para que o resto do código não precise checar
+    for nome, (tipo, dtype) in ESQUEMA.items():
+        if nome in colunas:
+            continue
+        problemas.append(pd.DataFrame([[None, nome, '', 'coluna ausente']], columns=COLUNAS_RELATORIO))
+        if tipo == INTEIRO:
+            colunas[nome] = pd.array([pd.NA] * len(df_bruto), dtype=dtype)
+        elif tipo == CATEGORIA:
+            colunas[nome] = pd.Categorical([''] * len(df_bruto))
+        else:
+            colunas[nome] = np.full(len(df_bruto), '', dtype=object)
+
+    df = pd.DataFrame(colunas, index=df_bruto.index)
+    relatorio = (pd.concat(problemas, ignore_index=True) if problemas
+                 else pd.DataFrame(columns=COLUNAS_RELATORIO))
+    return df, relatorio
+
+
+def ingerir_snapshot(snapshot):
+    """Atalho: DataFrame tipado e relatório de validação a partir de um snapshot."""
+    return ingerir(snapshot_para_dataframe(snapshot))
+
+
+def resumo_validacao(relatorio):
+    """Uma linha de aviso para o log, ou '' se não houver problemas."""
+    if relatorio.empty:
+        return ''
+    por_coluna = relatorio['coluna'].value_counts()
+    detalhes = ', '.join(f"{coluna}: {n}" for coluna, n in por_coluna.items())
+    return f"{len(relatorio)} problema(s) na planilha ({detalhes})"
+
+
+if __name__ == "__main__":
+    _, relatorio = ingerir_snapshot(obter_snapshot())
+    if relatorio.empty:
+        print("Nenhum problema encontrado na planilha.")
+    else:
+        # 'linha' é o índice do DataFrame: a linha da planilha é linha + 2 (cabeçalho e base 1)
+        relatorio = relatorio.assign(linha_planilha=relatorio['linha'].map(
+            lambda linha: '' if linha is None or pd.isna(linha) else int(linha) + 2))
+        print(relatorio[['linha_planilha', 'coluna', 'valor', 'motivo']].to_string(index=False))
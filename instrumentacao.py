@@ -0,0 +1,300 @@
+"""
+Instrumentação por etapa: onde foi o tempo de uma renderização.
+
+Desligada por padrão, sem custo além de uma chamada vazia por etapa. Para ligar, sem
+editar código:
+
+    HORARIOS_INSTRUMENTACAO=1 python -m gerar_pagina
+    HORARIOS_INSTRUMENTACAO=medicoes.json HORARIOS_PERFIL=perfil.pstats quarto render previa-2026-1.qmd
+
+Cada etapa (download da planilha, requisições à API, ingestão, modelo, conflitos,
+grades e geração do HTML) vira um registro com tempo de parede, linhas processadas e,
+para os geradores de HTML, bytes produzidos. Etapas aninhadas apontam para a etapa mãe.
+Ao fim do processo, o relatório é gravado em JSON (padrão:
+.cache/instrumentacao/<pid>.json; '{pid}' no caminho é substituído) e um resumo por
+etapa vai para o stderr. HORARIOS_PERFIL grava também um perfil do cProfile, para ler
+com 'python -m pstats perfil.pstats'.
+
+Só as LIMITE_ETAPAS etapas mais recentes ficam em memória (HORARIOS_INSTRUMENTACAO_LIMITE),
+para que processos longos, como o servidor.py, não acumulem registros sem fim; o
+relatório informa quantas foram descartadas.
+"""
+import atexit
+import collections
+import functools
+import os
+import sys
+import threading
+import time
+
+PASTA_RELATORIOS = os.path.join('.cache', 'instrumentacao')
+
+_variavel = os.environ.get('HORARIOS_INSTRUMENTACAO', '')
+HABILITADO = _variavel not in ('', '0')
+CAMINHO_RELATORIO = _variavel if HABILITADO and _variavel != '1' else os.path.join(PASTA_RELATORIOS, '{pid}.json')
+CAMINHO_PERFIL = os.environ.get('HORARIOS_PERFIL', '')
+LIMITE_ETAPAS = int(os.environ.get('HORARIOS_INSTRUMENTACAO_LIMITE', '100000'))
+
+# Etapas registradas neste processo, na ordem em que começaram (só as mais recentes)
+_etapas = collections.deque(maxlen=LIMITE_ETAPAS)
+_registradas = 0
+# Pilha de etapas abertas, por thread (downloads em paralelo não se misturam)
+_local = threading.local()
+_inicio = time.perf_counter()
+_contador = iter(range(1, 1 << 62))
+
+# Bit de co_flags das funções geradoras (inspect.CO_GENERATOR, sem importar o inspect)
+_CO_GENERATOR = 0x20
+
+
+def _pilha():
+    pilha = getattr(_local, 'pilha', None)
+    if pilha is None:
+        pilha = _local.pilha = []
+    return pilha
+
+
+class Etapa:
+    """
+    Uma etapa medida. Use como context manager (veja etapa()); 'linhas' e 'atributos'
+    podem ser preenchidos dentro do bloco, quando só se conhecem no fim.
+    """
+    __slots__ = ('id', 'pai', 'nome', 'inicio', 'duracao', 'linhas', 'bytes', 'atributos', '_retomada')
+
+    def __init__(self, nome, linhas=None, atributos=None):
+        self.id = next(_contador)
+        self.pai = None
+        self.nome = nome
+        self.inicio = None
+        self.duracao = 0.0
+        self.linhas = linhas
+        self.bytes = None
+        self.atributos = atributos or {}
+        self._retomada = None
+
+    def retomar(self):
+        """Abre (ou reabre, no caso de um gerador) a etapa na thread atual."""
+        global _registradas
+        pilha = _pilha()
+        agora = time.perf_counter()
+        if self.inicio is None:
+            self.inicio = agora
+            self.pai = pilha[-1].id if pilha else None
+            _etapas.append(self)
+            _registradas += 1
+        pilha.append(self)
+        self._retomada = agora
+
+    def pausar(self):
+        self.duracao += time.perf_counter() - self._retomada
+        pilha = _pilha()
+        if pilha and pilha[-1] is self:
+            pilha.pop()
+
+    def __enter__(self):
+        self.retomar()
+        return self
+
+    def __exit__(self, *_):
+        self.pausar()
+
+    def como_dict(self):
+        return {
+            'id': self.id,
+            'pai': self.pai,
+            'nome': self.nome,
+            'inicio_s': round(self.inicio - _inicio, 6),
+            'duracao_s': round(self.duracao, 6),
+            'linhas': self.linhas,
+            'bytes': self.bytes,
+            'atributos': self.atributos,
+        }
+
+
+class _EtapaNula:
+    """Etapa usada com a instrumentação desligada: não mede nem guarda nada."""
+    __slots__ = ('linhas', 'bytes', 'atributos')
+
+    def __init__(self):
+        self.linhas = None
+        self.bytes = None
+        self.atributos = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+
+_NULA = _EtapaNula()
+
+
+def etapa(nome, linhas=None, **atributos):
+    """
+    Context manager que mede um bloco:
+
+        with etapa('modelo.construir', linhas=len(df)) as e:
+            ...
+            e.atributos['ofertas'] = len(ofertas)
+    """
+    if not HABILITADO:
+        return _NULA
+    return Etapa(nome, linhas, atributos)
+
+
+def medir_partes(nome, partes, **atributos):
+    """
+    Envolve um iterável de pedaços de HTML: mede só o tempo gasto produzindo os pedaços
+    (não o de quem os consome), conta os pedaços em 'linhas' e os bytes (UTF-8) em 'bytes'.
+    """
+    if not HABILITADO:
+        return partes
+    return _iter_medido(Etapa(nome, 0, atributos), partes)
+
+
+def _iter_medido(registro, partes):
+    registro.bytes = 0
+    iterador = iter(partes)
+    while True:
+        registro.retomar()
+        try:
+            parte = next(iterador)
+        except StopIteration:
+            return
+        finally:
+            registro.pausar()
+        registro.linhas += 1
+        registro.bytes += len(parte.encode('utf-8'))
+        yield parte
+
+
+def medido(nome, linhas=None):
+    """
+    Decorador: mede cada chamada da função como a etapa 'nome'.
+    linhas: função opcional que recebe os mesmos argumentos e retorna quantas linhas a
+    chamada processa (ex.: len para um DataFrame). Em funções geradoras, mede os pedaços
+    produzidos (veja medir_partes).
+    """
+    def decorar(funcao):
+        if funcao.__code__.co_flags & _CO_GENERATOR:
+            @functools.wraps(funcao)
+            def gerador(*args, **kwargs):
+                return medir_partes(nome, funcao(*args, **kwargs))
+            return gerador
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not HABILITADO:
+                return funcao(*args, **kwargs)
+            with Etapa(nome, linhas(*args, **kwargs) if linhas else None):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorar
+
+
+def etapas():
+    """Etapas registradas até agora neste processo."""
+    return list(_etapas)
+
+
+def descartadas():
+    """Etapas que já saíram da memória por causa de LIMITE_ETAPAS."""
+    return _registradas - len(_etapas)
+
+
+def limpar():
+    """Descarta as etapas registradas (ex.: entre repetições de um benchmark)."""
+    global _registradas
+    _etapas.clear()
+    _registradas = 0
+
+
+def resumo(registros=None):
+    """Totais por nome de etapa: {nome: {chamadas, total_s, max_s, linhas, bytes}}, do mais lento ao mais rápido."""
+    totais = {}
+    for registro in _etapas if registros is None else registros:
+        total = totais.setdefault(registro.nome, {'chamadas': 0, 'total_s': 0.0, 'max_s': 0.0, 'linhas': 0, 'bytes': 0})
+        total['chamadas'] += 1
+        total['total_s'] += registro.duracao
+        total['max_s'] = max(total['max_s'], registro.duracao)
+        total['linhas'] += registro.linhas or 0
+        total['bytes'] += registro.bytes or 0
+    return dict(sorted(totais.items(), key=lambda item: -item[1]['total_s']))
+
+
+def relatorio():
+    """Relatório completo (o mesmo gravado em JSON ao fim do processo)."""
+    registros = etapas()
+    return {
+        'pid': os.getpid(),
+        'argv': sys.argv,
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'total_s': round(time.perf_counter() - _inicio, 6),
+        'descartadas': descartadas(),
+        'resumo': resumo(registros),
+        'etapas': [registro.como_dict() for registro in registros],
+    }
+
+
+def _caminho(modelo):
+    return modelo.replace('{pid}', str(os.getpid()))
+
+
+def gravar_relatorio(caminho=None):
+    """Grava o relatório em JSON e retorna o caminho usado."""
+    import json
+
+    caminho = _caminho(caminho or CAMINHO_RELATORIO)
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(relatorio(), f, ensure_ascii=False, indent=2)
+    return caminho
+
+
+def texto_resumo(limite=15):
+    """Tabela curta das etapas mais lentas, para o log."""
+    linhas = [f"{'etapa':<28} {'chamadas':>8} {'total (ms)':>11} {'linhas':>8} {'KB':>9}"]
+    for nome, total in list(resumo().items())[:limite]:
+        linhas.append(f"{nome:<28} {total['chamadas']:>8} {total['total_s'] * 1000:>11.1f} "
+                      f"{total['linhas']:>8} {total['bytes'] / 1024:>9.1f}")
+    return '\n'.join(linhas)
+
+
+def _ao_sair():
+    if not _etapas:
+        return
+    try:
+        caminho = gravar_relatorio()
+    except OSError as e:
+        print(f"AVISO: não foi possível gravar o relatório de instrumentação: {e}", file=sys.stderr)
+        return
+    print(f"Instrumentação (pid {os.getpid()}), relatório em '{caminho}':\n{texto_resumo()}", file=sys.stderr)
+
+
+def _iniciar_perfil():
+    import cProfile
+
+    perfil = cProfile.Profile()
+    perfil.enable()
+
+    def gravar():
+        perfil.disable()
+        caminho = _caminho(CAMINHO_PERFIL)
+        try:
+            pasta = os.path.dirname(caminho)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            perfil.dump_stats(caminho)
+        except OSError as e:
+            print(f"AVISO: não foi possível gravar o perfil: {e}", file=sys.stderr)
+
+    atexit.register(gravar)
+
+
+if HABILITADO:
+    atexit.register(_ao_sair)
+if CAMINHO_PERFIL:
+    _iniciar_perfil()
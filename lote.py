@@ -0,0 +1,183 @@
+"""
+Renderização em lote: vários cursos/termos (uma aba de planilha cada) numa só execução.
+
+As planilhas são baixadas em paralelo (threads, pois é espera de rede), com todas as abas
+de uma mesma planilha numa única chamada, e cada página é renderizada num processo
+separado assim que o seu snapshot chega. O tempo total fica
+próximo ao do alvo mais lento, e não à soma de todos.
+
+Uso:
+    python lote.py alvos.yml --saida _site
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import NamedTuple
+
+from pagina import CSS_PAGINA, iter_pagina_completa
+from planilha import ABA_NOME, baixar_snapshots, snapshot_para_dataframe
+from renderizacao import escrever_html, slugificar
+
+
+class Alvo(NamedTuple):
+    """
+    Uma página a renderizar: (planilha, aba, curso, termo) e, opcionalmente, a chave da
+    planilha e o nome da pasta de saída (veja pasta_do_alvo).
+    """
+    planilha: str
+    aba: str
+    curso: str
+    termo: str
+    chave: str | None = None
+    pasta: str | None = None
+
+
+def carregar_alvos(caminho):
+    """Lê a lista de alvos de um arquivo YAML (veja alvos.yml)."""
+    import yaml
+
+    with open(caminho, encoding='utf-8') as f:
+        itens = yaml.safe_load(f) or []
+
+    return [
+        Alvo(
+            planilha=item['planilha'],
+            aba=item.get('aba', ABA_NOME),
+            curso=item['curso'],
+            termo=str(item['termo']),
+            chave=item.get('chave'),
+            pasta=item.get('pasta'),
+        )
+        for item in itens
+    ]
+
+
+def pasta_do_alvo(alvo):
+    """
+    Nome de pasta estável para o alvo: o campo 'pasta', se houver, ou curso e termo
+    (ex.: 'engenharia-de-materiais-2026-1').
+    """
+    return slugificar(alvo.pasta or f"{alvo.curso} {alvo.termo}")
+
+
+def verificar_pastas(alvos):
+    """Levanta ValueError se dois alvos fossem escritos na mesma pasta (um sobrescreveria o outro)."""
+    vistos = {}
+    for alvo in alvos:
+        pasta = pasta_do_alvo(alvo)
+        outro = vistos.setdefault(pasta, alvo)
+        if outro is not alvo:
+            raise ValueError(f"Os alvos '{outro.planilha}/{outro.aba}' e '{alvo.planilha}/{alvo.aba}' usariam "
+                             f"a mesma pasta '{pasta}'; dê a um deles uma 'pasta' diferente.")
+
+
+def renderizar_alvo(alvo, snapshot, pasta_saida):
+    """
+    Renderiza a página de um alvo a partir do seu snapshot (executa no processo filho).
+    Retorna o caminho do index.html gerado.
+    """
+    # Import tardio: o processo filho só carrega o modelo quando vai renderizar
+    import cache_secoes
+    from modelo import construir_modelo
+
+    # Alvos renderizados em paralelo não compartilham (nem podam) a mesma pasta de cache
+    cache_secoes.definir_escopo(alvo.planilha, alvo.aba, alvo.chave)
+    modelo = construir_modelo(snapshot_para_dataframe(snapshot))
+    caminho = os.path.join(pasta_saida, pasta_do_alvo(alvo), 'index.html')
+    escrever_html(iter_pagina_completa(modelo, alvo.curso, alvo.termo), caminho)
+    return caminho
+
+
+def iter_indice(resultados):
+    """Página índice com um link por alvo renderizado."""
+    yield f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Horários</title>
+<style>{CSS_PAGINA}</style>
+</head>
+<body>
+<main>
+<h1>Horários</h1>
+<ul>
+"""
+    for alvo in sorted(resultados, key=lambda a: (a.curso, a.termo)):
+        yield f'<li><a href="{pasta_do_alvo(alvo)}/index.html">{alvo.curso} - {alvo.termo}</a></li>\n'
+    yield "</ul>\n</main>\n</body>\n</html>\n"
+
+
+def renderizar_lote(alvos, pasta_saida, processos=None):
+    """
+    Baixa e renderiza todos os alvos, escrevendo uma pasta por alvo e um index.html geral.
+    Retorna (renderizados, falhas): dict alvo -> caminho e lista de alvos que falharam.
+    Alvos com a mesma pasta de saída são recusados antes de qualquer download.
+    """
+    verificar_pastas(alvos)
+    renderizados = {}
+    falhas = []
+
+    # Alvos da mesma planilha saem de um único batchGet
+    por_planilha = {}
+    for alvo in alvos:
+        por_planilha.setdefault((alvo.planilha, alvo.chave), []).append(alvo)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(por_planilha))) as downloads, \
+            ProcessPoolExecutor(max_workers=processos) as processos_render:
+        baixando = {
+            downloads.submit(baixar_snapshots, planilha, list(dict.fromkeys(a.aba for a in grupo)), None, chave): grupo
+            for (planilha, chave), grupo in por_planilha.items()
+        }
+
+        # Cada página entra na fila de renderização assim que o seu download termina
+        renderizando = {}
+        for futuro in as_completed(baixando):
+            grupo = baixando[futuro]
+            try:
+                snapshots = futuro.result()
+            except (Exception, SystemExit) as e:
+                print(f"ERRO ao baixar {grupo[0].planilha}: {e}", file=sys.stderr)
+                falhas.extend(grupo)
+                continue
+            for alvo in grupo:
+                renderizando[processos_render.submit(renderizar_alvo, alvo, snapshots[alvo.aba], pasta_saida)] = alvo
+
+        for futuro in as_completed(renderizando):
+            alvo = renderizando[futuro]
+            try:
+                renderizados[alvo] = futuro.result()
+            except Exception as e:
+                print(f"ERRO ao renderizar {alvo.curso} {alvo.termo}: {e}", file=sys.stderr)
+                falhas.append(alvo)
+
+    escrever_html(iter_indice(renderizados), os.path.join(pasta_saida, 'index.html'))
+    return renderizados, falhas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza as páginas de horários de vários cursos/termos.")
+    parser.add_argument('alvos', help="arquivo YAML com a lista de alvos (veja alvos.yml)")
+    parser.add_argument('--saida', default='_site', help="pasta de saída (padrão: _site)")
+    parser.add_argument('--processos', type=int, default=None,
+                        help="número de processos de renderização (padrão: núcleos da máquina)")
+    args = parser.parse_args(argv)
+
+    alvos = carregar_alvos(args.alvos)
+    try:
+        verificar_pastas(alvos)
+    except ValueError as e:
+        parser.error(str(e))
+
+    inicio = time.perf_counter()
+    renderizados, falhas = renderizar_lote(alvos, args.saida, args.processos)
+    for alvo, caminho in renderizados.items():
+        print(f"{alvo.curso} {alvo.termo}: {caminho}")
+    print(f"{len(renderizados)} página(s) em {time.perf_counter() - inicio:.1f}s")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Matrículas: grade horária de cada aluno e choques de horário entre as suas disciplinas.
+
+A coluna 'alunos' é lida uma vez na construção do modelo e vira o índice invertido
+modelo.por_aluno (matrícula -> ofertas). Cada oferta ganha uma máscara de bits com os
+slots (dia, turno, aula) em que tem aula; a ocupação de um aluno é o OR das máscaras das
+suas ofertas, e um choque é qualquer bit que apareça em duas delas. Só os alunos com
+choque são detalhados slot a slot.
+
+O relatório tem matrículas, então é gerado à parte e não entra na página publicada:
+
+    python matriculas.py   # grava relatorio_alunos.html
+"""
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+from modelo import construir_modelo, obter_modelo
+from renderizacao import CSS_TABELAS, escrever_html, iter_grade, iter_tabela, montar_grade
+
+# Um bit por (dia, turno, aula) da semana, na ordem da grade
+SLOTS = [
+    (dia, turno, aula)
+    for dia in DIAS_DA_SEMANA
+    for turno, lista in HORARIOS_TURNO.items()
+    for aula in range(len(lista))
+]
+BIT_DO_SLOT = {slot: 1 << posicao for posicao, slot in enumerate(SLOTS)}
+
+COLUNAS_DISCIPLINAS_ALUNO = ['Código', 'Disciplina', 'Professor', 'Créditos']
+COLUNAS_CONFLITOS_ALUNOS = ['Matrícula', 'Dia', 'Horário', 'Disciplinas']
+
+
+class ConflitoAluno:
+    """Um aluno inscrito em duas ou mais ofertas com aula no mesmo slot."""
+    __slots__ = ('aluno', 'slot', 'ofertas')
+
+    def __init__(self, aluno, slot, ofertas):
+        self.aluno = aluno
+        self.slot = slot
+        self.ofertas = ofertas
+
+    @property
+    def dia(self):
+        return DIAS_DA_SEMANA[self.slot[0]]
+
+    @property
+    def horario(self):
+        _, turno, aula = self.slot
+        return HORARIOS_TURNO[turno][aula]
+
+    def __repr__(self):
+        return f"ConflitoAluno({self.aluno!r}, {self.dia} {self.horario})"
+
+
+def mascara_oferta(oferta):
+    """Máscara de bits dos slots em que a oferta tem aula."""
+    mascara = 0
+    for sessao in oferta.sessoes:
+        mascara |= BIT_DO_SLOT.get(sessao.slot, 0)
+    return mascara
+
+
+def mascaras_das_ofertas(modelo):
+    """Máscara de cada oferta do modelo, indexada por oferta.id."""
+    return [mascara_oferta(oferta) for oferta in modelo.ofertas]
+
+
+def celulas_das_ofertas(modelo):
+    """
+    Itens de grade de cada oferta, indexados por oferta.id, montados uma vez e
+    reaproveitados nas grades de todos os alunos inscritos:
+    (hora, dia, texto_celula, bit, turno) por sessão.
+    """
+    celulas = []
+    for oferta in modelo.ofertas:
+        itens = []
+        for sessao in oferta.sessoes:
+            sala = sessao.sala if sessao.sala is not None else 'Sala Indef.'
+            texto_celula = f"<b>{oferta.codigo}</b><br>{oferta.nome_exibicao}<br><span class='sala'>{sala}</span>"
+            itens.append((sessao.horario, sessao.dia, texto_celula, BIT_DO_SLOT.get(sessao.slot, 0), sessao.turno))
+        celulas.append(itens)
+    return celulas
+
+
+def slots_da_mascara(mascara):
+    """Slots (dia, turno, aula) dos bits ligados, na ordem da grade."""
+    while mascara:
+        bit = mascara & -mascara
+        yield SLOTS[bit.bit_length() - 1]
+        mascara ^= bit
+
+
+def ocupacao_do_aluno(ofertas, mascaras):
+    """
+    Retorna (ocupado, repetido): máscaras dos slots com pelo menos uma aula
+    e dos slots com aula de mais de uma oferta.
+    """
+    ocupado = 0
+    repetido = 0
+    for oferta in ofertas:
+        mascara = mascaras[oferta.id]
+        repetido |= ocupado & mascara
+        ocupado |= mascara
+    return ocupado, repetido
+
+
+def detectar_conflitos_alunos(modelo, mascaras=None):
+    """
+    Choques de horário de todos os alunos, ordenados por matrícula e slot.
+    O custo é uma operação de bits por inscrição; a lista de ofertas de um slot
+    só é montada para os alunos que têm choque.
+    """
+    if mascaras is None:
+        mascaras = mascaras_das_ofertas(modelo)
+
+    conflitos = []
+    for aluno in modelo.alunos():
+        ofertas = modelo.por_aluno[aluno]
+        _, repetido = ocupacao_do_aluno(ofertas, mascaras)
+        for slot in slots_da_mascara(repetido):
+            bit = BIT_DO_SLOT[slot]
+            conflitos.append(ConflitoAluno(aluno, slot, [o for o in ofertas if mascaras[o.id] & bit]))
+    return conflitos
+
+
+def dados_do_aluno(modelo, aluno, mascaras=None, celulas=None):
+    """
+    Monta a visão de um aluno a partir do modelo (como dados_do_professor).
+    mascaras / celulas: resultados de mascaras_das_ofertas / celulas_das_ofertas,
+    para não recalculá-los a cada aluno.
+    Retorna (disciplinas, horarios, turnos): linhas da tabela de disciplinas,
+    itens [hora, dia, texto_celula, conflito] da grade e o conjunto de turnos usados.
+    """
+    if mascaras is None:
+        mascaras = mascaras_das_ofertas(modelo)
+    if celulas is None:
+        celulas = celulas_das_ofertas(modelo)
+
+    ofertas = modelo.por_aluno.get(aluno, [])
+    _, repetido = ocupacao_do_aluno(ofertas, mascaras)
+
+    disciplinas = []
+    horarios = []
+    turnos = set()
+    for oferta in ofertas:
+        disciplinas.append((oferta.codigo, oferta.nome_exibicao, oferta.professor, oferta.creditos))
+        for hora, dia, texto_celula, bit, turno in celulas[oferta.id]:
+            horarios.append([hora, dia, texto_celula, bool(repetido & bit)])
+            turnos.add(turno)
+
+    return disciplinas, horarios, turnos
+
+
+def linhas_tabela_conflitos_alunos(conflitos):
+    """Linhas (Matrícula, Dia, Horário, Disciplinas) para a tabela de choques."""
+    for conflito in conflitos:
+        disciplinas = '<br>'.join(f"{o.codigo} {o.turma}".strip() for o in conflito.ofertas)
+        yield (conflito.aluno, conflito.dia, conflito.horario, disciplinas)
+
+
+def iter_secao_aluno(aluno, disciplinas, horarios, turnos):
+    """Gera a seção de um aluno: disciplinas inscritas e grade horária."""
+    yield f"<h2 id='aluno-{aluno}'>{aluno}</h2>"
+    total_creditos = sum(creditos for *_, creditos in disciplinas)
+    linhas = [*disciplinas, ('', '<b>TOTAL DE CRÉDITOS</b>', '', f'<b>{total_creditos}</b>')]
+    yield from iter_tabela(COLUNAS_DISCIPLINAS_ALUNO, linhas, 'carga')
+    if horarios:
+        yield from iter_grade(montar_grade(horarios, turnos), 'grade-professor', '<br>')
+    else:
+        yield "<p><i>Sem horários alocados.</i></p>"
+
+
+def iter_html_alunos(df_planilha=None, modelo=None):
+    """
+    Gera, pedaço a pedaço, o relatório de alunos: tabela de choques de horário
+    seguida da grade de cada aluno (choques destacados).
+    """
+    if modelo is None:
+        modelo = construir_modelo(df_planilha) if df_planilha is not None else obter_modelo()
+
+    mascaras = mascaras_das_ofertas(modelo)
+    celulas = celulas_das_ofertas(modelo)
+    conflitos = detectar_conflitos_alunos(modelo, mascaras)
+
+    yield f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="UTF-8">
+<title>Horários por Aluno</title>
+<style>
+    body {{ font-family: Arial, sans-serif; margin: 40px; }}{CSS_TABELAS}</style>
+</head>
+<body>
+"""
+    yield "<h1>Choques de Horário de Alunos</h1>"
+    if conflitos:
+        yield from iter_tabela(COLUNAS_CONFLITOS_ALUNOS, linhas_tabela_conflitos_alunos(conflitos), 'detalhes')
+    else:
+        yield "<p><i>Nenhum choque de horário encontrado.</i></p>"
+
+    yield "<h1>Grade por Aluno</h1>"
+    for aluno in modelo.alunos():
+        yield from iter_secao_aluno(aluno, *dados_do_aluno(modelo, aluno, mascaras, celulas))
+
+    yield "</body></html>"
+
+
+if __name__ == "__main__":
+    nome_arquivo = "relatorio_alunos.html"
+    escrever_html(iter_html_alunos(), nome_arquivo)
+
+    print(f"Sucesso! Arquivo '{nome_arquivo}' gerado.")
@@ -0,0 +1,241 @@
+import re
+
+from instrumentacao import etapa, medido
+from planilha import obter_snapshot, snapshot_para_dataframe
+
+# Chaves especiais de grupo (os semestres ímpares usam o próprio número)
+GRUPO_REOFERTAS = 'reofertas'
+GRUPO_OPTATIVAS = 'optativas'
+SEMESTRE_OPTATIVAS = 88
+
+# Separadores de nomes numa oferta compartilhada ('Fulano / Beltrano'). ' e ' não separa:
+# é parte de nomes próprios ('Ana Paula Gomes e Silva')
+_SEPARADOR_PROFESSORES = re.compile(r'\s*[/;&+]\s*')
+
+
+class Oferta:
+    """
+    Uma linha da planilha: disciplina + turma oferecida por um professor (ou mais, numa
+    oferta compartilhada). professor é a célula original; professores, os nomes separados.
+    """
+    __slots__ = ('id', 'linha', 'codigo', 'disciplina', 'turma', 'professor', 'professores', 'semestre',
+                 'grupo', 'creditos', 'alunos', 'campus', 'sala_base', 'sessoes')
+
+    def __init__(self, id, linha, codigo, disciplina, turma, professor, semestre,
+                 grupo, creditos, alunos, campus, sala_base):
+        self.id = id
+        self.linha = linha
+        self.codigo = codigo
+        self.disciplina = disciplina
+        self.turma = turma
+        self.professor = professor
+        self.professores = separar_professores(professor)
+        self.semestre = semestre
+        self.grupo = grupo
+        self.creditos = creditos
+        self.alunos = alunos
+        self.campus = campus
+        self.sala_base = sala_base
+        self.sessoes = []
+
+    @property
+    def nome_exibicao(self):
+        return f"{self.disciplina} {self.turma}" if self.turma else self.disciplina
+
+    @property
+    def num_alunos(self):
+        return len(self.alunos)
+
+    @property
+    def cota_creditos(self):
+        """Créditos de cada professor: numa oferta compartilhada, divididos igualmente."""
+        return self.creditos / len(self.professores) if len(self.professores) > 1 else self.creditos
+
+    def __repr__(self):
+        return f"Oferta({self.codigo!r}, turma={self.turma!r}, professor={self.professor!r})"
+
+
+class Sessao:
+    """Uma aula semanal de uma oferta (dia, turno, aula e sala)."""
+    __slots__ = ('oferta', 'indice', 'dia_cod', 'turno', 'aula', 'dia', 'horario', 'sala')
+
+    def __init__(self, oferta, indice, dia_cod, turno, aula, dia, horario, sala):
+        self.oferta = oferta
+        self.indice = indice
+        self.dia_cod = dia_cod
+        self.turno = turno
+        self.aula = aula
+        self.dia = dia
+        self.horario = horario
+        self.sala = sala
+
+    @property
+    def slot(self):
+        """Chave (dia_cod, turno, aula) usada pelo índice por dia/horário."""
+        return (self.dia_cod, self.turno, self.aula)
+
+    def __repr__(self):
+        return f"Sessao({self.oferta.codigo!r}, {self.dia} {self.horario}, sala={self.sala!r})"
+
+
+class ModeloHorarios:
+    """
+    Modelo normalizado de um snapshot da planilha, com índices prontos.
+    Cada visão (semestre, professor, sala, campus) é só uma consulta aos índices.
+    """
+    __slots__ = ('ofertas', 'sessoes', 'validacao', 'por_grupo', 'por_professor',
+                 'por_sala', 'por_dia_horario', 'por_campus', 'por_aluno')
+
+    def __init__(self, ofertas, sessoes, validacao):
+        self.ofertas = ofertas
+        self.sessoes = sessoes
+        # Relatório da ingestão: células rejeitadas pelo esquema (veja ingestao.py)
+        self.validacao = validacao
+        self.por_grupo = {}
+        self.por_professor = {}
+        self.por_sala = {}
+        self.por_dia_horario = {}
+        self.por_campus = {}
+        # Índice invertido das matrículas: aluno -> ofertas em que está inscrito
+        self.por_aluno = {}
+
+        for oferta in ofertas:
+            if oferta.grupo is not None:
+                self.por_grupo.setdefault(oferta.grupo, []).append(oferta)
+            # Oferta compartilhada entra na lista de cada um dos professores
+            for professor in oferta.professores:
+                self.por_professor.setdefault(professor, []).append(oferta)
+            self.por_campus.setdefault(oferta.campus, []).append(oferta)
+            # dict.fromkeys: matrícula repetida na mesma célula conta uma vez
+            for aluno in dict.fromkeys(oferta.alunos):
+                self.por_aluno.setdefault(aluno, []).append(oferta)
+
+        for sessao in sessoes:
+            if sessao.sala:
+                self.por_sala.setdefault(sessao.sala, []).append(sessao)
+            self.por_dia_horario.setdefault(sessao.slot, []).append(sessao)
+
+    def semestres_impares(self):
+        return sorted(g for g in self.por_grupo if not isinstance(g, str))
+
+    def professores(self):
+        """Professores com nome preenchido, em ordem alfabética."""
+        return sorted(self.por_professor)
+
+    def alunos(self):
+        """Matrículas com alguma inscrição, em ordem."""
+        return sorted(self.por_aluno)
+
+    def sessoes_de(self, ofertas):
+        """Sessões das ofertas, na ordem da planilha (linha e coluna)."""
+        return [sessao for oferta in ofertas for sessao in oferta.sessoes]
+
+
+def safe_int(val):
+    try:
+        return int(val)
+    except (ValueError, TypeError):
+        return None
+
+
+def classificar_grupo(semestre):
+    """Grupo de exibição de um semestre: ímpar (número), reofertas, optativas ou None."""
+    if semestre is None:
+        return None
+    if semestre == SEMESTRE_OPTATIVAS:
+        return GRUPO_OPTATIVAS
+    if semestre < 10:
+        return semestre if semestre % 2 != 0 else GRUPO_REOFERTAS
+    return None
+
+
+def separar_alunos(valor):
+    """Lista de matrículas do campo 'alunos' (separadas por vírgula)."""
+    if not valor or not str(valor).strip():
+        return ()
+    return tuple(m.strip() for m in str(valor).split(',') if m.strip())
+
+
+def separar_professores(valor):
+    """
+    Nomes de uma célula 'professor'. Ofertas compartilhadas trazem vários nomes
+    separados por '/', ';', '&' ou '+' ('Fulano / Beltrano').
+    """
+    if not valor or not str(valor).strip():
+        return ()
+    return tuple(dict.fromkeys(n.strip() for n in _SEPARADOR_PROFESSORES.split(str(valor)) if n.strip()))
+
+
+def _coluna(df, nome):
+    """Valores da coluna tipada como lista Python (nulos como None)."""
+    return df[nome].to_numpy(dtype=object, na_value=None).tolist()
+
+
+@medido('modelo.construir', linhas=len)
+def construir_modelo(df_planilha):
+    """
+    Constrói o modelo a partir do DataFrame bruto da planilha (uma passada por linha).
+    O esquema de tipos é aplicado antes, uma única vez (veja ingestao.py).
+    """
+    # Import tardio: numpy/pandas só carregam quando há um modelo a construir
+    from decodificador import decodificar_horarios
+    from ingestao import ingerir
+
+    df_planilha, validacao = ingerir(df_planilha)
+
+    # Todas as colunas do esquema existem depois da ingestão ('sala 1' pode faltar)
+    colunas = ['codigo', 'disciplina', 'turma', 'professor', 'semestre', 'creditos',
+               'alunos', 'campus']
+    salas_base = _coluna(df_planilha, 'sala 1') if 'sala 1' in df_planilha.columns else [''] * len(df_planilha)
+    valores = zip(df_planilha.index, *(_coluna(df_planilha, c) for c in colunas), salas_base)
+
+    ofertas = []
+    oferta_da_linha = {}
+    for id, (linha, codigo, disciplina, turma, professor, semestre, creditos,
+             alunos, campus, sala_base) in enumerate(valores):
+        oferta = Oferta(
+            id=id,
+            linha=linha,
+            codigo=codigo,
+            disciplina=disciplina,
+            turma=turma,
+            professor=professor,
+            semestre=semestre,
+            grupo=classificar_grupo(semestre),
+            creditos=creditos or 0,
+            alunos=separar_alunos(alunos),
+            campus=campus,
+            sala_base=sala_base,
+        )
+        ofertas.append(oferta)
+        oferta_da_linha[linha] = oferta
+
+    # Códigos inválidos já viraram nulos na ingestão e estão no relatório de validação
+    df_sessoes, _ = decodificar_horarios(df_planilha)
+    sessoes = []
+    for linha, indice, dia_cod, turno, aula, dia, horario, sala in zip(
+        df_sessoes['linha'], df_sessoes['indice'].tolist(), df_sessoes['dia_cod'].astype(str),
+        df_sessoes['turno'].astype(str), df_sessoes['aula'].tolist(), df_sessoes['dia'].astype(str),
+        df_sessoes['horario'], df_sessoes['sala'],
+    ):
+        oferta = oferta_da_linha[linha]
+        sessao = Sessao(oferta, indice, dia_cod, turno, aula, dia, horario,
+                        sala if isinstance(sala, str) else None)
+        oferta.sessoes.append(sessao)
+        sessoes.append(sessao)
+
+    with etapa('modelo.indexar', linhas=len(sessoes)):
+        return ModeloHorarios(ofertas, sessoes, validacao)
+
+
+# Modelo já construído para o snapshot compartilhado (snapshot, modelo)
+_modelo_snapshot = None
+
+
+def obter_modelo():
+    """Modelo do snapshot compartilhado, construído uma única vez por snapshot."""
+    global _modelo_snapshot
+    snapshot = obter_snapshot()
+    if _modelo_snapshot is None or _modelo_snapshot[0] is not snapshot:
+        _modelo_snapshot = (snapshot, construir_modelo(snapshot_para_dataframe(snapshot)))
+    return _modelo_snapshot[1]
@@ -0,0 +1,106 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Cabeçalho e identidade visual da página publicada (os mesmos do .qmd)
+LOGOS = [
+    ('https://jcconcursos.com.br/media/_versions/orgao/concurso-ufpel-72815_sm.jpg', 'Logotipo da UFPel'),
+    ('https://wp.ufpel.edu.br/engmateriais/files/2025/02/engmat.png', 'Logotipo do Curso de Engenharia de Materiais'),
+]
+CURSO = "Engenharia de Materiais"
+TERMO = "2026/1"
+CONTATO = "secretariamateriaisufpel@gmail.com"
+
+CSS_PAGINA = """
+    body { font-family: -apple-system, "Segoe UI", Roboto, Arial, sans-serif; color: #373a3c; margin: 0; }
+    main { max-width: 1400px; margin: 0 auto; padding: 1.5em 2em 3em; }
+    header.cabecalho .logos { display: flex; align-items: center; gap: 2em; margin-bottom: 1em; }
+    header.cabecalho .logos img { height: 80px; }
+    header.cabecalho h1.titulo { margin-bottom: 0.2em; }
+    header.cabecalho p.subtitulo { color: #6c757d; font-size: 1.25em; margin-top: 0; }
+    p.atualizacao { color: #6c757d; font-size: 0.9em; }
+    h1.secao { text-align: center; }
+"""
+
+
+def texto_atualizacao(agora=None):
+    """Linha 'Última atualização: ...' no fuso de Brasília (como em atualizacao.py)."""
+    dias_semana = ['Segunda-feira', 'Terça-feira', 'Quarta-feira', 'Quinta-feira',
+                   'Sexta-feira', 'Sábado', 'Domingo']
+    agora = agora or datetime.now(ZoneInfo('America/Sao_Paulo'))
+    return f"Última atualização: {agora.strftime('%d/%m/%Y %H:%M:%S')} ({dias_semana[agora.weekday()]})"
+
+
+def iter_cabecalho(curso=CURSO, termo=TERMO):
+    """Gera o cabeçalho institucional (logos, título e contato)."""
+    logos = ''.join(f'<img src="{src}" alt="{alt}">' for src, alt in LOGOS)
+    yield f"""
+<header class="cabecalho">
+  <div class="logos">{logos}</div>
+  <h1 class="titulo">Horários do Curso de {curso}</h1>
+  <p class="subtitulo">Semestre {termo}</p>
+  <p><strong>Universidade Federal de Pelotas (UFPel)</strong><br>
+  <strong>Centro de Desenvolvimento Tecnológico (CDTec)</strong><br>
+  <strong>Curso de {curso}</strong></p>
+  <p>Este é o planejamento consolidado das disciplinas e horários para o semestre {termo} do curso de {curso} da UFPel.</p>
+  <p>Abaixo estão as listas e tabelas geradas para facilitar a visualização das informações.</p>
+  <hr>
+  <p><strong>Organização:</strong> Coordenação do Curso de {curso}<br>
+  <strong>Contato:</strong> <a href="mailto:{CONTATO}">{CONTATO}</a></p>
+  <hr>
+  <p class="atualizacao">{texto_atualizacao()}</p>
+</header>
+"""
+
+
+def iter_pagina(partes, curso=CURSO, termo=TERMO, titulo=None, voltar=None):
+    """
+    Envolve os pedaços do corpo num documento HTML completo com o cabeçalho da página.
+    partes: iterável de pedaços de HTML (por exemplo, iter_html_todas_tabelas()).
+    voltar: se informado, troca o cabeçalho institucional por um link curto para esta URL
+    (usado nas páginas pequenas da saída dividida).
+    """
+    titulo = titulo or f"Horários do Curso de {curso} - {termo}"
+    yield f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{titulo}</title>
+<style>{CSS_PAGINA}</style>
+</head>
+<body>
+<main>
+"""
+    if voltar:
+        yield f'<nav><a href="{voltar}">&larr; Horários do Curso de {curso} - {termo}</a></nav>\n'
+    else:
+        yield from iter_cabecalho(curso, termo)
+    yield from partes
+    yield "\n</main>\n</body>\n</html>\n"
+
+
+def iter_secoes(modelo, alteracoes=None):
+    """
+    Corpo da página: horários por turma, carga docente e horários por professor,
+    a partir do mesmo modelo.
+    alteracoes: se informadas (veja diferencas.comparar), abrem a página num registro de alterações.
+    """
+    # Import tardio: os geradores só são necessários quando há algo a renderizar
+    import processar_horarios
+    import horarios_professores
+    from carga_docente import iter_secao_carga
+
+    if alteracoes:
+        from diferencas import iter_secao_alteracoes
+        yield from iter_secao_alteracoes(alteracoes)
+    yield "<h1 class='secao'>Horários por Turma</h1>"
+    yield from processar_horarios.iter_html_todas_tabelas(modelo=modelo)
+    yield "<h1 class='secao'>Carga Docente</h1>"
+    yield from iter_secao_carga(modelo)
+    yield "<h1 class='secao'>Horários por Professor</h1>"
+    yield from horarios_professores.iter_html_professores(modelo=modelo, documento=False)
+
+
+def iter_pagina_completa(modelo, curso=CURSO, termo=TERMO, alteracoes=None):
+    """Página publicada completa (cabeçalho + seções) para um modelo."""
+    yield from iter_pagina(iter_secoes(modelo, alteracoes), curso, termo)
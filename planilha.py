@@ -0,0 +1,267 @@
+# pandas e google-auth são importados só quando usados:
+# importar este módulo (para as constantes, por exemplo) não carrega nada pesado.
+import os
+import pickle
+import sys
+import threading
+import time
+
+from instrumentacao import etapa, medido
+
+# --- CONFIGURAÇÕES GLOBAIS ---
+CREDS_FILE = 'gcreds.json'
+PLANILHA_NOME = "planilha-2026-1"
+ABA_NOME = "Planilha1"
+# Chave (ID) da planilha; se vazia, é descoberta pelo nome uma vez e guardada no cache
+PLANILHA_CHAVE = os.environ.get('HORARIOS_PLANILHA_CHAVE', '')
+
+DIAS_DA_SEMANA = {
+    '2': 'segunda-feira',
+    '3': 'terça-feira',
+    '4': 'quarta-feira',
+    '5': 'quinta-feira',
+    '6': 'sexta-feira'
+}
+
+HORARIOS_TURNO = {
+    '1': ['08:00-08:50', '08:50-09:40', '10:00-10:50', '10:50-11:40', '11:40-12:30'],
+    '2': ['13:30-14:20', '14:20-15:10', '15:10-16:00', '16:00-16:50', '17:10-18:00', '18:00-18:50'],
+    '3': ['19:00-19:50', '19:50-20:40', '20:40-21:30', '21:30-22:20', '22:20-23:10']
+}
+
+VALORES_NULOS = ('nan', 'None', 'NAN', 'NONE')
+
+# Cache local dos snapshots (restaurado entre execuções pelo workflow)
+CACHE_DIR = os.path.join('.cache', 'planilha')
+# Versões anteriores de cada aba (uma por conteúdo baixado), para o registro de alterações
+VERSOES_DIR = os.path.join(CACHE_DIR, 'versoes')
+VERSOES_GUARDADAS = 30
+TIMEOUT_API = 30 # segundos por requisição ao Google
+
+# Snapshots já baixados nesta execução, por (planilha, aba)
+_snapshots = {}
+
+# Cliente da API compartilhado (uma sessão HTTP por processo)
+_cliente = None
+_trava_cliente = threading.Lock()
+
+
+def _limpar_linha(linha):
+    """Converte a linha em tupla trocando os nulos literais por string vazia."""
+    return tuple('' if valor in VALORES_NULOS else valor for valor in linha)
+
+
+def autenticar():
+    """
+    Autentica com a Service Account e retorna o cliente da API (veja cliente_sheets.py),
+    com uma única sessão HTTP autorizada para todas as requisições.
+    """
+    from google.auth.transport.requests import AuthorizedSession
+    from google.oauth2.service_account import Credentials
+
+    from cliente_sheets import ESCOPOS, ClienteSheets
+
+    # Autenticação via arquivo JSON (padrão para GitHub Actions)
+    creds = Credentials.from_service_account_file(CREDS_FILE, scopes=ESCOPOS)
+    return ClienteSheets(AuthorizedSession(creds), timeout=TIMEOUT_API)
+
+
+def obter_cliente():
+    """Cliente compartilhado por todos os downloads do processo (criado na primeira chamada)."""
+    global _cliente
+    with _trava_cliente:
+        if _cliente is None:
+            _cliente = autenticar()
+        return _cliente
+
+
+def _caminho_cache(planilha_nome, aba_nome):
+    nome = f"{planilha_nome}__{aba_nome}".replace(os.sep, '_')
+    return os.path.join(CACHE_DIR, f"{nome}.pkl")
+
+
+def ler_cache(planilha_nome, aba_nome):
+    """Retorna o conteúdo do cache ({'revisao', 'chave', 'cabecalho', 'linhas'}) ou None."""
+    try:
+        with open(_caminho_cache(planilha_nome, aba_nome), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def gravar_cache(planilha_nome, aba_nome, revisao, snapshot, chave=None):
+    """Grava o snapshot (e a chave da planilha) em disco de forma atômica (arquivo temporário + rename)."""
+    caminho = _caminho_cache(planilha_nome, aba_nome)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    cabecalho, linhas = snapshot
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        pickle.dump({'revisao': revisao, 'chave': chave, 'cabecalho': cabecalho, 'linhas': linhas},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, caminho)
+
+
+def _pasta_versoes(planilha_nome, aba_nome):
+    return os.path.join(VERSOES_DIR, f"{planilha_nome}__{aba_nome}".replace(os.sep, '_'))
+
+
+def gravar_versao(planilha_nome, aba_nome, revisao, snapshot):
+    """
+    Guarda o snapshot baixado como uma nova versão da aba, a menos que o conteúdo seja
+    igual ao da última versão (veja diferencas.impressao_snapshot). Mantém só as
+    VERSOES_GUARDADAS mais recentes.
+    """
+    from diferencas import impressao_snapshot
+
+    impressao = impressao_snapshot(snapshot)
+    pasta = _pasta_versoes(planilha_nome, aba_nome)
+    existentes = listar_versoes(planilha_nome, aba_nome)
+    if existentes and existentes[-1].endswith(f"-{impressao}.pkl"):
+        return existentes[-1]
+
+    os.makedirs(pasta, exist_ok=True)
+    # Nome ordenável pelo momento do download (ns evitam colisão no mesmo segundo)
+    caminho = os.path.join(pasta, f"{time.time_ns():020d}-{impressao}.pkl")
+    cabecalho, linhas = snapshot
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        pickle.dump({'revisao': revisao, 'cabecalho': cabecalho, 'linhas': linhas}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, caminho)
+
+    for antigo in (existentes + [caminho])[:-VERSOES_GUARDADAS]:
+        try:
+            os.remove(antigo)
+        except OSError:
+            pass
+    return caminho
+
+
+def listar_versoes(planilha_nome=None, aba_nome=None):
+    """Caminhos das versões guardadas da aba, da mais antiga para a mais recente."""
+    pasta = _pasta_versoes(planilha_nome or PLANILHA_NOME, aba_nome or ABA_NOME)
+    try:
+        nomes = sorted(nome for nome in os.listdir(pasta) if nome.endswith('.pkl'))
+    except OSError:
+        return []
+    return [os.path.join(pasta, nome) for nome in nomes]
+
+
+def ler_versao(caminho):
+    """Snapshot (cabecalho, linhas) de uma versão guardada."""
+    with open(caminho, 'rb') as f:
+        dados = pickle.load(f)
+    return dados['cabecalho'], dados['linhas']
+
+
+def versao_anterior(snapshot, planilha_nome=None, aba_nome=None):
+    """
+    A versão guardada mais recente com conteúdo diferente do snapshot, ou None.
+    É a base do registro de alterações da página (veja diferencas.py).
+    """
+    from diferencas import impressao_snapshot
+
+    impressao = impressao_snapshot(snapshot)
+    for caminho in reversed(listar_versoes(planilha_nome, aba_nome)):
+        if not caminho.endswith(f"-{impressao}.pkl"):
+            try:
+                return ler_versao(caminho)
+            except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+                continue
+    return None
+
+
+@medido('planilha.baixar')
+def baixar_snapshots(planilha_nome=None, abas=None, client=None, chave=None):
+    """
+    Baixa várias abas da mesma planilha numa única chamada, exceto as que o cache local
+    já tem na revisão atual. Retorna {aba: (cabecalho, linhas)}, com valores como string.
+    client: cliente da API (opcional, permite apontar para um servidor local).
+    chave: chave da planilha; sem ela, usa a do cache ou procura a planilha pelo nome.
+    Se a API falhar, usa os últimos snapshots em cache; sem cache, encerra com erro.
+    """
+    planilha_nome = planilha_nome or PLANILHA_NOME
+    abas = list(abas or [ABA_NOME])
+    caches = {aba: ler_cache(planilha_nome, aba) for aba in abas}
+    if not chave and planilha_nome == PLANILHA_NOME:
+        chave = PLANILHA_CHAVE
+
+    try:
+        if client is None:
+            client = obter_cliente()
+
+        # A busca por nome no Drive só acontece quando a chave ainda não é conhecida
+        chave = chave or next((c['chave'] for c in caches.values() if c and c.get('chave')), None)
+        chave = chave or client.procurar_chave(planilha_nome)
+        revisao = client.revisao(chave)
+
+        snapshots = {}
+        desatualizadas = []
+        for aba, cache in caches.items():
+            # Aba não mudou desde o último download: fica fora do batchGet
+            if cache is not None and cache['revisao'] == revisao:
+                snapshots[aba] = (cache['cabecalho'], cache['linhas'])
+            else:
+                desatualizadas.append(aba)
+
+        baixadas = {}
+        if desatualizadas:
+            for aba, dados_brutos in client.obter_abas(chave, desatualizadas).items():
+                if not dados_brutos or len(dados_brutos) < 2:
+                    raise ValueError(f"Aba '{aba}' vazia ou sem dados.")
+                baixadas[aba] = (tuple(dados_brutos[0]), tuple(_limpar_linha(linha) for linha in dados_brutos[1:]))
+
+    except Exception as e:
+        if all(cache is not None for cache in caches.values()):
+            print(f"AVISO: falha ao acessar Google Sheets ({e}); usando snapshot em cache "
+                  f"(revisão {', '.join(sorted({str(c['revisao']) for c in caches.values()}))}).", file=sys.stderr)
+            return {aba: (cache['cabecalho'], cache['linhas']) for aba, cache in caches.items()}
+        print(f"ERRO CRÍTICO ao acessar Google Sheets: {e}")
+        sys.exit(1) # Encerra o script com erro para o GitHub Actions pegar
+
+    for aba, snapshot in baixadas.items():
+        try:
+            gravar_cache(planilha_nome, aba, revisao, snapshot, chave)
+            gravar_versao(planilha_nome, aba, revisao, snapshot)
+        except OSError as e:
+            print(f"AVISO: não foi possível gravar o cache da planilha: {e}", file=sys.stderr)
+
+    snapshots.update(baixadas)
+    return snapshots
+
+
+def baixar_snapshot(planilha_nome=None, aba_nome=None, client=None, chave=None):
+    """
+    Baixa uma aba inteira, a menos que o cache local já esteja na mesma revisão.
+    Retorna uma tupla imutável: (cabecalho, linhas). Veja baixar_snapshots.
+    """
+    aba_nome = aba_nome or ABA_NOME
+    return baixar_snapshots(planilha_nome, [aba_nome], client, chave)[aba_nome]
+
+
+def obter_snapshot(planilha_nome=None, aba_nome=None, recarregar=False):
+    """
+    Retorna o snapshot da aba, baixando-o apenas na primeira chamada.
+    Todos os geradores de uma mesma renderização compartilham o mesmo snapshot.
+    """
+    chave = (planilha_nome or PLANILHA_NOME, aba_nome or ABA_NOME)
+    if recarregar or chave not in _snapshots:
+        _snapshots[chave] = baixar_snapshot(*chave)
+    return _snapshots[chave]
+
+
+def snapshot_para_dataframe(snapshot):
+    """Cria um DataFrame novo (só strings) a partir de um snapshot."""
+    import pandas as pd
+
+    cabecalho, linhas = snapshot
+    with etapa('planilha.dataframe', linhas=len(linhas)):
+        return pd.DataFrame(list(linhas), columns=list(cabecalho))
+
+
+def autenticar_e_obter_dados():
+    """
+    Retorna o DataFrame limpo da planilha configurada.
+    Cada chamada devolve uma cópia nova, mas o download só acontece uma vez.
+    """
+    return snapshot_para_dataframe(obter_snapshot())
@@ -1,70 +1,41 @@
-import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-import sys
-
-# --- CONFIGURAÇÕES GLOBAIS ---
-CREDS_FILE = 'gcreds.json'
-PLANILHA_NOME = "planilha-2026-1"
-ABA_NOME = "Planilha1"
-
-DIAS_DA_SEMANA = {
-    '2': 'segunda-feira',
-    '3': 'terça-feira',
-    '4': 'quarta-feira',
-    '5': 'quinta-feira',
-    '6': 'sexta-feira'
-}
-
-HORARIOS_TURNO = {
-    '1': ['08:00-08:50', '08:50-09:40', '10:00-10:50', '10:50-11:40', '11:40-12:30'],
-    '2': ['13:30-14:20', '14:20-15:10', '15:10-16:00', '16:00-16:50', '17:10-18:00', '18:00-18:50'],
-    '3': ['19:00-19:50', '19:50-20:40', '20:40-21:30', '21:30-22:20', '22:20-23:10']
-}
-
-def autenticar_e_obter_dados():
-    """
-    Autentica no Google Sheets usando Service Account e retorna o DataFrame limpo.
+# Configurações e carregamento compartilhados com o outro gerador
+from planilha import (
+    CREDS_FILE,
+    PLANILHA_NOME,
+    ABA_NOME,
+    DIAS_DA_SEMANA,
+    HORARIOS_TURNO,
+    autenticar_e_obter_dados,
+)
+from modelo import (
+    GRUPO_OPTATIVAS,
+    GRUPO_REOFERTAS,
+    construir_modelo,
+    obter_modelo,
+    safe_int,
+)
+from instrumentacao import medido
+from cache_secoes import CacheFragmentos, chave_conteudo
+from conflitos import detectar_conflitos, iter_tabela_conflitos, sessoes_em_conflito
+from renderizacao import (
+    CSS_TABELAS,
+    SEPARADOR_CELULA,
+    iter_grade,
+    iter_tabela,
+    montar_grade,
+)
+
+# Bloco de estilos da seção de turmas (emitido uma vez, antes das seções)
+ESTILO_TURMAS = f"""
+    <style>
+        h1.titulo-semestre {{ color: #2c3e50; border-bottom: 2px solid #2c3e50; padding-bottom: 10px; margin-top: 50px; }}
+        h2.subtitulo {{ color: #7f8c8d; margin-top: 20px; font-size: 1.2em; }}{CSS_TABELAS}    </style>
     """
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive"
-    ]
-    
-    try:
-        creds = Credentials.from_service_account_file(CREDS_FILE, scopes=scopes)
-        client = gspread.authorize(creds)
-        
-        google_sheet = client.open(PLANILHA_NOME)
-        aba = google_sheet.worksheet(ABA_NOME)
-        
-        dados_brutos = aba.get_all_values()
-
-        if not dados_brutos or len(dados_brutos) < 2:
-            raise ValueError("Planilha vazia ou sem dados.")
-
-        cabecalho = dados_brutos[0]
-        dados_linhas = dados_brutos[1:]
-
-        df = pd.DataFrame(dados_linhas, columns=cabecalho)
-        df = df.replace(['nan', 'None', 'NAN', 'NONE'], '')
-        
-        return df
-
-    except Exception as e:
-        print(f"ERRO CRÍTICO ao acessar Google Sheets: {e}")
-        sys.exit(1)
-
-def safe_int(val):
-    try:
-        return int(val)
-    except (ValueError, TypeError):
-        return None
 
-def gerar_tabela_detalhes_html(df_detalhes):
-    """Gera a tabela auxiliar com detalhes das disciplinas (Sala, Professor, etc)."""
+def iter_tabela_detalhes(df_detalhes):
+    """Gera, pedaço a pedaço, a tabela auxiliar com detalhes das disciplinas (Sala, Professor, etc)."""
     if df_detalhes.empty:
-        return ""
+        return
 
     # Seleciona e renomeia colunas para exibição
     colunas_map = {
@@ -86,212 +57,128 @@ def gerar_tabela_detalhes_html(df_detalhes):
     if 'Disciplina' in df_show.columns:
         df_show = df_show.sort_values(by='Disciplina')
 
-    html = '<table border="1" cellpadding="5" cellspacing="0" style="border-collapse: collapse; text-align: left; width: 100%; margin-top: 10px; margin-bottom: 40px; font-size: 0.9em;">'
-    html += '<thead><tr style="background-color: #f2f2f2;">'
-    for col in df_show.columns:
-        html += f'<th style="padding: 8px;">{col}</th>'
-    html += '</tr></thead><tbody>'
-
-    for _, row in df_show.iterrows():
-        html += '<tr>'
-        for item in row:
-            html += f'<td style="padding: 8px;">{item}</td>'
-        html += '</tr>'
+    yield from iter_tabela(df_show.columns, df_show.itertuples(index=False), 'detalhes')
 
-    html += '</tbody></table>'
-    return html
+def gerar_tabela_detalhes_html(df_detalhes):
+    """Gera a tabela auxiliar com detalhes das disciplinas (Sala, Professor, etc)."""
+    return ''.join(iter_tabela_detalhes(df_detalhes))
 
-def gerar_grade_horaria_semestre(lista_horarios, turnos_usados):
+def iter_grade_horaria_semestre(lista_horarios, turnos_usados):
     """
-    Gera a grade visual.
+    Gera a grade visual, pedaço a pedaço.
     lista_horarios: lista de listas [hora, dia, texto_celula]
     turnos_usados: set de turnos ('1', '2', '3') presentes neste semestre
     """
-    horarios_completos = []
-    
-    # Define os horários a exibir baseado nos turnos usados naquelas disciplinas
-    for turno in sorted(turnos_usados):
-        if turno in HORARIOS_TURNO:
-            horarios_completos.extend(HORARIOS_TURNO[turno])
-            horarios_completos.append("---")
+    # Os horários exibidos são os dos turnos usados naquelas disciplinas
+    linhas = montar_grade(lista_horarios, turnos_usados)
 
-    if not horarios_completos:
-        return "<p><i>Nenhum horário registrado.</i></p>"
+    if not linhas:
+        yield "<p><i>Nenhum horário registrado.</i></p>"
+        return
 
-    if horarios_completos[-1] == "---":
-        horarios_completos.pop()
+    yield from iter_grade(linhas, 'grade', SEPARADOR_CELULA, classe_hora='hora', classe_aula='aula')
 
-    df_grade = pd.DataFrame(lista_horarios, columns=['horário', 'dia', 'conteudo'])
-    df_base = pd.DataFrame({'horário': horarios_completos})
+def gerar_grade_horaria_semestre(lista_horarios, turnos_usados):
+    """Gera a grade visual (veja iter_grade_horaria_semestre)."""
+    return ''.join(iter_grade_horaria_semestre(lista_horarios, turnos_usados))
 
-    # Pivota a tabela para formato grade
-    # MODIFICADO AQUI: Removidos os <br> extras, usando apenas <hr> estilizado como separador
-    pivot = df_grade.pivot_table(
-        index='horário', 
-        columns='dia', 
-        values='conteudo', 
-        aggfunc=lambda x: '<hr style="margin: 4px 0; border: 0; border-top: 1px solid #ddd;">'.join(x) 
-    ).fillna('')
+def dados_do_grupo(modelo, chave, em_conflito=frozenset()):
+    """
+    Monta a visão de um grupo (semestre ímpar, reofertas ou optativas) a partir do modelo.
+    em_conflito: sessões a destacar na grade (veja conflitos.sessoes_em_conflito).
+    Retorna {'horarios': [[hora, dia, texto_celula, conflito]], 'detalhes': [dict], 'turnos': set}.
+    """
+    dados = {'horarios': [], 'detalhes': [], 'turnos': set()}
 
-    # Garante dias da semana na ordem correta
-    dias_ordenados = ['segunda-feira', 'terça-feira', 'quarta-feira', 'quinta-feira', 'sexta-feira']
-    for dia in dias_ordenados:
-        if dia not in pivot.columns:
-            pivot[dia] = ''
-    pivot = pivot[dias_ordenados]
+    for oferta in modelo.por_grupo.get(chave, []):
+        sala_base = oferta.sala_base
+        campus = oferta.campus
+        sala_exibicao = f"{sala_base} ({campus})" if campus else sala_base
 
-    # Merge para garantir que todos os horários do turno apareçam (inclusive vazios e intervalos)
-    tabela_final = pd.merge(df_base, pivot, on='horário', how='left').fillna('')
+        dados['detalhes'].append({
+            'codigo': oferta.codigo, 
+            'disciplina': oferta.disciplina, 
+            'turma': oferta.turma, 
+            'professor': oferta.professor,
+            'sala_exibicao': sala_exibicao
+        })
 
-    # HTML
-    html = '<table border="1" cellpadding="5" cellspacing="0" style="border-collapse: collapse; text-align: center; width: 100%; margin-bottom: 10px;">'
-    html += '<thead><tr style="background-color: #e0e0e0;"><th>Horário</th>'
-    for dia in dias_ordenados:
-        html += f'<th>{dia}</th>'
-    html += '</tr></thead><tbody>'
+        texto_celula = f"<b>{oferta.codigo}</b><br><span class='nome'>{oferta.nome_exibicao}</span>"
+        for sessao in oferta.sessoes:
+            dados['horarios'].append([sessao.horario, sessao.dia, texto_celula, sessao in em_conflito])
+            dados['turnos'].add(sessao.turno)
 
-    for _, row in tabela_final.iterrows():
-        if row['horário'] == '---':
-            html += f'<tr><td colspan="6" style="background-color: #cccccc; font-weight: bold; font-size: 0.8em;">Intervalo / Troca de Turno</td></tr>'
-        else:
-            html += '<tr>'
-            html += f'<td style="white-space: nowrap; background-color: #f9f9f9; font-weight: bold;">{row["horário"]}</td>'
-            for dia in dias_ordenados:
-                conteudo = row[dia]
-                style = ""
-                if conteudo:
-                    style = "background-color: #ffffff;" # Célula com aula
-                html += f'<td style="{style}">{conteudo}</td>'
-            html += '</tr>'
-    
-    html += '</tbody></table>'
-    return html
+    return dados
+
+def titulo_do_grupo(chave):
+    if chave == GRUPO_REOFERTAS:
+        return "Reofertas (Semestres Pares)"
+    if chave == GRUPO_OPTATIVAS:
+        return "Optativas"
+    return f"{chave}º Semestre"
 
-def gerar_html_todas_tabelas():
+def secoes_dos_grupos(modelo, em_conflito=frozenset()):
     """
-    Função principal chamada pelo Quarto.
+    Seções na ordem da página: semestres ímpares (ordenados), reofertas e optativas.
+    Retorna [(chave, titulo, dados)], onde cada grupo é uma consulta ao índice do modelo.
     """
-    df_planilha = autenticar_e_obter_dados()
-    
-    # Processa coluna semestre
-    df_planilha['semestre_int'] = df_planilha['semestre'].apply(safe_int)
-
-    # Estruturas para agrupamento
-    grupos = {
-        'impares': {}, 
-        'reofertas': {'horarios': [], 'detalhes': [], 'turnos': set()},
-        'optativas': {'horarios': [], 'detalhes': [], 'turnos': set()}
-    }
-
-    # --- ITERAÇÃO E PROCESSAMENTO ---
-    for _, row in df_planilha.iterrows():
-        semestre = row['semestre_int']
-        if pd.isna(semestre): continue
-
-        codigo = row.get('codigo', '')
-        disciplina = row.get('disciplina', '')
-        turma = str(row.get('turma', '')).strip()
-        sala_base = row.get('sala 1', '') 
-        campus = row.get('campus', '')
-        prof = row.get('professor', '')
-        
-        nome_grade = f"{disciplina} {turma}" if turma else disciplina
-        sala_exibicao = f"{sala_base} ({campus})" if campus else sala_base
-
-        linha_detalhe = {
-            'codigo': codigo, 
-            'disciplina': disciplina, 
-            'turma': turma, 
-            'professor': prof,
-            'sala_exibicao': sala_exibicao
-        }
+    chaves = modelo.semestres_impares() + [GRUPO_REOFERTAS, GRUPO_OPTATIVAS]
+    return [(chave, titulo_do_grupo(chave), dados_do_grupo(modelo, chave, em_conflito)) for chave in chaves]
 
-        # Identifica o grupo
-        grupo_alvo = None
+def iter_secao_grupo(titulo, dados):
+    """Gera a seção de um grupo: título, grade e tabela de detalhes."""
+    # Import tardio: importar o módulo não carrega o pandas
+    import pandas as pd
 
-        if semestre == 88:
-            grupo_alvo = grupos['optativas']
-        elif semestre < 10:
-            if semestre % 2 != 0: # Ímpar
-                if semestre not in grupos['impares']:
-                    grupos['impares'][semestre] = {'horarios': [], 'detalhes': [], 'turnos': set()}
-                grupo_alvo = grupos['impares'][semestre]
-            else: # Par (Reoferta)
-                grupo_alvo = grupos['reofertas']
-        
-        if not grupo_alvo: continue
+    yield f"<h1 class='titulo-semestre'>{titulo}</h1>"
+    yield from iter_grade_horaria_semestre(dados['horarios'], dados['turnos'])
+    
+    if dados['detalhes']:
+        df_det = pd.DataFrame(dados['detalhes'])
+        yield "<h2 class='subtitulo'>Disciplinas, Salas e Professores</h2>"
+        yield from iter_tabela_detalhes(df_det)
 
-        # Adiciona aos detalhes
-        grupo_alvo['detalhes'].append(linha_detalhe)
+@medido('html.turmas')
+def iter_html_todas_tabelas(df_planilha=None, modelo=None):
+    """
+    Gera o HTML de todas as tabelas pedaço a pedaço (veja gerar_html_todas_tabelas).
+    Seções cujo conteúdo não mudou desde a última renderização vêm do cache em disco.
+    """
+    if modelo is None:
+        modelo = construir_modelo(df_planilha) if df_planilha is not None else obter_modelo()
 
-        # Processa Horários (1 a 6) para a Grade
-        for i in range(1, 7):
-            val_horario = row.get(f'horario {i}')
-            if val_horario and str(val_horario).strip():
-                try:
-                    cod_h = str(int(val_horario))
-                    if len(cod_h) < 3: continue
-                    
-                    dia_cod = cod_h[0]
-                    turno_cod = cod_h[1]
-                    aula_cod = int(cod_h[2]) - 1
+    # Conflitos de sala, professor e semestre (destacados nas grades)
+    conflitos = detectar_conflitos(modelo)
+    em_conflito = sessoes_em_conflito(conflitos)
 
-                    if dia_cod in DIAS_DA_SEMANA and turno_cod in HORARIOS_TURNO:
-                        lista_h = HORARIOS_TURNO[turno_cod]
-                        if 0 <= aula_cod < len(lista_h):
-                            hora_real = lista_h[aula_cod]
-                            dia_real = DIAS_DA_SEMANA[dia_cod]
-                            
-                            texto_celula = f"<b>{codigo}</b><br><span style='font-size:0.85em'>{nome_grade}</span>"
-                            
-                            grupo_alvo['horarios'].append([hora_real, dia_real, texto_celula])
-                            grupo_alvo['turnos'].add(turno_cod)
-                except ValueError:
-                    continue
+    secoes = secoes_dos_grupos(modelo, em_conflito)
 
     # --- GERAÇÃO DO HTML FINAL ---
-    html = """
-    <style>
-        h1.titulo-semestre { color: #2c3e50; border-bottom: 2px solid #2c3e50; padding-bottom: 10px; margin-top: 50px; }
-        h2.subtitulo { color: #7f8c8d; margin-top: 20px; font-size: 1.2em; }
-    </style>
-    """
+    yield ESTILO_TURMAS
 
-    # 1. Semestres Ímpares (Ordenados)
-    for sem in sorted(grupos['impares'].keys()):
-        dados = grupos['impares'][sem]
+    cache = CacheFragmentos('turmas')
+    for _, titulo, dados in secoes:
         if not dados['horarios']: continue
 
-        html += f"<h1 class='titulo-semestre'>{sem}º Semestre</h1>"
-        html += gerar_grade_horaria_semestre(dados['horarios'], dados['turnos'])
-        
-        df_det = pd.DataFrame(dados['detalhes'])
-        html += "<h2 class='subtitulo'>Disciplinas, Salas e Professores</h2>"
-        html += gerar_tabela_detalhes_html(df_det)
+        chave = chave_conteudo(titulo, dados['horarios'], dados['detalhes'], sorted(dados['turnos']))
+        yield cache.obter(chave, lambda: iter_secao_grupo(titulo, dados))
 
-    # 2. Reofertas
-    dados_reofertas = grupos['reofertas']
-    if dados_reofertas['horarios']:
-        html += "<h1 class='titulo-semestre'>Reofertas (Semestres Pares)</h1>"
-        html += gerar_grade_horaria_semestre(dados_reofertas['horarios'], dados_reofertas['turnos'])
-        
-        if dados_reofertas['detalhes']:
-            df_det = pd.DataFrame(dados_reofertas['detalhes'])
-            html += "<h2 class='subtitulo'>Disciplinas, Salas e Professores</h2>"
-            html += gerar_tabela_detalhes_html(df_det)
+    # Conflitos
+    if conflitos:
+        yield "<h1 class='titulo-semestre'>Conflitos de Horário</h1>"
+        yield from iter_tabela_conflitos(conflitos)
 
-    # 3. Optativas
-    dados_opt = grupos['optativas']
-    if dados_opt['horarios']:
-        html += "<h1 class='titulo-semestre'>Optativas</h1>"
-        html += gerar_grade_horaria_semestre(dados_opt['horarios'], dados_opt['turnos'])
-        
-        if dados_opt['detalhes']:
-            df_det = pd.DataFrame(dados_opt['detalhes'])
-            html += "<h2 class='subtitulo'>Disciplinas, Salas e Professores</h2>"
-            html += gerar_tabela_detalhes_html(df_det)
+    cache.podar()
 
-    return html
+def gerar_html_todas_tabelas(df_planilha=None, modelo=None):
+    """
+    Função principal chamada pelo Quarto.
+    df_planilha: DataFrame já carregado (opcional).
+    modelo: ModeloHorarios já construído (opcional).
+    Sem nenhum dos dois, usa o modelo do snapshot compartilhado da planilha,
+    baixado e indexado uma única vez por renderização.
+    """
+    return ''.join(iter_html_todas_tabelas(df_planilha, modelo))
 
 if __name__ == "__main__":
     # Teste local
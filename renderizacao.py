@@ -0,0 +1,152 @@
+import os
+import re
+import unicodedata
+
+from instrumentacao import medido
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+
+# Estilos das tabelas, emitidos uma vez por documento em vez de repetidos em cada célula
+CSS_TABELAS = """
+    table.tabela { border-collapse: collapse; width: 100%; }
+    table.grade { text-align: center; margin-bottom: 10px; }
+    table.grade-professor { text-align: center; margin-bottom: 40px; }
+    table.carga { text-align: center; margin-bottom: 20px; }
+    table.detalhes { text-align: left; margin-top: 10px; margin-bottom: 40px; font-size: 0.9em; }
+    table.detalhes th, table.detalhes td { padding: 8px; }
+    tr.cab-grade { background-color: #e0e0e0; }
+    tr.cab-lista { background-color: #f2f2f2; }
+    td.intervalo { background-color: #cccccc; font-weight: bold; font-size: 0.8em; }
+    td.hora { white-space: nowrap; background-color: #f9f9f9; font-weight: bold; }
+    td.aula { background-color: #ffffff; }
+    td.conflito { background-color: #f8d7da; box-shadow: inset 0 0 0 2px #c0392b; }
+    hr.sep { margin: 4px 0; border: 0; border-top: 1px solid #ddd; }
+    span.nome { font-size: 0.85em; }
+    span.sala { font-size: 0.8em; }
+"""
+
+SEPARADOR_CELULA = '<hr class="sep">'
+LINHA_INTERVALO = '<tr><td colspan="6" class="intervalo">Intervalo / Troca de Turno</td></tr>'
+
+DIAS_ORDENADOS = list(DIAS_DA_SEMANA.values())
+
+# Posição de cada rótulo na grade: horário -> (turno, aula) e dia -> coluna
+_POSICAO_HORARIO = {hora: (turno, aula) for turno, lista in HORARIOS_TURNO.items() for aula, hora in enumerate(lista)}
+_COLUNA_DIA = {dia: coluna for coluna, dia in enumerate(DIAS_ORDENADOS)}
+
+
+def abrir_tabela(classe):
+    """Tag de abertura comum a todas as tabelas geradas."""
+    return f'<table border="1" cellpadding="5" cellspacing="0" class="tabela {classe}">'
+
+
+@medido('html.tabela')
+def iter_tabela(colunas, linhas, classe, classe_cabecalho='cab-lista'):
+    """
+    Gera, pedaço a pedaço, uma tabela simples.
+    colunas: títulos do cabeçalho; linhas: iterável de sequências de valores.
+    """
+    yield abrir_tabela(classe)
+    yield f'<thead><tr class="{classe_cabecalho}">'
+    yield ''.join(f'<th>{col}</th>' for col in colunas)
+    yield '</tr></thead><tbody>'
+    for linha in linhas:
+        yield '<tr>' + ''.join(f'<td>{item}</td>' for item in linha) + '</tr>'
+    yield '</tbody></table>'
+
+
+@medido('grade.montar', linhas=lambda lista_horarios, turnos_usados: len(lista_horarios))
+def montar_grade(lista_horarios, turnos_usados):
+    """
+    Preenche a grade (horário x dia) numa única passada pelos itens.
+    lista_horarios: itens [hora, dia, texto_celula] ou [hora, dia, texto_celula, conflito];
+    turnos_usados: turnos a exibir.
+    Retorna as linhas da grade: None marca o intervalo entre turnos e as demais são
+    (hora, celulas, destaques), onde celulas tem uma lista de textos por dia da semana
+    e destaques indica, por dia, se alguma aula da célula está em conflito.
+    """
+    linhas = []
+    inicio_turno = {}
+    for turno in sorted(turnos_usados):
+        if turno not in HORARIOS_TURNO:
+            continue
+        if linhas:
+            linhas.append(None)
+        inicio_turno[turno] = len(linhas)
+        linhas.extend(
+            (hora, [[] for _ in DIAS_ORDENADOS], [False] * len(DIAS_ORDENADOS))
+            for hora in HORARIOS_TURNO[turno]
+        )
+
+    for item in lista_horarios:
+        hora, dia, texto = item[0], item[1], item[2]
+        turno, aula = _POSICAO_HORARIO.get(hora, (None, None))
+        coluna = _COLUNA_DIA.get(dia)
+        if turno in inicio_turno and coluna is not None:
+            linha = linhas[inicio_turno[turno] + aula]
+            linha[1][coluna].append(texto)
+            if len(item) > 3 and item[3]:
+                linha[2][coluna] = True
+
+    return linhas
+
+
+@medido('html.grade')
+def iter_grade(linhas, classe, separador, classe_hora=None, classe_aula=None):
+    """
+    Gera, pedaço a pedaço, a tabela de uma grade montada por montar_grade.
+    separador: texto entre aulas na mesma célula.
+    classe_hora / classe_aula: classes da coluna de horário e das células com aula.
+    Células com conflito recebem também a classe 'conflito'.
+    """
+    td_hora = f'<td class="{classe_hora}">' if classe_hora else '<td>'
+    td_aula = f'<td class="{classe_aula}">' if classe_aula else '<td>'
+    td_conflito = f'<td class="{classe_aula} conflito">' if classe_aula else '<td class="conflito">'
+
+    yield abrir_tabela(classe)
+    yield '<thead><tr class="cab-grade"><th>Horário</th>'
+    yield ''.join(f'<th>{dia}</th>' for dia in DIAS_ORDENADOS)
+    yield '</tr></thead><tbody>'
+
+    for linha in linhas:
+        if linha is None:
+            yield LINHA_INTERVALO
+            continue
+        hora, celulas, destaques = linha
+        tds = ''.join(
+            f'{td_conflito if destaque else td_aula}{separador.join(textos)}</td>' if textos else '<td></td>'
+            for textos, destaque in zip(celulas, destaques)
+        )
+        yield f'<tr>{td_hora}{hora}</td>{tds}</tr>'
+
+    yield '</tbody></table>'
+
+
+def formatar_numero(valor):
+    """12 -> '12', 1.5 -> '1,5' (no máximo uma casa decimal, vírgula como separador)."""
+    valor = round(float(valor), 1)
+    return str(int(valor)) if valor.is_integer() else f"{valor:.1f}".replace('.', ',')
+
+
+def slugificar(texto):
+    """Nome seguro para arquivo/URL, ex.: 'Engenharia de Materiais 2026/1' -> 'engenharia-de-materiais-2026-1'."""
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii').lower()
+    return re.sub(r'[^a-z0-9]+', '-', texto).strip('-')
+
+
+@medido('html.escrever')
+def escrever_html(partes, destino):
+    """
+    Escreve os pedaços de HTML em 'destino' (caminho ou arquivo já aberto)
+    à medida que são gerados, sem montar a página inteira em memória.
+    """
+    if hasattr(destino, 'write'):
+        for parte in partes:
+            destino.write(parte)
+        return
+
+    pasta = os.path.dirname(destino)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(destino, 'w', encoding='utf-8') as f:
+        for parte in partes:
+            f.write(parte)
@@ -0,0 +1,379 @@
+"""
+Resolvedor de horários: propõe slots para ofertas sem horário ou em conflito.
+
+Lê a mesma planilha, mantém fixas todas as aulas que não estão em conflito e procura um
+slot (dia, turno, aula) para cada aula pendente:
+
+- ofertas sem nenhum horário recebem uma aula por crédito;
+- em cada conflito (sala, professor ou semestre), a oferta que aparece primeiro na
+  planilha fica onde está e as aulas das demais naquele slot são remanejadas.
+
+Restrições respeitadas: professor não dá duas aulas ao mesmo tempo nem em horários
+indisponíveis, a sala precisa estar livre e comportar a turma, e obrigatórias de
+disciplinas diferentes do mesmo semestre ímpar não colidem.
+
+Cada domínio é uma máscara de bits sobre os slots da semana (os mesmos de matriculas.py).
+A busca escolhe sempre a aula com menos opções (MRV), recalcula os domínios das demais
+depois de cada escolha (forward checking) e volta atrás quando algum fica vazio. Se o
+problema não tiver solução completa dentro dos limites de nós e de tempo, as aulas impossíveis ficam
+sem proposta e as demais são resolvidas de forma gulosa.
+
+Restrições extras (opcionais) vêm de um YAML, veja restricoes.yml. Uso:
+
+    python resolvedor.py --restricoes restricoes.yml --saida relatorio_propostas.html
+"""
+import argparse
+import sys
+import time
+
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+from modelo import obter_modelo
+from conflitos import ROTULOS_CONFLITO, chave_sala, detectar_conflitos
+from matriculas import BIT_DO_SLOT, SLOTS, slots_da_mascara
+from renderizacao import CSS_TABELAS, escrever_html, iter_tabela
+
+# Aulas por oferta sem horário: uma por crédito, até o número de colunas 'horario i'
+MAX_AULAS_POR_OFERTA = 6
+# Limites da busca com retrocesso antes de cair na solução gulosa
+LIMITE_NOS = 20_000
+TEMPO_LIMITE = 5.0  # segundos
+
+MOTIVO_SEM_HORARIO = 'Sem horário'
+
+TODOS_OS_SLOTS = (1 << len(SLOTS)) - 1
+
+COLUNAS_PROPOSTAS = ['Código', 'Turma', 'Professor', 'Motivo', 'Horário atual', 'Proposta', 'Código do horário', 'Sala']
+
+
+def codigo_do_slot(slot):
+    """Código no formato da planilha: (dia '2', turno '3', aula 0) -> '231'."""
+    dia, turno, aula = slot
+    return f"{dia}{turno}{aula + 1}"
+
+
+def rotulo_do_slot(slot):
+    dia, turno, aula = slot
+    return f"{DIAS_DA_SEMANA[dia]} {HORARIOS_TURNO[turno][aula]}"
+
+
+def mascara_dos_codigos(codigos):
+    """
+    Máscara dos slots cobertos por uma lista de códigos no formato da planilha:
+    '2' (dia inteiro), '23' (turno de um dia) ou '231' (uma aula).
+    """
+    mascara = 0
+    for codigo in codigos:
+        codigo = str(codigo).strip()
+        for slot, bit in BIT_DO_SLOT.items():
+            if codigo_do_slot(slot).startswith(codigo):
+                mascara |= bit
+    return mascara
+
+
+class Restricoes:
+    """Dados que a planilha não tem: horários indisponíveis por professor e capacidade das salas."""
+    __slots__ = ('indisponivel', 'capacidade')
+
+    def __init__(self, indisponivel=None, capacidade=None):
+        self.indisponivel = indisponivel or {}
+        self.capacidade = capacidade or {}
+
+    def cabe(self, sala, alunos):
+        """A sala comporta a turma? Sala sem capacidade cadastrada é aceita."""
+        capacidade = self.capacidade.get(sala[0])
+        return capacidade is None or alunos <= capacidade
+
+
+def carregar_restricoes(caminho):
+    """Lê as restrições de um arquivo YAML (veja restricoes.yml)."""
+    import yaml
+
+    with open(caminho, encoding='utf-8') as f:
+        dados = yaml.safe_load(f) or {}
+
+    return Restricoes(
+        indisponivel={
+            str(professor).strip(): mascara_dos_codigos(codigos or [])
+            for professor, codigos in (dados.get('indisponivel') or {}).items()
+        },
+        capacidade={str(sala).strip(): int(cap) for sala, cap in (dados.get('capacidade') or {}).items()},
+    )
+
+
+class Pendente:
+    """Uma aula a posicionar: de uma oferta sem horário ou tirada de um conflito."""
+    __slots__ = ('oferta', 'sessao', 'motivo', 'salas', 'bloqueado')
+
+    def __init__(self, oferta, sessao, motivo, salas, bloqueado):
+        self.oferta = oferta
+        self.sessao = sessao
+        self.motivo = motivo
+        self.salas = salas          # candidatas, em ordem de preferência (None: aula sem sala)
+        self.bloqueado = bloqueado  # slots indisponíveis para o professor
+
+
+class Proposta:
+    """Slot e sala propostos para uma aula pendente (slot None: sem solução)."""
+    __slots__ = ('pendente', 'slot', 'sala')
+
+    def __init__(self, pendente, slot, sala):
+        self.pendente = pendente
+        self.slot = slot
+        self.sala = sala
+
+    def __repr__(self):
+        oferta = self.pendente.oferta
+        destino = rotulo_do_slot(self.slot) if self.slot else 'sem solução'
+        return f"Proposta({oferta.codigo!r}, {destino}, sala={self.sala!r})"
+
+
+class _SemSolucao(Exception):
+    pass
+
+
+class Resolvedor:
+    """
+    Estado da busca: máscaras ocupadas por professor, sala, oferta e disciplina de
+    cada semestre ímpar. Posicionar ou retirar uma aula é só um OR / AND NOT.
+    """
+
+    def __init__(self, modelo, restricoes=None, limite_nos=LIMITE_NOS, tempo_limite=TEMPO_LIMITE):
+        self.modelo = modelo
+        self.restricoes = restricoes or Restricoes()
+        self.limite_nos = limite_nos
+        self.tempo_limite = tempo_limite
+        self.prazo = None
+        self.nos = 0
+        self.por_professor = {}
+        self.por_sala = {}
+        self.por_oferta = {}
+        self.por_semestre = {}
+        self.pendentes = self._separar_pendentes()
+
+    # --- ESTADO ---
+
+    def _marcar(self, oferta, bit, sala, ligar):
+        """Liga (ou desliga) o bit em todas as máscaras de recurso da aula."""
+        alvos = [(self.por_oferta, oferta.id)]
+        alvos.extend((self.por_professor, professor) for professor in oferta.professores)
+        if sala is not None:
+            alvos.append((self.por_sala, sala))
+        if isinstance(oferta.grupo, int):
+            # Uma máscara por oferta: desligar o bit não apaga as outras turmas da disciplina
+            alvos.append((self.por_semestre.setdefault(oferta.grupo, {}), (oferta.codigo, oferta.id)))
+        for mascaras, chave in alvos:
+            atual = mascaras.get(chave, 0)
+            mascaras[chave] = atual | bit if ligar else atual & ~bit
+
+    def _separar_pendentes(self):
+        """Fixa as aulas sem conflito e devolve a lista de aulas a posicionar."""
+        remanejadas = {}
+        for conflito in detectar_conflitos(self.modelo):
+            primeira = min(s.oferta.id for s in conflito.sessoes)
+            for sessao in conflito.sessoes:
+                if sessao.oferta.id != primeira:
+                    remanejadas.setdefault(sessao, ROTULOS_CONFLITO[conflito.tipo])
+
+        for sessao in self.modelo.sessoes:
+            if sessao not in remanejadas:
+                self._marcar(sessao.oferta, BIT_DO_SLOT[sessao.slot], chave_sala(sessao), True)
+
+        salas_por_campus = {}
+        for sessao in self.modelo.sessoes:
+            sala = chave_sala(sessao)
+            if sala is not None:
+                salas_por_campus.setdefault(sala[1], set()).add(sala)
+
+        pendentes = [
+            self._pendente(sessao.oferta, sessao, motivo, chave_sala(sessao), salas_por_campus)
+            for sessao, motivo in remanejadas.items()
+        ]
+        for oferta in self.modelo.ofertas:
+            if oferta.sessoes or oferta.creditos <= 0 or oferta.grupo is None:
+                continue
+            sala_base = str(oferta.sala_base or '').strip()
+            preferida = (sala_base, oferta.campus) if sala_base else None
+            for _ in range(min(oferta.creditos, MAX_AULAS_POR_OFERTA)):
+                pendentes.append(self._pendente(oferta, None, MOTIVO_SEM_HORARIO, preferida, salas_por_campus))
+        return pendentes
+
+    def _pendente(self, oferta, sessao, motivo, preferida, salas_por_campus):
+        alunos = oferta.num_alunos
+        outras = sorted(salas_por_campus.get(oferta.campus, frozenset()) - {preferida})
+        if preferida is None and not outras:
+            # Nenhuma sala conhecida: a aula é posicionada sem sala
+            candidatas = None
+        else:
+            candidatas = [s for s in [preferida, *outras] if s is not None and self.restricoes.cabe(s, alunos)]
+        bloqueado = 0
+        for professor in oferta.professores:
+            bloqueado |= self.restricoes.indisponivel.get(professor, 0)
+        return Pendente(oferta, sessao, motivo, candidatas, bloqueado)
+
+    # --- DOMÍNIOS ---
+
+    def dominio(self, pendente):
+        """Slots ainda possíveis para a aula, dado o estado atual."""
+        oferta = pendente.oferta
+        ocupado = pendente.bloqueado | self.por_oferta.get(oferta.id, 0)
+        for professor in oferta.professores:
+            ocupado |= self.por_professor.get(professor, 0)
+        if isinstance(oferta.grupo, int):
+            for (codigo, _), mascara in self.por_semestre.get(oferta.grupo, {}).items():
+                if codigo != oferta.codigo:
+                    ocupado |= mascara
+        if pendente.salas is not None:
+            # Sem candidata (nenhuma comporta a turma), livres fica 0 e o domínio, vazio
+            livres = 0
+            for sala in pendente.salas:
+                livres |= ~self.por_sala.get(sala, 0)
+            ocupado |= ~livres
+        return TODOS_OS_SLOTS & ~ocupado
+
+    def _sala_para(self, pendente, bit):
+        for sala in pendente.salas or ():
+            if not self.por_sala.get(sala, 0) & bit:
+                return sala
+        return None
+
+    def _ordenar_valores(self, pendente, dominio):
+        """Prefere a sala preferida livre e os turnos que a oferta já usa."""
+        turnos = {sessao.turno for sessao in pendente.oferta.sessoes}
+        preferida = pendente.salas[0] if pendente.salas else None
+        ocupada = self.por_sala.get(preferida, 0) if preferida else 0
+        return sorted(
+            slots_da_mascara(dominio),
+            key=lambda slot: (bool(ocupada & BIT_DO_SLOT[slot]), slot[1] not in turnos),
+        )
+
+    # --- BUSCA ---
+
+    def _escolher(self, pendentes):
+        """Aula com o menor domínio (MRV); None se alguma ficou sem opção."""
+        melhor, melhor_dominio, melhor_tamanho = None, 0, None
+        for indice, pendente in enumerate(pendentes):
+            dominio = self.dominio(pendente)
+            tamanho = dominio.bit_count()
+            if tamanho == 0:
+                return None, 0
+            if melhor_tamanho is None or tamanho < melhor_tamanho:
+                melhor, melhor_dominio, melhor_tamanho = indice, dominio, tamanho
+        return melhor, melhor_dominio
+
+    def _buscar(self, pendentes, propostas):
+        if not pendentes:
+            return True
+        indice, dominio = self._escolher(pendentes)
+        if indice is None:
+            return False
+
+        pendente = pendentes[indice]
+        restantes = pendentes[:indice] + pendentes[indice + 1:]
+        for slot in self._ordenar_valores(pendente, dominio):
+            self.nos += 1
+            if self.nos > self.limite_nos or time.perf_counter() > self.prazo:
+                raise _SemSolucao
+            bit = BIT_DO_SLOT[slot]
+            sala = self._sala_para(pendente, bit)
+            self._marcar(pendente.oferta, bit, sala, True)
+            propostas.append(Proposta(pendente, slot, sala))
+            if self._buscar(restantes, propostas):
+                return True
+            propostas.pop()
+            self._marcar(pendente.oferta, bit, sala, False)
+        return False
+
+    def _gulosa(self):
+        """Sem solução completa: posiciona o que der, na ordem MRV, sem voltar atrás."""
+        propostas = []
+        pendentes = list(self.pendentes)
+        while pendentes:
+            indice = min(range(len(pendentes)), key=lambda i: self.dominio(pendentes[i]).bit_count())
+            pendente = pendentes.pop(indice)
+            dominio = self.dominio(pendente)
+            if not dominio:
+                propostas.append(Proposta(pendente, None, None))
+                continue
+            slot = self._ordenar_valores(pendente, dominio)[0]
+            sala = self._sala_para(pendente, BIT_DO_SLOT[slot])
+            self._marcar(pendente.oferta, BIT_DO_SLOT[slot], sala, True)
+            propostas.append(Proposta(pendente, slot, sala))
+        return propostas
+
+    def resolver(self):
+        """Retorna a lista de Proposta, uma por aula pendente."""
+        propostas = []
+        self.prazo = time.perf_counter() + self.tempo_limite
+        limite_recursao = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limite_recursao, 2 * len(self.pendentes) + 100))
+        try:
+            if self._buscar(self.pendentes, propostas):
+                return propostas
+        except _SemSolucao:
+            pass
+        finally:
+            sys.setrecursionlimit(limite_recursao)
+
+        # Desfaz o que a busca deixou marcado antes da tentativa gulosa
+        for proposta in propostas:
+            self._marcar(proposta.pendente.oferta, BIT_DO_SLOT[proposta.slot], proposta.sala, False)
+        return self._gulosa()
+
+
+def linhas_tabela_propostas(propostas):
+    """Linhas da tabela de propostas, na ordem da planilha."""
+    for proposta in sorted(propostas, key=lambda p: (p.pendente.oferta.id, p.slot or ())):
+        pendente = proposta.pendente
+        oferta = pendente.oferta
+        atual = f"{pendente.sessao.dia} {pendente.sessao.horario}" if pendente.sessao else '-'
+        if proposta.slot is None:
+            destino, codigo, sala = '<b>sem solução</b>', '-', '-'
+        else:
+            destino, codigo = rotulo_do_slot(proposta.slot), codigo_do_slot(proposta.slot)
+            sala = proposta.sala[0] if proposta.sala else '-'
+        yield (oferta.codigo, oferta.turma, oferta.professor, pendente.motivo, atual, destino, codigo, sala)
+
+
+def iter_html_propostas(propostas):
+    yield f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="UTF-8">
+<title>Propostas de Horário</title>
+<style>
+    body {{ font-family: Arial, sans-serif; margin: 40px; }}{CSS_TABELAS}</style>
+</head>
+<body>
+<h1>Propostas de Horário</h1>
+"""
+    if propostas:
+        yield from iter_tabela(COLUNAS_PROPOSTAS, linhas_tabela_propostas(propostas), 'detalhes')
+    else:
+        yield "<p><i>Nenhuma aula pendente: todas as ofertas têm horário e não há conflitos.</i></p>"
+    yield "</body></html>"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Propõe horários para ofertas sem horário ou em conflito.")
+    parser.add_argument('--restricoes', help="YAML com indisponibilidade de professores e capacidade das salas")
+    parser.add_argument('--saida', default='relatorio_propostas.html', help="arquivo HTML com as propostas")
+    parser.add_argument('--limite-nos', type=int, default=LIMITE_NOS,
+                        help=f"nós da busca antes de cair na solução gulosa (padrão: {LIMITE_NOS})")
+    parser.add_argument('--tempo-limite', type=float, default=TEMPO_LIMITE,
+                        help=f"segundos de busca antes de cair na solução gulosa (padrão: {TEMPO_LIMITE:g})")
+    args = parser.parse_args(argv)
+
+    restricoes = carregar_restricoes(args.restricoes) if args.restricoes else None
+    inicio = time.perf_counter()
+    resolvedor = Resolvedor(obter_modelo(), restricoes, args.limite_nos, args.tempo_limite)
+    propostas = resolvedor.resolver()
+    sem_solucao = sum(1 for p in propostas if p.slot is None)
+
+    escrever_html(iter_html_propostas(propostas), args.saida)
+    print(f"{len(propostas)} aula(s) pendente(s), {sem_solucao} sem solução, "
+          f"{resolvedor.nos} nó(s) em {time.perf_counter() - inicio:.2f}s. Propostas em '{args.saida}'.")
+    return 1 if sem_solucao else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Saída dividida: uma página pequena por professor e por grupo de semestre, em vez de um
+único HTML com tudo, mais um índice de busca em JSON já pronto.
+
+Estrutura gerada em 'pasta':
+    index.html               cabeçalho, links e campo de busca
+    turmas/<grupo>.html      um por semestre ímpar, reofertas e optativas
+    professores/<nome>.html  um por professor
+    busca.json               professor / código / sala -> páginas
+
+No celular, a pessoa baixa o índice (poucos KB) e só a página que abrir.
+"""
+import json
+import os
+
+import horarios_professores
+import processar_horarios
+from conflitos import detectar_conflitos, sessoes_em_conflito
+from pagina import CURSO, TERMO, iter_pagina
+from renderizacao import escrever_html, slugificar
+
+ARQUIVO_BUSCA = 'busca.json'
+
+# Busca no navegador: carrega busca.json uma vez e filtra por prefixo/trecho
+SCRIPT_BUSCA = """
+<script>
+(function () {
+  var campo = document.getElementById('busca'), lista = document.getElementById('resultados'), indice = null;
+  function mostrar(termo) {
+    lista.innerHTML = '';
+    if (!indice || termo.length < 2) return;
+    termo = termo.toLowerCase();
+    var vistos = {};
+    ['professor', 'codigo', 'sala'].forEach(function (tipo) {
+      Object.keys(indice[tipo]).forEach(function (nome) {
+        if (nome.toLowerCase().indexOf(termo) < 0) return;
+        indice[tipo][nome].forEach(function (i) {
+          var chave = tipo + nome + i;
+          if (vistos[chave]) return;
+          vistos[chave] = true;
+          var li = document.createElement('li'), a = document.createElement('a');
+          a.href = indice.paginas[i][0];
+          a.textContent = nome + ' \\u2192 ' + indice.paginas[i][1];
+          li.appendChild(a);
+          lista.appendChild(li);
+        });
+      });
+    });
+  }
+  fetch('busca.json').then(function (r) { return r.json(); }).then(function (dados) {
+    indice = dados;
+    mostrar(campo.value);
+  });
+  campo.addEventListener('input', function () { mostrar(campo.value); });
+})();
+</script>
+"""
+
+
+class IndiceBusca:
+    """Índice compacto: cada página entra uma vez numa lista e as chaves apontam para posições."""
+    __slots__ = ('paginas', 'posicao', 'professor', 'codigo', 'sala')
+
+    def __init__(self):
+        self.paginas = []
+        self.posicao = {}
+        self.professor = {}
+        self.codigo = {}
+        self.sala = {}
+
+    def adicionar_pagina(self, url, titulo):
+        if url not in self.posicao:
+            self.posicao[url] = len(self.paginas)
+            self.paginas.append((url, titulo))
+        return self.posicao[url]
+
+    def registrar(self, tipo, nome, pagina):
+        nome = str(nome).strip()
+        if not nome:
+            return
+        destinos = getattr(self, tipo).setdefault(nome, [])
+        if pagina not in destinos:
+            destinos.append(pagina)
+
+    def registrar_ofertas(self, ofertas, pagina):
+        for oferta in ofertas:
+            self.registrar('codigo', oferta.codigo, pagina)
+            for sessao in oferta.sessoes:
+                if sessao.sala:
+                    self.registrar('sala', sessao.sala, pagina)
+
+    def como_dict(self):
+        return {
+            'paginas': self.paginas,
+            'professor': self.professor,
+            'codigo': self.codigo,
+            'sala': self.sala,
+        }
+
+
+def _url_unica(pasta, nome, usadas):
+    """URL relativa para 'nome' dentro de 'pasta', com sufixo se o slug já foi usado."""
+    base = slugificar(nome) or 'pagina'
+    slug, n = base, 2
+    while f"{pasta}/{slug}" in usadas:
+        slug, n = f"{base}-{n}", n + 1
+    url = f"{pasta}/{slug}"
+    usadas.add(url)
+    return f"{url}.html"
+
+
+def iter_indice(links_turmas, links_professores):
+    """Corpo do index.html: busca e listas de links."""
+    yield "<h1 class='secao'>Buscar</h1>"
+    yield ('<input id="busca" type="search" placeholder="Professor, código da disciplina ou sala" '
+           'style="width: 100%; font-size: 1.1em; padding: 0.4em;" autocomplete="off">')
+    yield '<ul id="resultados"></ul>'
+    yield "<h1 class='secao'>Horários por Turma</h1><ul>"
+    yield ''.join(f'<li><a href="{url}">{titulo}</a></li>' for url, titulo in links_turmas)
+    yield "</ul><h1 class='secao'>Horários por Professor</h1><ul>"
+    yield ''.join(f'<li><a href="{url}">{titulo}</a></li>' for url, titulo in links_professores)
+    yield "</ul>"
+    yield SCRIPT_BUSCA
+
+
+def iter_paginas_divididas(modelo, curso=CURSO, termo=TERMO):
+    """
+    Arquivos da saída dividida, um por vez: (caminho relativo, pedaços do conteúdo).
+    Os pedaços de cada arquivo devem ser consumidos antes de pedir o próximo.
+    """
+    em_conflito = sessoes_em_conflito(detectar_conflitos(modelo))
+    busca = IndiceBusca()
+    voltar = '../index.html'
+    usadas = set()
+
+    # 1. Uma página por grupo de semestre
+    links_turmas = []
+    for chave, titulo, dados in processar_horarios.secoes_dos_grupos(modelo, em_conflito):
+        if not dados['horarios']:
+            continue
+        url = _url_unica('turmas', chave, usadas)
+        partes = [processar_horarios.ESTILO_TURMAS, *processar_horarios.iter_secao_grupo(titulo, dados)]
+        yield url, iter_pagina(partes, curso, termo, titulo=f"{titulo} - {curso}", voltar=voltar)
+        links_turmas.append((url, titulo))
+
+        pagina = busca.adicionar_pagina(url, titulo)
+        ofertas = modelo.por_grupo.get(chave, [])
+        busca.registrar_ofertas(ofertas, pagina)
+        for oferta in ofertas:
+            for professor in oferta.professores:
+                busca.registrar('professor', professor, pagina)
+
+    # 2. Uma página por professor
+    links_professores = []
+    for prof in modelo.professores():
+        disciplinas, horarios, turnos = horarios_professores.dados_do_professor(modelo, prof, em_conflito)
+        url = _url_unica('professores', prof, usadas)
+        partes = [horarios_professores.ESTILO_PROFESSORES,
+                  *horarios_professores.iter_secao_professor(prof, disciplinas, horarios, turnos)]
+        yield url, iter_pagina(partes, curso, termo, titulo=f"{prof} - {curso}", voltar=voltar)
+        links_professores.append((url, prof))
+
+        pagina = busca.adicionar_pagina(url, prof)
+        busca.registrar('professor', prof, pagina)
+        busca.registrar_ofertas(modelo.por_professor[prof], pagina)
+
+    # 3. Índice de busca e página inicial
+    yield ARQUIVO_BUSCA, [json.dumps(busca.como_dict(), ensure_ascii=False, separators=(',', ':'))]
+    yield 'index.html', iter_pagina(iter_indice(links_turmas, links_professores), curso, termo)
+
+
+def gerar_paginas_divididas(modelo, pasta, curso=CURSO, termo=TERMO):
+    """
+    Escreve a saída dividida do modelo em 'pasta'.
+    Retorna o número de páginas geradas (sem contar o index.html).
+    """
+    paginas = 0
+    for url, partes in iter_paginas_divididas(modelo, curso, termo):
+        escrever_html(partes, os.path.join(pasta, url))
+        paginas += url.endswith('.html')
+    return paginas - 1
@@ -0,0 +1,240 @@
+"""
+Ocupação das salas: grade por sala, resumo de uso e consulta de salas livres.
+
+As sessões do modelo viram um tensor booleano (sala x dia x slot), em que o eixo de
+slots segue os horários de HORARIOS_TURNO em ordem (manhã, tarde, noite). Com ele:
+
+- "salas livres na terça às 14:20" é uma coluna do tensor (sem percorrer a planilha);
+- o uso por turno é uma soma sobre uma fatia do eixo de slots;
+- os horários de pico são a soma sobre o eixo de salas.
+
+As salas são identificadas por (sala, campus), como na detecção de conflitos. Uso:
+
+    python salas.py                           # grava relatorio_salas.html
+    python salas.py --livres terça 14:20      # lista as salas livres nesse horário
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from planilha import DIAS_DA_SEMANA, HORARIOS_TURNO
+from modelo import construir_modelo, obter_modelo
+from conflitos import CONFLITO_SALA, chave_sala, detectar_conflitos, sessoes_em_conflito
+from renderizacao import CSS_TABELAS, escrever_html, iter_grade, iter_tabela, montar_grade, slugificar
+
+NOMES_TURNO = {'1': 'Manhã', '2': 'Tarde', '3': 'Noite'}
+
+DIAS = list(DIAS_DA_SEMANA)
+
+# Eixo de slots do tensor: (turno, aula) na ordem da grade
+SLOTS_DO_DIA = [(turno, aula) for turno, lista in HORARIOS_TURNO.items() for aula in range(len(lista))]
+_COLUNA_SLOT = {slot: coluna for coluna, slot in enumerate(SLOTS_DO_DIA)}
+_LINHA_DIA = {dia: linha for linha, dia in enumerate(DIAS)}
+
+# Coluna de cada horário, pelo rótulo ('14:20-15:10') ou só pelo início ('14:20')
+_COLUNA_HORARIO = {}
+for (_turno, _aula), _coluna in _COLUNA_SLOT.items():
+    _rotulo = HORARIOS_TURNO[_turno][_aula]
+    _COLUNA_HORARIO[_rotulo] = _COLUNA_HORARIO[_rotulo.split('-')[0]] = _coluna
+
+# Fatia do eixo de slots de cada turno
+FATIAS_TURNO = {}
+for _turno, _lista in HORARIOS_TURNO.items():
+    _inicio = _COLUNA_SLOT[(_turno, 0)]
+    FATIAS_TURNO[_turno] = slice(_inicio, _inicio + len(_lista))
+
+COLUNAS_USO = ['Sala', 'Campus', *(NOMES_TURNO[t] for t in HORARIOS_TURNO), 'Total', 'Uso']
+COLUNAS_PICOS = ['Dia', 'Horário', 'Salas ocupadas']
+COLUNAS_OCIOSAS = ['Turno', 'Salas sem aula no turno']
+
+
+def posicao_dia(dia):
+    """Linha do dia no tensor: aceita o código ('3'), o nome ('terça-feira') ou o início dele ('terça')."""
+    dia = str(dia).strip()
+    if dia in _LINHA_DIA:
+        return _LINHA_DIA[dia]
+    procurado = slugificar(dia)
+    for posicao, nome in enumerate(DIAS_DA_SEMANA.values()):
+        if procurado and slugificar(nome).startswith(procurado):
+            return posicao
+    raise ValueError(f"Dia desconhecido: {dia!r}")
+
+
+def posicao_horario(horario):
+    """Coluna do horário no tensor: aceita o rótulo ('14:20-15:10') ou só o início ('14:20')."""
+    horario = str(horario).strip()
+    if horario not in _COLUNA_HORARIO:
+        raise ValueError(f"Horário desconhecido: {horario!r}")
+    return _COLUNA_HORARIO[horario]
+
+
+def rotulo_sala(sala):
+    """Texto de uma chave (sala, campus)."""
+    nome, campus = sala
+    return f"{nome} ({campus})" if campus else nome
+
+
+class OcupacaoSalas:
+    """
+    Ocupação de todas as salas do modelo.
+    ocupado[s, d, c] é True quando a sala s tem aula no dia d e no slot c.
+    """
+    __slots__ = ('salas', 'posicao', 'campus', 'ocupado', 'sessoes')
+
+    def __init__(self, salas, ocupado, sessoes):
+        self.salas = salas
+        self.posicao = {sala: i for i, sala in enumerate(salas)}
+        self.campus = np.array([campus for _, campus in salas], dtype=object)
+        self.ocupado = ocupado
+        self.sessoes = sessoes
+
+    def livres(self, dia, horario, campus=None):
+        """Salas sem aula no dia/horário (opcionalmente só de um campus)."""
+        livre = ~self.ocupado[:, posicao_dia(dia), posicao_horario(horario)]
+        if campus is not None:
+            livre &= self.campus == campus
+        return [self.salas[i] for i in np.flatnonzero(livre)]
+
+    def esta_livre(self, sala, dia, horario):
+        return not self.ocupado[self.posicao[sala], posicao_dia(dia), posicao_horario(horario)]
+
+    def uso_por_turno(self):
+        """Matriz (sala x turno) com o número de slots ocupados na semana."""
+        return np.stack(
+            [self.ocupado[:, :, fatia].sum(axis=(1, 2)) for fatia in FATIAS_TURNO.values()], axis=1,
+        )
+
+    def ociosas_por_turno(self):
+        """Turno -> salas sem nenhuma aula naquele turno durante a semana."""
+        uso = self.uso_por_turno()
+        return {
+            turno: [self.salas[i] for i in np.flatnonzero(uso[:, coluna] == 0)]
+            for coluna, turno in enumerate(FATIAS_TURNO)
+        }
+
+    def picos(self, quantidade=10):
+        """Os (dia, horário, salas ocupadas) mais cheios da semana, do maior para o menor."""
+        total = self.ocupado.sum(axis=0)
+        ordem = np.argsort(-total, axis=None, kind='stable')[:quantidade]
+        picos = []
+        for indice in ordem:
+            d, c = np.unravel_index(indice, total.shape)
+            if total[d, c] == 0:
+                break
+            turno, aula = SLOTS_DO_DIA[c]
+            picos.append((DIAS_DA_SEMANA[DIAS[d]], HORARIOS_TURNO[turno][aula], int(total[d, c])))
+        return picos
+
+
+def construir_ocupacao(modelo):
+    """Monta o tensor de ocupação numa passada pelas sessões com sala informada."""
+    por_sala = {}
+    for sessao in modelo.sessoes:
+        sala = chave_sala(sessao)
+        if sala is not None:
+            por_sala.setdefault(sala, []).append(sessao)
+
+    salas = sorted(por_sala, key=lambda s: (str(s[1]), s[0]))
+    ocupado = np.zeros((len(salas), len(DIAS), len(SLOTS_DO_DIA)), dtype=bool)
+    for i, sala in enumerate(salas):
+        for sessao in por_sala[sala]:
+            ocupado[i, _LINHA_DIA[sessao.dia_cod], _COLUNA_SLOT[(sessao.turno, sessao.aula)]] = True
+
+    return OcupacaoSalas(salas, ocupado, por_sala)
+
+
+def linhas_tabela_uso(ocupacao):
+    """Linhas (Sala, Campus, slots por turno, Total, Uso) do resumo de uso."""
+    uso = ocupacao.uso_por_turno()
+    capacidade = [len(DIAS) * len(HORARIOS_TURNO[t]) for t in FATIAS_TURNO]
+    total_semana = sum(capacidade)
+    for (nome, campus), linha in zip(ocupacao.salas, uso):
+        total = int(linha.sum())
+        por_turno = [f"{int(ocupados)}/{cap}" for ocupados, cap in zip(linha, capacidade)]
+        yield (nome, campus, *por_turno, total, f"{100 * total / total_semana:.0f}%")
+
+
+def dados_da_sala(ocupacao, sala, em_conflito=frozenset()):
+    """
+    Itens [hora, dia, texto_celula, conflito] da grade de uma sala e os turnos usados.
+    """
+    horarios = []
+    turnos = set()
+    for sessao in ocupacao.sessoes[sala]:
+        oferta = sessao.oferta
+        texto_celula = f"<b>{oferta.codigo}</b><br>{oferta.nome_exibicao}<br><span class='nome'>{oferta.professor}</span>"
+        horarios.append([sessao.horario, sessao.dia, texto_celula, sessao in em_conflito])
+        turnos.add(sessao.turno)
+    return horarios, turnos
+
+
+def iter_html_salas(df_planilha=None, modelo=None):
+    """
+    Gera, pedaço a pedaço, o relatório de salas: uso por turno, horários de pico,
+    salas ociosas por turno e a grade de cada sala (choques de sala destacados).
+    """
+    if modelo is None:
+        modelo = construir_modelo(df_planilha) if df_planilha is not None else obter_modelo()
+
+    ocupacao = construir_ocupacao(modelo)
+    em_conflito = sessoes_em_conflito(c for c in detectar_conflitos(modelo) if c.tipo == CONFLITO_SALA)
+
+    yield f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="UTF-8">
+<title>Ocupação das Salas</title>
+<style>
+    body {{ font-family: Arial, sans-serif; margin: 40px; }}{CSS_TABELAS}</style>
+</head>
+<body>
+"""
+    yield "<h1>Ocupação das Salas</h1>"
+    yield from iter_tabela(COLUNAS_USO, linhas_tabela_uso(ocupacao), 'carga')
+
+    yield "<h2>Horários de Pico</h2>"
+    yield from iter_tabela(COLUNAS_PICOS, ocupacao.picos(), 'carga')
+
+    yield "<h2>Salas Ociosas</h2>"
+    ociosas = ocupacao.ociosas_por_turno()
+    yield from iter_tabela(
+        COLUNAS_OCIOSAS,
+        ((NOMES_TURNO[t], ', '.join(map(rotulo_sala, salas)) or '-') for t, salas in ociosas.items()),
+        'detalhes',
+    )
+
+    yield "<h1>Grade por Sala</h1>"
+    for sala in ocupacao.salas:
+        horarios, turnos = dados_da_sala(ocupacao, sala, em_conflito)
+        yield f"<h2>{rotulo_sala(sala)}</h2>"
+        yield from iter_grade(montar_grade(horarios, turnos), 'grade-professor', '<br>')
+
+    yield "</body></html>"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relatório de ocupação das salas.")
+    parser.add_argument('--saida', default='relatorio_salas.html', help="arquivo HTML do relatório")
+    parser.add_argument('--livres', nargs=2, metavar=('DIA', 'HORARIO'),
+                        help="em vez do relatório, lista as salas livres (ex.: --livres terça 14:20)")
+    parser.add_argument('--campus', help="com --livres, considera só as salas deste campus")
+    args = parser.parse_args(argv)
+
+    if args.livres:
+        ocupacao = construir_ocupacao(obter_modelo())
+        try:
+            livres = ocupacao.livres(*args.livres, campus=args.campus)
+        except ValueError as e:
+            parser.error(str(e))
+        for sala in livres:
+            print(rotulo_sala(sala))
+        return 0
+
+    escrever_html(iter_html_salas(), args.saida)
+    print(f"Sucesso! Arquivo '{args.saida}' gerado.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Servidor HTTP local (asyncio) que mantém as páginas de horários atualizadas.
+
+Em segundo plano, consulta a planilha a cada 'intervalo' segundos pelo mesmo carregador
+de autenticar_e_obter_dados (que só baixa as abas de novo quando a revisão muda) e
+re-renderiza apenas quando o conteúdo mudou. As páginas ficam em memória, já
+comprimidas com gzip e com ETag forte: quem já tem a versão atual recebe 304 sem corpo.
+A troca de versão é atômica: as requisições nunca veem uma publicação pela metade.
+
+Rotas (as mesmas do site publicado):
+    /  e  /index.html        página completa (turmas e professores)
+    /paginas/...             saída dividida (veja saida_dividida.py)
+    /alteracoes.json         alterações em relação à versão servida antes (veja diferencas.py)
+    /status.json             revisão servida, última consulta e tempo de renderização
+
+Uso:
+    python servidor.py --porta 8000 --intervalo 60
+
+A fonte da planilha é um parâmetro (uma função que retorna o snapshot), então o servidor
+pode ser testado com uma planilha falsa (veja benchmarks/bench_servidor.py).
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from pagina import CURSO, TERMO, iter_pagina_completa
+from planilha import obter_snapshot, snapshot_para_dataframe
+
+INTERVALO = 60.0 # segundos entre consultas à planilha
+PREFIXO_DIVIDIDA = '/paginas/'
+
+# Requisições maiores que isso (linha + cabeçalhos) são recusadas
+LIMITE_CABECALHOS = 16 * 1024
+
+TIPOS = {
+    '.html': 'text/html; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+}
+
+RAZOES = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+          405: 'Method Not Allowed', 503: 'Service Unavailable'}
+
+
+def fonte_planilha():
+    """Fonte padrão: o snapshot da planilha configurada, consultado de novo a cada chamada."""
+    return obter_snapshot(recarregar=True)
+
+
+def _cabecalhos(status, campos):
+    linhas = [f"HTTP/1.1 {status} {RAZOES[status]}"]
+    linhas.extend(f"{nome}: {valor}" for nome, valor in campos)
+    return ('\r\n'.join(linhas) + '\r\n').encode('latin-1')
+
+
+class Recurso:
+    """
+    Um arquivo servido: corpo original e comprimido, ETag forte de cada variante e os
+    cabeçalhos das respostas já montados (o caminho quente só concatena bytes).
+    """
+    __slots__ = ('corpo', 'comprimido', 'etag', 'etag_gzip', 'resposta', 'resposta_gzip',
+                 'nao_modificado', 'nao_modificado_gzip')
+
+    def __init__(self, corpo, tipo, modificado):
+        self.corpo = corpo
+        self.comprimido = gzip.compress(corpo, compresslevel=9, mtime=0)
+        digest = hashlib.blake2b(corpo, digest_size=12).hexdigest()
+        # Variantes diferentes precisam de ETags fortes diferentes
+        self.etag = f'"{digest}"'
+        self.etag_gzip = f'"{digest}-gz"'
+
+        comuns = [('Content-Type', tipo), ('Cache-Control', 'no-cache'), ('Vary', 'Accept-Encoding'),
+                  ('Last-Modified', modificado)]
+        self.resposta = _cabecalhos(200, [*comuns, ('ETag', self.etag), ('Content-Length', len(corpo))])
+        self.resposta_gzip = _cabecalhos(200, [*comuns, ('ETag', self.etag_gzip), ('Content-Encoding', 'gzip'),
+                                               ('Content-Length', len(self.comprimido))])
+        self.nao_modificado = _cabecalhos(304, [*comuns, ('ETag', self.etag)])
+        self.nao_modificado_gzip = _cabecalhos(304, [*comuns, ('ETag', self.etag_gzip)])
+
+
+class Publicacao:
+    """Todas as rotas de uma versão renderizada da planilha."""
+    __slots__ = ('recursos', 'versao', 'gerada_em', 'segundos')
+
+    def __init__(self, recursos, versao, gerada_em, segundos):
+        self.recursos = recursos
+        self.versao = versao
+        self.gerada_em = gerada_em
+        self.segundos = segundos
+
+
+def _tipo(caminho):
+    for extensao, tipo in TIPOS.items():
+        if caminho.endswith(extensao):
+            return tipo
+    return 'application/octet-stream'
+
+
+def renderizar(snapshot, curso=CURSO, termo=TERMO, anterior=None):
+    """
+    Monta a publicação (todas as rotas, comprimidas) a partir de um snapshot.
+    anterior: snapshot da versão servida antes, base do registro de alterações.
+    """
+    from diferencas import alteracoes_como_json, comparar, impressao_snapshot
+    from modelo import construir_modelo
+    from saida_dividida import iter_paginas_divididas
+
+    inicio = time.perf_counter()
+    agora = datetime.now(timezone.utc)
+    modificado = format_datetime(agora, usegmt=True)
+    modelo = construir_modelo(snapshot_para_dataframe(snapshot))
+
+    alteracoes = comparar(anterior, snapshot) if anterior is not None else []
+    recursos = {
+        '/alteracoes.json': Recurso(alteracoes_como_json(alteracoes, anterior, snapshot).encode('utf-8'),
+                                    TIPOS['.json'], modificado),
+    }
+    pagina = Recurso(''.join(iter_pagina_completa(modelo, curso, termo, alteracoes)).encode('utf-8'),
+                     TIPOS['.html'], modificado)
+    recursos['/'] = recursos['/index.html'] = pagina
+    for url, partes in iter_paginas_divididas(modelo, curso, termo):
+        recursos[PREFIXO_DIVIDIDA + url] = Recurso(''.join(partes).encode('utf-8'), _tipo(url), modificado)
+    recursos[PREFIXO_DIVIDIDA.rstrip('/')] = recursos[PREFIXO_DIVIDIDA] = recursos[PREFIXO_DIVIDIDA + 'index.html']
+
+    return Publicacao(recursos, impressao_snapshot(snapshot), agora, time.perf_counter() - inicio)
+
+
+def _aceita_gzip(valor):
+    """True se o Accept-Encoding aceita gzip (sem q=0)."""
+    for item in valor.split(','):
+        nome, _, parametros = item.strip().partition(';')
+        if nome.strip().lower() in ('gzip', '*'):
+            parametros = parametros.replace(' ', '')
+            return parametros not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def _etag_confere(valor, etag):
+    """If-None-Match: '*' ou uma lista de ETags (comparação fraca, como pede a RFC 9110)."""
+    if valor.strip() == '*':
+        return True
+    return any(item.strip().removeprefix('W/') == etag for item in valor.split(','))
+
+
+class Servidor:
+    """
+    Servidor das páginas. fonte: função sem argumentos que retorna o snapshot atual da
+    planilha (bloqueante: roda numa thread). Use iniciar() / encerrar() ou servir().
+    """
+    __slots__ = ('fonte', 'intervalo', 'curso', 'termo', 'publicacao', 'snapshot', 'ultima_consulta',
+                 'erro', 'renderizacoes', 'requisicoes', '_servidor', '_tarefa')
+
+    def __init__(self, fonte=fonte_planilha, intervalo=INTERVALO, curso=CURSO, termo=TERMO):
+        self.fonte = fonte
+        self.intervalo = intervalo
+        self.curso = curso
+        self.termo = termo
+        self.publicacao = None
+        self.snapshot = None
+        self.ultima_consulta = None
+        self.erro = None
+        self.renderizacoes = 0
+        self.requisicoes = 0
+        self._servidor = None
+        self._tarefa = None
+
+    async def atualizar(self):
+        """
+        Consulta a fonte e, se o conteúdo mudou, renderiza e troca a publicação.
+        Retorna True se houve nova publicação. Falhas mantêm a versão anterior no ar.
+        """
+        try:
+            snapshot = await asyncio.to_thread(self.fonte)
+            self.ultima_consulta = datetime.now(timezone.utc)
+            if self.publicacao is not None and snapshot == self.snapshot:
+                return False
+            publicacao = await asyncio.to_thread(renderizar, snapshot, self.curso, self.termo, self.snapshot)
+        # baixar_snapshots encerra o processo (SystemExit) quando a API falha sem cache local
+        except (Exception, SystemExit) as e:
+            self.erro = f"{type(e).__name__}: {e}"
+            print(f"AVISO: falha ao atualizar as páginas ({self.erro}); mantendo a versão anterior.",
+                  file=sys.stderr)
+            return False
+
+        self.snapshot, self.publicacao, self.erro = snapshot, publicacao, None
+        self.renderizacoes += 1
+        print(f"Páginas atualizadas (versão {publicacao.versao}, {len(publicacao.recursos)} rotas, "
+              f"{publicacao.segundos:.2f}s).", file=sys.stderr)
+        return True
+
+    async def _consultar(self):
+        while True:
+            await asyncio.sleep(self.intervalo)
+            await self.atualizar()
+
+    async def iniciar(self, host='127.0.0.1', porta=8000):
+        """Renderiza a primeira versão, abre a porta e inicia a consulta periódica."""
+        await self.atualizar()
+        self._servidor = await asyncio.start_server(self._atender, host, porta, limit=LIMITE_CABECALHOS)
+        self._tarefa = asyncio.create_task(self._consultar())
+        return self._servidor.sockets[0].getsockname()[:2]
+
+    async def encerrar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+
+    async def servir(self, host='127.0.0.1', porta=8000):
+        host, porta = await self.iniciar(host, porta)
+        print(f"Servindo em http://{host}:{porta}/ (consulta a cada {self.intervalo:g}s).", file=sys.stderr)
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.encerrar()
+
+    def status(self):
+        publicacao = self.publicacao
+        return {
+            'versao': publicacao and publicacao.versao,
+            'gerada_em': publicacao and publicacao.gerada_em.isoformat(timespec='seconds'),
+            'renderizacao_s': publicacao and round(publicacao.segundos, 3),
+            'ultima_consulta': self.ultima_consulta and self.ultima_consulta.isoformat(timespec='seconds'),
+            'renderizacoes': self.renderizacoes,
+            'requisicoes': self.requisicoes,
+            'erro': self.erro,
+        }
+
+    def responder(self, metodo, caminho, cabecalhos):
+        """Bytes da resposta a uma requisição já interpretada (sem E/S)."""
+        if metodo not in ('GET', 'HEAD'):
+            return _cabecalhos(405, [('Allow', 'GET, HEAD'), ('Content-Length', 0)]) + b'\r\n'
+
+        caminho = caminho.partition('?')[0]
+        if caminho == '/status.json':
+            corpo = json.dumps(self.status()).encode('utf-8')
+            return (_cabecalhos(200, [('Content-Type', TIPOS['.json']), ('Cache-Control', 'no-store'),
+                                      ('Content-Length', len(corpo))])
+                    + b'\r\n' + (corpo if metodo == 'GET' else b''))
+
+        publicacao = self.publicacao
+        if publicacao is None:
+            return _cabecalhos(503, [('Retry-After', 5), ('Content-Length', 0)]) + b'\r\n'
+        recurso = publicacao.recursos.get(caminho)
+        if recurso is None:
+            return _cabecalhos(404, [('Content-Length', 0)]) + b'\r\n'
+
+        if _aceita_gzip(cabecalhos.get('accept-encoding', '')):
+            etag, corpo, resposta, nao_modificado = (recurso.etag_gzip, recurso.comprimido,
+                                                     recurso.resposta_gzip, recurso.nao_modificado_gzip)
+        else:
+            etag, corpo, resposta, nao_modificado = (recurso.etag, recurso.corpo,
+                                                     recurso.resposta, recurso.nao_modificado)
+
+        condicao = cabecalhos.get('if-none-match')
+        if condicao is not None and _etag_confere(condicao, etag):
+            return nao_modificado + b'\r\n'
+        return resposta + b'\r\n' + (corpo if metodo == 'GET' else b'')
+
+    async def _atender(self, leitor, escritor):
+        """Uma conexão: várias requisições em sequência (keep-alive do HTTP/1.1)."""
+        try:
+            while True:
+                try:
+                    bloco = await leitor.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+
+                linhas = bloco.decode('latin-1').split('\r\n')
+                partes = linhas[0].split(' ')
+                if len(partes) != 3:
+                    escritor.write(_cabecalhos(400, [('Connection', 'close'), ('Content-Length', 0)]) + b'\r\n')
+                    return
+                metodo, caminho, versao = partes
+                cabecalhos = {}
+                for linha in linhas[1:]:
+                    nome, separador, valor = linha.partition(':')
+                    if separador:
+                        cabecalhos[nome.strip().lower()] = valor.strip()
+
+                self.requisicoes += 1
+                escritor.write(self.responder(metodo, caminho, cabecalhos))
+
+                conexao = cabecalhos.get('connection', '').lower()
+                if conexao == 'close' or (versao == 'HTTP/1.0' and conexao != 'keep-alive'):
+                    return
+                # Corpo de requisição não é usado: conexões que enviam um são encerradas
+                if cabecalhos.get('content-length', '0') != '0' or 'transfer-encoding' in cabecalhos:
+                    return
+                if escritor.transport.get_write_buffer_size() > 64 * 1024:
+                    await escritor.drain()
+        finally:
+            try:
+                await escritor.drain()
+                escritor.close()
+            except ConnectionError:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve as páginas de horários e as mantém atualizadas.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    parser.add_argument('--intervalo', type=float, default=INTERVALO,
+                        help=f"segundos entre consultas à planilha (padrão: {INTERVALO:g})")
+    parser.add_argument('--curso', default=CURSO)
+    parser.add_argument('--termo', default=TERMO)
+    args = parser.parse_args(argv)
+
+    servidor = Servidor(intervalo=args.intervalo, curso=args.curso, termo=args.termo)
+    try:
+        asyncio.run(servidor.servir(args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Configuração comum dos testes: raiz do repositório no sys.path, diretório de trabalho
+temporário (os caches em .cache/ não tocam o repositório) e planilhas pequenas montadas
+à mão. Rode da raiz com:
+
+    python -m pytest -q
+"""
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from benchmarks.sintetico import COLUNAS  # noqa: E402
+from planilha import _limpar_linha, snapshot_para_dataframe  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def pasta_temporaria(tmp_path, monkeypatch):
+    """Cada teste roda numa pasta vazia, com o cache de seções desligado."""
+    import cache_secoes
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cache_secoes, 'HABILITADO', False)
+    return tmp_path
+
+
+def snapshot_de(*ofertas):
+    """
+    Snapshot com as colunas da planilha real a partir de dicts parciais:
+    snapshot_de({'codigo': 'MAT1', 'professor': 'Ana', 'horario 1': '231', 'sala 1': 'S1'}).
+    """
+    linhas = [[str(oferta.get(coluna, '')) for coluna in COLUNAS] for oferta in ofertas]
+    return tuple(COLUNAS), tuple(_limpar_linha(linha) for linha in linhas)
+
+
+def modelo_de(*ofertas):
+    """ModeloHorarios de um snapshot_de(*ofertas)."""
+    from modelo import construir_modelo
+
+    return construir_modelo(snapshot_para_dataframe(snapshot_de(*ofertas)))
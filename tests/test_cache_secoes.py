@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+import cache_secoes
+from cache_secoes import CacheFragmentos, definir_escopo
+
+
+@pytest.fixture(autouse=True)
+def cache_ligado(monkeypatch):
+    monkeypatch.setattr(cache_secoes, 'HABILITADO', True)
+    yield
+    definir_escopo()
+
+
+def _renderizar(escopo, chaves):
+    definir_escopo(*escopo)
+    cache = CacheFragmentos('professores')
+    for chave in chaves:
+        cache.obter(chave, lambda: [f"<p>{chave}</p>"])
+    cache.podar()
+    return cache
+
+
+def test_escopos_nao_podam_uns_aos_outros():
+    a = _renderizar(('Planilha', 'Aba A'), ['a1', 'a2'])
+    b = _renderizar(('Planilha', 'Aba B'), ['b1'])
+    assert a.pasta != b.pasta
+    assert sorted(os.listdir(a.pasta)) == ['a1.html', 'a2.html']
+
+    # Segunda renderização do alvo A: tudo vem do disco
+    a = _renderizar(('Planilha', 'Aba A'), ['a1', 'a2'])
+    assert (a.reaproveitados, a.gerados) == (2, 0)
+
+
+def test_podar_remove_so_as_obsoletas_do_proprio_escopo():
+    _renderizar(('Planilha', 'Aba A'), ['a1', 'a2'])
+    b = _renderizar(('Planilha', 'Aba B'), ['b1'])
+    a = _renderizar(('Planilha', 'Aba A'), ['a2'])
+    assert os.listdir(a.pasta) == ['a2.html']
+    assert os.listdir(b.pasta) == ['b1.html']
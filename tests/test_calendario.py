@@ -0,0 +1,41 @@
+from conftest import modelo_de, snapshot_de
+
+from calendario import gerar_calendarios
+
+
+def test_aula_compartilhada_entra_no_calendario_de_cada_professor(pasta_temporaria):
+    modelo = modelo_de(
+        {'codigo': 'MAT1', 'professor': 'Ana', 'semestre': '1', 'creditos': '2', 'horario 1': '211'},
+        {'codigo': 'MAT2', 'professor': 'Ana / Bia', 'semestre': '3', 'creditos': '2',
+         'horario 1': '231', 'horario 2': '232', 'sala 1': 'S1', 'sala 2': 'S1'},
+    )
+    gerados = dict(gerar_calendarios(modelo, 'calendarios'))
+    assert gerados['professores/ana.ics'] == 'Ana' and gerados['professores/bia.ics'] == 'Bia'
+    assert not any('ana-bia' in caminho for caminho in gerados)
+
+    def ler(nome):
+        with open(f'calendarios/professores/{nome}.ics', encoding='utf-8', newline='') as f:
+            return f.read()
+
+    ana, bia = ler('ana'), ler('bia')
+    assert ana.count('BEGIN:VEVENT') == 2 and bia.count('BEGIN:VEVENT') == 1
+    # O mesmo evento (aulas 231-232 juntas) tem o mesmo UID nos dois calendários
+    uid = next(linha for linha in bia.split('\r\n') if linha.startswith('UID:'))
+    assert uid in ana
+    assert 'DESCRIPTION:Professores: Ana\\, Bia' in bia
+
+
+def test_periodo_letivo_vem_da_linha_de_comando(monkeypatch):
+    import gerar_pagina
+
+    snapshot = snapshot_de({'codigo': 'MAT1', 'professor': 'Ana', 'semestre': '1', 'horario 1': '231'})
+    monkeypatch.setattr(gerar_pagina, 'obter_snapshot', lambda *args: snapshot)
+    monkeypatch.setattr(gerar_pagina, 'versao_anterior', lambda *args: None)
+    gerar_pagina.main(['--saida', 'site/index.html', '--calendarios', 'site/calendarios',
+                       '--inicio-aulas', '2026-08-10', '--fim-aulas', '2026-12-12'])
+
+    with open('site/calendarios/professores/ana.ics', encoding='utf-8') as f:
+        ana = f.read()
+    # Primeira segunda-feira do período e fim das aulas no UNTIL (em UTC)
+    assert 'DTSTART;TZID=America/Sao_Paulo:20260810T190000' in ana
+    assert 'UNTIL=20261213T025959Z' in ana
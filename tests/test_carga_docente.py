@@ -0,0 +1,49 @@
+from conftest import modelo_de
+
+import horarios_professores
+from carga_docente import ABAIXO, ACIMA, calcular_carga
+from conflitos import CONFLITO_PROFESSOR, detectar_conflitos
+from modelo import separar_professores
+
+
+def _modelo():
+    return modelo_de(
+        {'codigo': 'MAT1', 'professor': 'Ana', 'semestre': '1', 'creditos': '4', 'alunos': '1,2,3',
+         'horario 1': '211', 'horario 2': '212', 'horario 3': '411', 'horario 4': '412'},
+        {'codigo': 'MAT2', 'professor': 'Ana / Bia', 'semestre': '3', 'creditos': '3', 'alunos': '4,5',
+         'horario 1': '231', 'horario 2': '232', 'horario 3': '211'},
+        {'codigo': 'MAT3', 'professor': 'Caio', 'semestre': '5', 'creditos': '2'},
+    )
+
+
+def test_separar_professores():
+    assert separar_professores('Ana Souza / Bia; Caio & Dora + Ana Souza') == ('Ana Souza', 'Bia', 'Caio', 'Dora')
+    assert separar_professores('Ana Paula Gomes e Silva') == ('Ana Paula Gomes e Silva',)
+    assert separar_professores('Maria Eduarda') == ('Maria Eduarda',)
+    assert separar_professores('  ') == separar_professores(None) == ()
+
+
+def test_carga_divide_creditos_e_conta_aulas_inteiras():
+    carga = calcular_carga(_modelo(), minimo=2, maximo=5)
+    assert list(carga.index) == ['Ana', 'Bia', 'Caio']
+    assert carga.loc['Ana', 'creditos'] == 5.5 and carga.loc['Bia', 'creditos'] == 1.5
+    assert carga.loc['Ana', 'aulas'] == 7 and carga.loc['Bia', 'aulas'] == 3
+    assert carga.loc['Ana', 'horas'] == 7 * 50 / 60
+    assert carga.loc['Ana', 'alunos'] == 5 and carga.loc['Caio', 'alunos'] == 0
+    assert (carga.loc['Ana', 'turnos'], carga.loc['Ana', 'dias']) == (2, 2)
+    assert list(carga['situacao']) == [ACIMA, ABAIXO, '']
+
+
+def test_secoes_por_professor_usam_os_nomes_separados():
+    modelo = _modelo()
+    assert modelo.professores() == ['Ana', 'Bia', 'Caio']
+    html = ''.join(horarios_professores.iter_html_professores(modelo=modelo, documento=False))
+    assert "id='Ana_/_Bia'" not in html
+    # A seção publicada soma os créditos inteiros (4 + 3); a cota (5,5) fica na tabela de carga
+    assert '<b>7</b>' in html and '<b>3</b>' in html and '<i>(compartilhada)</i>' in html
+    assert '<b>5,5</b>' not in html
+
+
+def test_oferta_compartilhada_conflita_com_cada_professor():
+    conflitos = [c for c in detectar_conflitos(_modelo()) if c.tipo == CONFLITO_PROFESSOR]
+    assert [(c.recurso, c.slot) for c in conflitos] == [('Ana', ('2', '1', 0))]
@@ -0,0 +1,122 @@
+"""Cliente da API contra um servidor HTTP local que devolve 429/503 de propósito."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import planilha
+from cliente_sheets import ClienteSheets, ErroSheets
+
+CHAVE = 'chave-teste'
+LINHAS = [['codigo', 'professor', 'horario 1'], ['MAT1', 'Ana', '231'], ['MAT2', 'Bia']]
+
+
+class ApiFalsa:
+    """
+    Simula as rotas usadas do Drive e do Sheets. 'falhas' é a fila de respostas de erro
+    (status, Retry-After) devolvidas antes das respostas normais.
+    """
+
+    def __init__(self):
+        self.falhas = []
+        self.caminhos = []
+        self.revisao = '2026-03-01T10:00:00Z'
+        api = self
+
+        class Tratador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                api.caminhos.append(self.path)
+                if api.falhas:
+                    status, espera = api.falhas.pop(0)
+                    self.send_response(status)
+                    if espera is not None:
+                        self.send_header('Retry-After', str(espera))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if self.path.startswith(f'/drive/{CHAVE}'):
+                    dados = {'modifiedTime': api.revisao}
+                elif self.path.startswith('/drive'):
+                    dados = {'files': [{'id': CHAVE}]}
+                else:
+                    dados = {'valueRanges': [{'values': LINHAS}]}
+                corpo = json.dumps(dados).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', 0), Tratador)
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+        threading.Thread(target=self.servidor.serve_forever, args=(0.05,), daemon=True).start()
+
+    def cliente(self, esperas, tentativas=4):
+        return ClienteSheets(requests.Session(), timeout=5, tentativas=tentativas,
+                             url_sheets=f"{self.url}/sheets", url_drive=f"{self.url}/drive",
+                             dormir=esperas.append, aleatorio=lambda: 0.5)
+
+    def fechar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+@pytest.fixture
+def api():
+    api = ApiFalsa()
+    yield api
+    api.fechar()
+
+
+def test_repete_429_e_503_respeitando_retry_after(api):
+    esperas = []
+    api.falhas = [(429, 7), (503, 2)]
+    cliente = api.cliente(esperas)
+    assert cliente.revisao(CHAVE) == api.revisao
+    assert esperas == [7.0, 2.0]
+    assert cliente.requisicoes == 3
+
+
+def test_sem_retry_after_usa_espera_exponencial(api):
+    esperas = []
+    api.falhas = [(503, None), (503, None)]
+    api.cliente(esperas).revisao(CHAVE)
+    assert esperas == [0.5 * 1.0, 0.5 * 2.0]
+
+
+def test_tentativas_esgotadas_e_erro_definitivo(api):
+    api.falhas = [(429, 0)] * 3
+    with pytest.raises(ErroSheets) as erro:
+        api.cliente([], tentativas=3).revisao(CHAVE)
+    assert erro.value.status == 429
+
+    api.falhas = [(404, None)]
+    with pytest.raises(ErroSheets):
+        api.cliente([]).revisao(CHAVE)
+    assert len(api.caminhos) == 4
+
+
+def test_batchget_completa_as_linhas(api):
+    (linhas,) = api.cliente([]).obter_intervalos(CHAVE, ["'Planilha1'"])
+    assert linhas[-1] == ['MAT2', 'Bia', '']
+
+
+def test_baixar_snapshots_usa_cache_quando_a_api_falha(api):
+    cliente = api.cliente([], tentativas=2)
+    cabecalho, linhas = planilha.baixar_snapshot('Teste', 'Planilha1', cliente)
+    assert cabecalho == tuple(LINHAS[0]) and len(linhas) == 2
+
+    # A API passa a falhar sempre: a última versão em cache é usada
+    api.falhas = [(503, 0)] * 10
+    assert planilha.baixar_snapshot('Teste', 'Planilha1', cliente) == (cabecalho, linhas)
+
+
+def test_baixar_snapshots_sem_cache_encerra(api):
+    api.falhas = [(503, 0)] * 10
+    with pytest.raises(SystemExit):
+        planilha.baixar_snapshot('Teste', 'Planilha1', api.cliente([], tentativas=2))
@@ -0,0 +1,15 @@
+import pandas as pd
+from conftest import modelo_de
+
+from decodificador import validar_codigos
+
+
+def test_codigos_longos_lidos_pelos_tres_primeiros_digitos():
+    codigo, valido, motivo = validar_codigos(pd.Series(['231', '2311', '23115', '99', '241', 'abc']))
+    assert codigo.tolist()[:3] == [231, 231, 231] and valido.tolist() == [True, True, True, False, False, False]
+    assert motivo.tolist()[3:] == ['código deve ter ao menos 3 dígitos', 'turno inválido', 'código não numérico']
+
+    # A sessão de um código com 4 dígitos continua na grade e fora do relatório de validação
+    modelo = modelo_de({'codigo': 'MAT1', 'professor': 'Ana', 'horario 1': '2311', 'sala 1': 'S1'})
+    assert [(s.dia, s.horario, s.sala) for s in modelo.sessoes] == [('segunda-feira', '19:00-19:50', 'S1')]
+    assert modelo.validacao.empty
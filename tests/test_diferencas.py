@@ -0,0 +1,25 @@
+from conftest import modelo_de, snapshot_de
+
+from diferencas import CAMPO, CAMPO_INSCRITOS, alteracoes_como_json, comparar
+from pagina import iter_pagina_completa
+
+
+def test_registro_de_alteracoes_sem_matriculas():
+    anterior = snapshot_de({'codigo': 'MAT1', 'turma': 'A', 'professor': 'Ana', 'creditos': '4',
+                            'alunos': '2026001,2026002', 'horario 1': '231'})
+    oferta = {'codigo': 'MAT1', 'turma': 'A', 'professor': 'Ana', 'creditos': '4',
+              'alunos': '2026001,2026003,2026004', 'horario 1': '231'}
+    atual = snapshot_de(oferta)
+
+    alteracoes = comparar(anterior, atual)
+    assert [(a.tipo, a.campo, a.antes, a.depois) for a in alteracoes] == [(CAMPO, CAMPO_INSCRITOS, '2', '3')]
+
+    # Nem o JSON publicado nem a página trazem matrículas
+    publicado = alteracoes_como_json(alteracoes, anterior, atual)
+    publicado += ''.join(iter_pagina_completa(modelo_de(oferta), 'Curso', '2026/1', alteracoes))
+    assert 'Dado alterado (inscritos)' in publicado
+    assert not any(matricula in publicado for matricula in ('2026001', '2026002', '2026003', '2026004'))
+
+    # Troca de alunos sem mudar a contagem não aparece no registro
+    trocados = snapshot_de({**oferta, 'alunos': '2026005,2026006,2026007'})
+    assert comparar(atual, trocados) == []
@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+from conftest import modelo_de
+
+from historico import abrir, carga_professor, importar_termo, main, ofertas_da_disciplina, salas_ocupadas, uso_salas
+
+
+def _termo(professor_mat2):
+    return modelo_de(
+        {'codigo': 'MAT1', 'professor': 'Ana', 'semestre': '1', 'creditos': '4', 'campus': 'Anglo',
+         'horario 1': '231', 'sala 1': 'S1'},
+        {'codigo': 'MAT2', 'professor': professor_mat2, 'semestre': '3', 'creditos': '2', 'campus': 'Anglo',
+         'horario 1': '431', 'sala 1': 'S1'},
+    )
+
+
+@pytest.fixture
+def conexao(pasta_temporaria):
+    conexao = abrir(str(pasta_temporaria / 'historico.sqlite3'))
+    importar_termo(conexao, _termo('Bia'), 'Curso', '2025/2')
+    importar_termo(conexao, _termo('Ana / Bia'), 'Curso', '2026/1')
+    yield conexao
+    conexao.close()
+
+
+def test_carga_conta_as_ofertas_compartilhadas(conexao):
+    assert carga_professor(conexao, 'Ana') == [('2025/2', 4.0, 1), ('2026/1', 5.0, 2)]
+    assert carga_professor(conexao, 'Bia') == [('2025/2', 2.0, 1), ('2026/1', 1.0, 1)]
+    assert carga_professor(conexao, 'Ana / Bia') == [('2025/2', 0, 0), ('2026/1', 0, 0)]
+
+
+def test_reimportar_substitui_o_termo(conexao):
+    importar_termo(conexao, _termo('Caio'), 'Curso', '2026/1')
+    assert carga_professor(conexao, 'Ana')[-1] == ('2026/1', 4.0, 1)
+    assert carga_professor(conexao, 'Caio')[-1] == ('2026/1', 2.0, 1)
+    assert uso_salas(conexao) == {('S1', 'Anglo'): {'2025/2': 2, '2026/1': 2}}
+
+
+def test_consultas_por_slot_e_disciplina(conexao):
+    assert salas_ocupadas(conexao, 'Curso', '2026/1', '2', '3', 0) == [('S1', 'Anglo')]
+    assert [linha[3] for linha in ofertas_da_disciplina(conexao, 'MAT2')] == ['Bia', 'Ana / Bia']
+
+
+def test_banco_de_outra_versao_do_esquema(pasta_temporaria):
+    caminho = str(pasta_temporaria / 'antigo.sqlite3')
+    antigo = sqlite3.connect(caminho)
+    antigo.execute('CREATE TABLE termos (id INTEGER PRIMARY KEY)')
+    antigo.close()
+    with pytest.raises(sqlite3.DatabaseError, match='outra versão do esquema'):
+        abrir(caminho)
+    # Na linha de comando o erro vira código de saída
+    with pytest.raises(SystemExit) as saida:
+        main(['--banco', caminho, 'carga', 'Ana'])
+    assert saida.value.code == 2
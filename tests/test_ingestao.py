@@ -0,0 +1,28 @@
+from conftest import snapshot_de
+
+from ingestao import ingerir_snapshot
+
+
+def test_inteiros_convertidos_de_uma_vez_e_rejeitados_no_relatorio():
+    df, relatorio = ingerir_snapshot(snapshot_de(
+        {'codigo': 'MAT1', 'semestre': '3', 'creditos': '+4'},
+        {'codigo': 'MAT2', 'semestre': 'abc', 'creditos': '4.5'},
+        {'codigo': 'MAT3', 'semestre': '300', 'creditos': '4.0'},
+        {'codigo': 'MAT4', 'semestre': '', 'creditos': '1e2'},
+        {'codigo': 'MAT5', 'semestre': '007', 'creditos': '-2'},
+    ))
+    assert str(df['semestre'].dtype) == 'Int8' and str(df['creditos'].dtype) == 'Int8'
+    assert df['semestre'].isna().tolist() == [False, True, True, True, False]
+    assert df['semestre'].tolist()[::4] == [3, 7] and df['creditos'].tolist()[::4] == [4, -2]
+    assert df['creditos'].isna().tolist()[1:4] == [True, True, True]
+
+    # Só inteiros escritos por extenso: '4.0' e '1e2' continuam rejeitados
+    rejeitadas = {(linha, coluna): (valor, motivo) for linha, coluna, valor, motivo
+                  in relatorio.itertuples(index=False)}
+    assert rejeitadas == {
+        (1, 'semestre'): ('abc', 'não é um número inteiro'),
+        (1, 'creditos'): ('4.5', 'não é um número inteiro'),
+        (2, 'semestre'): ('300', 'fora do intervalo'),
+        (2, 'creditos'): ('4.0', 'não é um número inteiro'),
+        (3, 'creditos'): ('1e2', 'não é um número inteiro'),
+    }
@@ -0,0 +1,24 @@
+import collections
+
+import instrumentacao
+from instrumentacao import etapa
+
+
+def test_guarda_so_as_etapas_mais_recentes(monkeypatch):
+    monkeypatch.setattr(instrumentacao, 'HABILITADO', True)
+    monkeypatch.setattr(instrumentacao, '_etapas', collections.deque(maxlen=5))
+    instrumentacao.limpar()
+
+    for i in range(12):
+        with etapa('externa', linhas=i):
+            with etapa('interna'):
+                pass
+
+    registros = instrumentacao.etapas()
+    assert len(registros) == 5 and registros[-1].nome == 'interna'
+    relatorio = instrumentacao.relatorio()
+    assert relatorio['descartadas'] == 19
+    assert relatorio['resumo']['interna']['chamadas'] == 3
+
+    instrumentacao.limpar()
+    assert instrumentacao.etapas() == [] and instrumentacao.descartadas() == 0
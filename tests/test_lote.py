@@ -0,0 +1,27 @@
+import pytest
+
+from lote import carregar_alvos, main, pasta_do_alvo, verificar_pastas
+
+ALVOS = """
+- planilha: planilha-anglo
+  curso: Engenharia de Materiais
+  termo: 2026/1
+- planilha: planilha-capao
+  curso: Engenharia de Materiais
+  termo: 2026/1
+"""
+
+
+def test_alvos_com_o_mesmo_curso_e_termo_precisam_de_pastas_diferentes(pasta_temporaria):
+    (pasta_temporaria / 'alvos.yml').write_text(ALVOS, encoding='utf-8')
+    alvos = carregar_alvos('alvos.yml')
+    with pytest.raises(ValueError, match="mesma pasta 'engenharia-de-materiais-2026-1'"):
+        verificar_pastas(alvos)
+    # Recusado antes de qualquer download
+    with pytest.raises(SystemExit):
+        main(['alvos.yml', '--saida', 'site'])
+
+    (pasta_temporaria / 'alvos.yml').write_text(ALVOS + "  pasta: Materiais Capão 2026/1\n", encoding='utf-8')
+    alvos = carregar_alvos('alvos.yml')
+    verificar_pastas(alvos)
+    assert [pasta_do_alvo(alvo) for alvo in alvos] == ['engenharia-de-materiais-2026-1', 'materiais-capao-2026-1']
@@ -0,0 +1,61 @@
+"""Cache do snapshot em disco, com um cliente falso no lugar da API."""
+import planilha
+
+
+class ClienteFalso:
+    """Mesma interface de ClienteSheets; conta as chamadas de cada rota."""
+
+    def __init__(self, revisao='r1'):
+        self.revisao_atual = revisao
+        self.buscas = 0
+        self.downloads = []
+        self.abas = {
+            'Planilha1': [['codigo', 'professor'], ['MAT1', 'Ana'], ['MAT2', 'nan']],
+            'Planilha2': [['codigo', 'professor'], ['MAT3', 'Bia']],
+        }
+
+    def procurar_chave(self, nome):
+        self.buscas += 1
+        return 'chave'
+
+    def revisao(self, chave):
+        return self.revisao_atual
+
+    def obter_abas(self, chave, abas):
+        self.downloads.append(list(abas))
+        return {aba: self.abas[aba] for aba in abas}
+
+
+def test_cache_segue_a_revisao_do_drive():
+    cliente = ClienteFalso()
+    cabecalho, linhas = planilha.baixar_snapshot('Teste', 'Planilha1', cliente)
+    assert cabecalho == ('codigo', 'professor')
+    assert linhas == (('MAT1', 'Ana'), ('MAT2', ''))
+
+    # Mesma revisão: nada é baixado de novo, e a chave vem do cache (sem busca por nome)
+    assert planilha.baixar_snapshot('Teste', 'Planilha1', cliente) == (cabecalho, linhas)
+    assert cliente.downloads == [['Planilha1']]
+    assert cliente.buscas == 1
+
+    # Planilha editada: nova revisão, novo download
+    cliente.revisao_atual = 'r2'
+    cliente.abas['Planilha1'].append(['MAT4', 'Caio'])
+    assert len(planilha.baixar_snapshot('Teste', 'Planilha1', cliente)[1]) == 3
+    assert cliente.downloads == [['Planilha1'], ['Planilha1']]
+
+
+def test_varias_abas_num_so_download_so_das_desatualizadas():
+    cliente = ClienteFalso()
+    planilha.baixar_snapshots('Teste', ['Planilha1'], cliente)
+    snapshots = planilha.baixar_snapshots('Teste', ['Planilha1', 'Planilha2'], cliente)
+    assert set(snapshots) == {'Planilha1', 'Planilha2'}
+    assert cliente.downloads == [['Planilha1'], ['Planilha2']]
+
+
+def test_obter_snapshot_compartilha_o_download(monkeypatch):
+    cliente = ClienteFalso()
+    monkeypatch.setattr(planilha, '_snapshots', {})
+    monkeypatch.setattr(planilha, 'obter_cliente', lambda: cliente)
+    primeiro = planilha.obter_snapshot('Teste', 'Planilha1')
+    assert planilha.obter_snapshot('Teste', 'Planilha1') is primeiro
+    assert cliente.downloads == [['Planilha1']]
@@ -0,0 +1,44 @@
+from conftest import modelo_de
+
+from resolvedor import Resolvedor, Restricoes
+
+ALUNOS_30 = ','.join(str(20260000 + i) for i in range(30))
+
+
+def _propostas(modelo, **opcoes):
+    restricoes = opcoes.pop('restricoes', None)
+    return Resolvedor(modelo, restricoes, **opcoes).resolver()
+
+
+def test_campus_sem_salas_nao_quebra():
+    modelo = modelo_de(
+        {'codigo': 'MAT1', 'professor': 'Ana', 'semestre': '1', 'creditos': '2', 'campus': 'Anglo',
+         'horario 1': '231', 'sala 1': 'S1'},
+        {'codigo': 'MAT2', 'professor': 'Bia', 'semestre': '1', 'creditos': '2', 'campus': 'Novo'},
+    )
+    propostas = _propostas(modelo)
+    assert len(propostas) == 2
+    assert all(p.slot is not None and p.sala is None for p in propostas)
+
+
+def test_retrocesso_nao_libera_turmas_fixas_da_mesma_disciplina():
+    modelo = modelo_de(
+        {'codigo': 'MAT1', 'turma': 'T1', 'professor': 'Ana', 'semestre': '1', 'creditos': '1',
+         'horario 1': '211'},
+        {'codigo': 'MAT1', 'turma': 'T2', 'professor': 'Bia', 'semestre': '1', 'creditos': '1'},
+        {'codigo': 'MAT2', 'professor': 'Caio', 'semestre': '1', 'creditos': '2'},
+    )
+    propostas = _propostas(modelo, limite_nos=2)
+    fixo = modelo.ofertas[0].sessoes[0].slot
+    assert all(p.slot != fixo for p in propostas if p.pendente.oferta.codigo == 'MAT2')
+
+
+def test_sala_sem_capacidade_fica_sem_solucao():
+    modelo = modelo_de(
+        {'codigo': 'MAT1', 'professor': 'Ana', 'semestre': '1', 'creditos': '1', 'campus': 'Anglo',
+         'horario 1': '231', 'sala 1': 'S1'},
+        {'codigo': 'MAT2', 'professor': 'Bia', 'semestre': '3', 'creditos': '1', 'campus': 'Anglo',
+         'sala 1': 'S1', 'alunos': ALUNOS_30},
+    )
+    (proposta,) = _propostas(modelo, restricoes=Restricoes(capacidade={'S1': 10}))
+    assert proposta.slot is None and proposta.sala is None
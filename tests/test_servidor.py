@@ -0,0 +1,91 @@
+"""Servidor das páginas com uma planilha falsa no lugar do Google Sheets."""
+import asyncio
+import gzip
+import json
+
+from benchmarks.sintetico import gerar_snapshot
+from servidor import Servidor
+
+
+class FonteFalsa:
+    """Devolve o snapshot atual; 'falhar' simula a API fora do ar."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.falhar = False
+        self.consultas = 0
+
+    def __call__(self):
+        self.consultas += 1
+        if self.falhar:
+            raise SystemExit(1)
+        return self.snapshot
+
+
+async def _pedir(porta, caminho, *cabecalhos):
+    """Uma requisição numa conexão nova; retorna (status, cabeçalhos, corpo)."""
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    linhas = [f"GET {caminho} HTTP/1.1", "Host: localhost", "Connection: close", *cabecalhos]
+    escritor.write(('\r\n'.join(linhas) + '\r\n\r\n').encode('latin-1'))
+    resposta = await leitor.read()
+    escritor.close()
+    cabeca, _, corpo = resposta.partition(b'\r\n\r\n')
+    linhas = cabeca.decode('latin-1').split('\r\n')
+    campos = {n.strip().lower(): v.strip() for n, _, v in (linha.partition(':') for linha in linhas[1:])}
+    return int(linhas[0].split(' ')[1]), campos, corpo
+
+
+def _rodar(fonte, teste):
+    async def principal():
+        servidor = Servidor(fonte=fonte, intervalo=3600)
+        _, porta = await servidor.iniciar('127.0.0.1', 0)
+        try:
+            await teste(servidor, porta)
+        finally:
+            await servidor.encerrar()
+
+    asyncio.run(principal())
+
+
+def test_gzip_etag_e_304():
+    async def teste(servidor, porta):
+        status, campos, corpo = await _pedir(porta, '/', 'Accept-Encoding: gzip')
+        assert status == 200 and campos['content-encoding'] == 'gzip'
+        assert 'Horários por Turma'.encode() in gzip.decompress(corpo)
+
+        status, _, corpo = await _pedir(porta, '/', 'Accept-Encoding: gzip', f"If-None-Match: {campos['etag']}")
+        assert (status, corpo) == (304, b'')
+
+        # Sem gzip: outra variante, outra ETag
+        status, simples, corpo = await _pedir(porta, '/index.html')
+        assert status == 200 and simples['etag'] != campos['etag'] and corpo.startswith(b'<!DOCTYPE html>')
+
+        assert (await _pedir(porta, '/paginas/busca.json'))[0] == 200
+        assert (await _pedir(porta, '/nao-existe'))[0] == 404
+
+    _rodar(FonteFalsa(gerar_snapshot(30)), teste)
+
+
+def test_atualiza_so_quando_a_planilha_muda_e_mantem_versao_em_falha():
+    fonte = FonteFalsa(gerar_snapshot(30))
+
+    async def teste(servidor, porta):
+        _, campos, _ = await _pedir(porta, '/')
+        assert not await servidor.atualizar()
+        assert servidor.renderizacoes == 1
+
+        fonte.snapshot = gerar_snapshot(30, semente=1)
+        assert await servidor.atualizar()
+        status, novos, _ = await _pedir(porta, '/', f"If-None-Match: {campos['etag']}")
+        assert status == 200 and novos['etag'] != campos['etag']
+        alteracoes = json.loads((await _pedir(porta, '/alteracoes.json'))[2])
+        assert alteracoes['alteracoes']
+
+        fonte.falhar = True
+        assert not await servidor.atualizar()
+        status, mantidos, _ = await _pedir(porta, '/')
+        assert status == 200 and mantidos['etag'] == novos['etag']
+        estado = json.loads((await _pedir(porta, '/status.json'))[2])
+        assert estado['renderizacoes'] == 2 and estado['erro'].startswith('SystemExit')
+
+    _rodar(fonte, teste)